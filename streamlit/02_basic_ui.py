@@ -3,6 +3,8 @@ import pandas as pd
 from datetime import datetime as dt
 import datetime
 
+from data_export import download_widget
+
 # 버튼 클릭
 button = st.button("버튼을 눌러보세요")
 
@@ -17,12 +19,12 @@ dataframe = pd.DataFrame({
     'second column': [10,20,30,40],
 })
 
-# 다운로드 버튼 연결
-st.download_button(
-    label="Download CSV",
-    data=dataframe.to_csv().encode("utf-8"),
-    file_name=f"sample_data_{dt.now().strftime('%Y%m%d')}.csv",
-    mime="text/csv",
+# 다운로드 버튼 연결 (Prepare를 눌렀을 때만 파일 생성)
+download_widget(
+    "sample data",
+    dataframe,
+    file_stem=f"sample_data_{dt.now().strftime('%Y%m%d')}",
+    key="sample_data",
 )
 
 # 체크 박스
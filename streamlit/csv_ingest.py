@@ -0,0 +1,203 @@
+import hashlib
+import io
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pv
+
+# pyarrow CSV reader가 한 번에 파싱하는 블록 크기 (메모리 상한을 결정)
+DEFAULT_BLOCK_SIZE = 8 * 1024 * 1024
+
+# 고유값 비율이 이 값 이하인 문자열 컬럼은 category로 변환
+CATEGORY_RATIO = 0.5
+
+INT_TYPES = [pa.int8(), pa.int16(), pa.int32(), pa.int64()]
+
+# pyarrow가 뒤 블록의 값을 첫 블록에서 정한 타입으로 바꾸지 못할 때의 메시지
+CONVERSION_ERROR = re.compile(r'In CSV column #(\d+): .*CSV conversion error')
+
+
+def content_digest(buffer):
+    """업로드된 바이트(또는 memoryview)의 내용 해시"""
+    return hashlib.blake2b(buffer, digest_size=16).hexdigest()
+
+
+def read_csv_chunked(source, block_size=DEFAULT_BLOCK_SIZE, category_ratio=CATEGORY_RATIO):
+    """pyarrow 스트리밍 reader로 block_size 단위로 읽고, 블록마다 바로 compact해서 Arrow 테이블로 모음
+
+    원본 폭의 블록은 하나만 메모리에 있으므로 최대 메모리는 대략 compact된 컬럼 크기 + 블록 하나다.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    read_options = pv.ReadOptions(block_size=block_size)
+    column_types = {}
+    while True:
+        if hasattr(source, 'seek'):
+            source.seek(0)
+        reader = pv.open_csv(source, read_options=read_options,
+                             convert_options=pv.ConvertOptions(column_types=column_types))
+        compactor = Compactor(reader.schema, category_ratio)
+        try:
+            for batch in reader:
+                compactor.add(batch)
+        except pa.ArrowInvalid as exc:
+            # 타입은 첫 블록으로 정해지므로 뒤 블록에 맞지 않는 값(정수 컬럼의 1.5 등)이 있으면
+            # 그 컬럼만 넓혀서 처음부터 다시 읽음 (모아 둔 블록은 버림)
+            match = CONVERSION_ERROR.match(str(exc))
+            if match is None:
+                raise
+            field = reader.schema.field(int(match.group(1)))
+            wider = _wider(field.type)
+            if wider is None:
+                raise
+            column_types[field.name] = wider
+            continue
+        return compactor.table()
+
+
+def _wider(type_):
+    # 정수(첫 블록이 모두 비어 있던 컬럼 포함) -> 실수 -> 문자열 순서로 넓힘 (문자열이면 더 넓힐 수 없음)
+    if pa.types.is_integer(type_) or pa.types.is_null(type_):
+        return pa.float64()
+    if pa.types.is_string(type_) or pa.types.is_large_string(type_):
+        return None
+    return pa.string()
+
+
+def _smallest_int(column):
+    # 값이 모두 비어 있으면 None (다른 블록의 타입을 따름)
+    low, high = pc.min_max(column).values()
+    if low.as_py() is None:
+        return None
+    for candidate in INT_TYPES:
+        info = np.iinfo(candidate.to_pandas_dtype())
+        if info.min <= low.as_py() and high.as_py() <= info.max:
+            return candidate
+    return column.type
+
+
+def _float32_exact(column):
+    narrowed = column.cast(pa.float32(), safe=False)
+    if pc.all(pc.or_kleene(pc.equal(narrowed.cast(column.type), column), pc.is_null(column))).as_py():
+        return narrowed
+    return None
+
+
+class Compactor:
+    """블록(RecordBatch)마다 dtype을 줄여 모아 두고 마지막에 한 테이블로 합침
+
+    - 정수: 지금까지 본 값 범위에 맞는 가장 작은 타입 (뒤 블록에서 범위가 넓어지면 앞 블록을 올려서 맞춤)
+    - 실수: 모든 블록이 float32로 손실 없이 표현될 때만 float32
+    - 문자열: 값이 있는 첫 블록의 고유값 비율이 category_ratio 이하이면 dictionary(category)
+      (컬럼마다 dictionary 하나를 뒤에 덧붙이며 키우므로 앞 블록의 index를 다시 만들 필요가 없음)
+    """
+
+    def __init__(self, schema, category_ratio=CATEGORY_RATIO):
+        self.schema = schema
+        self.category_ratio = category_ratio
+        self._chunks = [[] for _ in schema]
+        self._types = [None] * len(schema)
+        self._encode = [None] * len(schema)
+        self._dictionaries = [None] * len(schema)
+
+    def _compact(self, i, column):
+        if pa.types.is_integer(column.type):
+            need = _smallest_int(column)
+            current = self._types[i]
+            if need is not None and (current is None or INT_TYPES.index(need) > INT_TYPES.index(current)):
+                self._types[i] = need
+            return column.cast(self._types[i] or INT_TYPES[0])
+        if pa.types.is_floating(column.type) and column.type != pa.float32():
+            if self._types[i] != column.type:
+                narrowed = _float32_exact(column)
+                if narrowed is not None:
+                    self._types[i] = pa.float32()
+                    return narrowed
+                self._types[i] = column.type
+            return column
+        if pa.types.is_string(column.type):
+            if self._encode[i] is None and len(column) > column.null_count:
+                self._encode[i] = pc.count_distinct(column).as_py() <= self.category_ratio * len(column)
+            return self._indices(i, column) if self._encode[i] else column
+        return column
+
+    def _indices(self, i, column):
+        dictionary = self._dictionaries[i]
+        if dictionary is None:
+            dictionary = pa.array([], type=column.type)
+        values = pc.drop_null(pc.unique(column))
+        new = values.filter(pc.invert(pc.is_in(values, value_set=dictionary)))
+        if len(new):
+            dictionary = pa.concat_arrays([dictionary, new])
+        self._dictionaries[i] = dictionary
+        return pc.index_in(column, value_set=dictionary)
+
+    def add(self, batch):
+        for i, column in enumerate(batch.columns):
+            self._chunks[i].append(self._compact(i, column))
+
+    def table(self):
+        columns = []
+        for i, field in enumerate(self.schema):
+            chunks = self._chunks[i]
+            dictionary = self._dictionaries[i]
+            if dictionary is not None:
+                # index도 dictionary 크기에 맞는 가장 작은 정수 타입으로
+                index_type = _smallest_int(pa.array([0, max(len(dictionary) - 1, 0)])) or INT_TYPES[0]
+                target = pa.dictionary(index_type, field.type)
+            elif self._types[i] is not None:
+                target = self._types[i]
+            elif pa.types.is_integer(field.type):
+                target = INT_TYPES[0]
+            else:
+                target = field.type
+            # 하나씩 바꿔 넣어서 변환 전/후 컬럼 전체가 동시에 메모리에 있지 않도록 함
+            for j, chunk in enumerate(chunks):
+                if dictionary is not None:
+                    if chunk.type == field.type:
+                        # 인코딩 여부를 정하기 전의 (값이 모두 비어 있는) 블록
+                        chunk = pc.index_in(chunk, value_set=dictionary)
+                    chunks[j] = pa.DictionaryArray.from_arrays(chunk.cast(index_type), dictionary)
+                elif chunk.type != target:
+                    # 블록 사이에 타입이 달라진 경우 (정수 범위가 넓어짐, float32 -> float64)
+                    chunks[j] = chunk.cast(target)
+            self._chunks[i] = None
+            columns.append(pa.chunked_array(chunks, type=target))
+        return pa.table(columns, names=self.schema.names)
+
+
+def compact_table(table, category_ratio=CATEGORY_RATIO):
+    """이미 읽은 테이블의 dtype 줄이기 (read_csv_chunked와 같은 규칙)"""
+    compactor = Compactor(table.schema, category_ratio)
+    for batch in table.to_batches():
+        compactor.add(batch)
+    return compactor.table()
+
+
+def ingest_csv(source, block_size=DEFAULT_BLOCK_SIZE):
+    """CSV를 청크 단위로 파싱하면서 dtype을 줄이고 DataFrame으로 반환"""
+    table = read_csv_chunked(source, block_size)
+    # self_destruct: 변환이 끝난 Arrow 버퍼를 바로 해제해 최대 메모리를 줄임
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def summarize(df):
+    """미리보기 옆에 보여줄 컬럼별 요약 (타입, 결측, 고유값, 수치 통계)"""
+    summary = pd.DataFrame({
+        'dtype': df.dtypes.astype(str),
+        'non-null': df.count(),
+        'unique': df.nunique(),
+    })
+    numeric = df.select_dtypes(include='number')
+    if not numeric.empty:
+        summary = summary.join(numeric.describe().T[['mean', 'std', 'min', 'max']])
+    return summary
+
+
+def page(df, page_number, page_size=100):
+    """page_number(1부터)에 해당하는 행만 반환"""
+    start = (page_number - 1) * page_size
+    return df.iloc[start:start + page_size]
@@ -0,0 +1,161 @@
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+# 형식 이름: (확장자, MIME 타입)
+FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet'),
+    'Feather': ('feather', 'application/vnd.apache.arrow.file'),
+}
+
+# 한 번에 변환하는 행 수 (최대 메모리 = 프레임 + 청크 하나 분량)
+DEFAULT_CHUNK_ROWS = 100_000
+
+# 디스크에 보관하는 내보내기 파일 개수
+MAX_EXPORTS = 16
+
+_EXPORT_DIR = Path(tempfile.gettempdir()) / 'streamlit_exports'
+_exports = OrderedDict()
+_exports_lock = threading.Lock()
+# 같은 (fingerprint, 형식)은 한 번에 한 세션만 변환
+_key_locks = {}
+
+
+def frame_fingerprint(df):
+    """DataFrame 내용(인덱스/컬럼 포함)의 해시"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    digest.update(repr(list(df.columns)).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def _chunks(df, chunk_rows):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+def _write_csv(df, path, chunk_rows):
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for i, chunk in enumerate(_chunks(df, chunk_rows)):
+            chunk.to_csv(f, header=(i == 0))
+
+
+def _write_parquet(df, path, chunk_rows):
+    schema = pa.Schema.from_pandas(df, preserve_index=True)
+    with pq.ParquetWriter(path, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=True))
+
+
+def _write_feather(df, path, chunk_rows):
+    schema = pa.Schema.from_pandas(df, preserve_index=True)
+    with pa.OSFile(str(path), 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+        for chunk in _chunks(df, chunk_rows):
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=True))
+
+
+_WRITERS = {'CSV': _write_csv, 'Parquet': _write_parquet, 'Feather': _write_feather}
+
+
+def export_frame(df, fmt='CSV', fingerprint=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """df를 fmt 형식 파일로 청크 단위로 써서 경로를 반환 (같은 내용/형식은 다시 쓰지 않음)"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    key = (fingerprint or frame_fingerprint(df), fmt)
+    with _exports_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        with _exports_lock:
+            path = _exports.get(key)
+            if path is not None and path.exists():
+                _exports.move_to_end(key)
+                return path
+
+        _EXPORT_DIR.mkdir(parents=True, exist_ok=True)
+        file_id = hashlib.blake2b(key[0].encode('utf-8'), digest_size=16).hexdigest()
+        path = _EXPORT_DIR / f"{file_id}.{FORMATS[fmt][0]}"
+        # 임시 파일 이름은 호출마다 달라야 다른 프로세스가 쓰는 중인 파일을 덮지 않음
+        fd, tmp = tempfile.mkstemp(dir=_EXPORT_DIR, prefix=f'{file_id}.', suffix='.tmp')
+        os.close(fd)
+        try:
+            _WRITERS[fmt](df, tmp, chunk_rows)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        with _exports_lock:
+            _exports[key] = path
+            while len(_exports) > MAX_EXPORTS:
+                old_key, old_path = _exports.popitem(last=False)
+                _key_locks.pop(old_key, None)
+                try:
+                    # 이미 열어 둔 세션은 그대로 읽을 수 있음 (Windows에서는 열려 있으면 지우지 못하고 남김)
+                    old_path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+    return path
+
+
+def open_export(df, fmt='CSV', fingerprint=None, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """export_frame 결과를 읽기용으로 열어서 반환
+
+    경로를 받은 뒤 열기 전에 다른 세션의 LRU가 그 파일을 지웠으면 다시 만든다
+    (export_frame은 파일이 없으면 다시 씀, 한 번 연 파일은 지워져도 끝까지 읽을 수 있음).
+    """
+    fingerprint = fingerprint or frame_fingerprint(df)
+    while True:
+        path = export_frame(df, fmt, fingerprint, chunk_rows)
+        try:
+            return open(path, 'rb')
+        except FileNotFoundError:
+            continue
+
+
+def download_widget(label, df, file_stem, key, fingerprint=None, formats=tuple(FORMATS)):
+    """형식 선택 + 'Prepare' 버튼 + 다운로드 버튼
+
+    파일은 사용자가 Prepare를 누른 뒤에만 만든다 (누르기 전에는 변환 비용 없음).
+    fingerprint를 넘기면 rerun마다 프레임 내용을 해시하지 않는다 (내용이 바뀌면 fingerprint도 바뀌어야 함).
+    넘기지 않으면 Prepare 이후 rerun마다 현재 프레임을 해시해서, 내용이 바뀌었으면 이전 파일을 내려주지 않는다.
+    """
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        fmt = st.selectbox('Format', formats, key=f'{key}_format', label_visibility='collapsed')
+
+    prepared = st.session_state.setdefault('prepared_exports', {})
+    with col2:
+        if st.button(f'Prepare {label}', key=f'{key}_prepare'):
+            fingerprint = fingerprint or frame_fingerprint(df)
+            with st.spinner('Preparing file...'):
+                export_frame(df, fmt, fingerprint)
+            prepared[key] = (fingerprint, fmt)
+
+        ready = prepared.get(key)
+        if ready is None or ready[1] != fmt:
+            return
+        current = fingerprint or frame_fingerprint(df)
+        if ready[0] != current:
+            return
+
+        extension, mime = FORMATS[fmt]
+        with open_export(df, fmt, current) as f:
+            st.download_button(
+                label=f'Download {label}',
+                data=f,
+                file_name=f'{file_stem}.{extension}',
+                mime=mime,
+                key=f'{key}_download',
+                icon=':material/download:',
+            )
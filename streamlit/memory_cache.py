@@ -0,0 +1,309 @@
+import atexit
+import functools
+import hashlib
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from singleflight import SingleFlight
+
+# 프로세스 전체 메모리 예산 (CACHE_MAX_MB, 기본 512MB)과 디스크 spill 예산 (CACHE_SPILL_MB, 기본 2GB)
+DEFAULT_MAX_BYTES = int(os.getenv('CACHE_MAX_MB', 512)) * 1024 * 1024
+DEFAULT_SPILL_BYTES = int(os.getenv('CACHE_SPILL_MB', 2048)) * 1024 * 1024
+DEFAULT_SPILL_DIR = Path(os.getenv('CACHE_SPILL_DIR', Path(tempfile.gettempdir()) / 'streamlit_cache_spill'))
+
+# spill 파일 압축 수준 (빠른 쪽 - 디스크로 내리는 항목은 다시 쓰일 가능성이 낮음)
+SPILL_COMPRESSION = 1
+
+_MISSING = object()
+
+
+def sizeof(value, _seen=None):
+    """값이 차지하는 실제 메모리 (DataFrame은 object 컬럼 문자열까지 포함)
+
+    일반 객체(PriceView 등)는 속성을 따라가며 합산하고, 같은 객체는 한 번만 센다.
+    """
+    if _seen is None:
+        _seen = set()
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True, index=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, pd.Index):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (pa.Table, pa.RecordBatch, pa.Array)):
+        return int(value.nbytes)
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return len(value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(sizeof(k, _seen) + sizeof(v, _seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(sizeof(item, _seen) for item in value)
+    if hasattr(value, '__dict__') and not isinstance(value, type):
+        return sys.getsizeof(value) + sizeof(vars(value), _seen)
+    return sys.getsizeof(value)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        # 다른 사용자의 프로세스이거나 확인할 수 없으면 지우지 않음
+        return True
+    return True
+
+
+def _remove_stale_spill_dirs(own_dir):
+    """이전 실행이 남긴 spill 폴더 정리
+
+    이미 끝난 프로세스의 폴더는 지우고, 자기 폴더도 비우고 시작한다
+    (컨테이너에서는 재시작해도 같은 PID를 받으므로 남은 파일은 이전 프로세스 것).
+    """
+    shutil.rmtree(own_dir, ignore_errors=True)
+    if not own_dir.parent.is_dir():
+        return
+    for path in own_dir.parent.iterdir():
+        if path.is_dir() and path.name.isdigit() and not _pid_alive(int(path.name)):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+class MemoryCache:
+    """바이트 예산이 있는 프로세스 공유 LRU 캐시
+
+    - put할 때 값의 실제 크기(sizeof)를 재고, 합계가 max_bytes를 넘으면 가장 오래 안 쓴 항목부터 내보냄
+    - spill_dir가 있으면 내보낸 항목을 압축 pickle로 디스크에 두고, 다시 요청되면 읽어서 메모리로 올림
+      (디스크도 spill_max_bytes를 넘으면 오래된 파일부터 지움)
+    - hit/miss/spill hit/eviction 횟수와 메모리/디스크 사용량을 stats()로 보고
+    반환하는 값은 모든 세션이 공유하므로 호출하는 쪽에서 수정하지 않는다.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES, spill_dir=DEFAULT_SPILL_DIR, spill_max_bytes=DEFAULT_SPILL_BYTES):
+        self.max_bytes = max_bytes
+        # 같은 폴더를 쓰는 다른 프로세스(replica)와 파일이 섞이지 않도록 프로세스별 하위 폴더 사용
+        self.spill_dir = Path(spill_dir) / str(os.getpid()) if spill_dir is not None else None
+        if self.spill_dir is not None:
+            _remove_stale_spill_dirs(self.spill_dir)
+            atexit.register(shutil.rmtree, self.spill_dir, ignore_errors=True)
+        self.spill_max_bytes = spill_max_bytes
+        # key -> (value, size, expires_at)
+        self._entries = OrderedDict()
+        # key -> (path, compressed size, expires_at)
+        self._spilled = OrderedDict()
+        self._resident = 0
+        self._spilled_bytes = 0
+        self._counts = {'hits': 0, 'spill_hits': 0, 'misses': 0, 'evictions': 0, 'spills': 0}
+        self._lock = threading.Lock()
+        # 같은 key를 동시에 계산하지 않도록 (cached decorator가 사용, rerun마다 다시 정의되는 함수도 공유)
+        self.flight = SingleFlight()
+
+    def _spill_prefix(self, key):
+        return hashlib.blake2b(repr(key).encode('utf-8'), digest_size=16).hexdigest()
+
+    def _drop_spilled(self, key):
+        # lock 안에서 장부만 정리하고, 지울 파일 경로를 돌려줌 (파일 삭제는 lock 밖에서)
+        path, size, _ = self._spilled.pop(key)
+        self._spilled_bytes -= size
+        return path
+
+    def _write_spill(self, key, value, expires_at):
+        """lock 밖에서 압축/쓰기 후 장부에 등록 (그 사이 같은 key가 다시 들어왔으면 버림)"""
+        # 디스크에 못 쓰는 값(pickle 불가 등)은 그냥 버림
+        try:
+            data = zlib.compress(pickle.dumps(value, protocol=5), SPILL_COMPRESSION)
+        except Exception:
+            return
+        if len(data) > self.spill_max_bytes:
+            return
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        # 같은 key를 동시에 내보내거나 읽는 중인 파일과 겹치지 않도록 매번 새 파일 이름
+        fd, path = tempfile.mkstemp(dir=self.spill_dir, prefix=f'{self._spill_prefix(key)}.', suffix='.pkl.z')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        path = Path(path)
+
+        stale = []
+        with self._lock:
+            if key in self._entries:
+                stale.append(path)
+            else:
+                if key in self._spilled:
+                    stale.append(self._drop_spilled(key))
+                self._spilled[key] = (path, len(data), expires_at)
+                self._spilled_bytes += len(data)
+                self._counts['spills'] += 1
+                while self._spilled_bytes > self.spill_max_bytes:
+                    stale.append(self._drop_spilled(next(iter(self._spilled))))
+        self._unlink(stale)
+
+    @staticmethod
+    def _unlink(paths):
+        for path in paths:
+            path.unlink(missing_ok=True)
+
+    def _evict(self):
+        # lock 안에서 호출: LRU에서 빼기만 하고, 디스크로 내릴 항목 목록을 돌려줌
+        victims = []
+        while self._resident > self.max_bytes and self._entries:
+            key, (value, size, expires_at) = self._entries.popitem(last=False)
+            self._resident -= size
+            self._counts['evictions'] += 1
+            if self.spill_dir is not None and expires_at > time.time():
+                victims.append((key, value, expires_at))
+        return victims
+
+    def _spill_all(self, victims):
+        for victim in victims:
+            self._write_spill(*victim)
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[2] > now:
+                    self._entries.move_to_end(key)
+                    self._counts['hits'] += 1
+                    return entry[0]
+                self._resident -= entry[1]
+                del self._entries[key]
+
+            spilled = self._spilled.get(key)
+            if spilled is None:
+                self._counts['misses'] += 1
+                return default
+            # 장부에서 먼저 빼 두고 (다른 호출은 miss로 봄) 파일은 lock 밖에서 읽음
+            expires_at = spilled[2]
+            path = self._drop_spilled(key)
+
+        value = _MISSING
+        if expires_at > now:
+            try:
+                value = pickle.loads(zlib.decompress(path.read_bytes()))
+            except (OSError, zlib.error, pickle.UnpicklingError):
+                pass
+        # 다시 메모리로 올리거나(만료/손상이면 버리고) 디스크 파일은 지움
+        self._unlink([path])
+        if value is _MISSING:
+            with self._lock:
+                self._counts['misses'] += 1
+            return default
+        self._put(key, value, expires_at, spill_hit=True)
+        return value
+
+    def _put(self, key, value, expires_at, spill_hit=False):
+        size = sizeof(value)
+        stale = []
+        with self._lock:
+            if spill_hit:
+                self._counts['spill_hits'] += 1
+            if key in self._spilled:
+                stale.append(self._drop_spilled(key))
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._resident -= old[1]
+            if size > self.max_bytes:
+                # 예산보다 큰 값은 메모리에 두지 않고 바로 디스크로
+                victims = [(key, value, expires_at)] if self.spill_dir is not None else []
+            else:
+                self._entries[key] = (value, size, expires_at)
+                self._resident += size
+                victims = self._evict()
+        self._unlink(stale)
+        self._spill_all(victims)
+
+    def put(self, key, value, ttl=None):
+        expires_at = time.time() + ttl if ttl is not None else float('inf')
+        self._put(key, value, expires_at)
+        return value
+
+    def clear(self):
+        with self._lock:
+            stale = [self._drop_spilled(key) for key in list(self._spilled)]
+            self._entries.clear()
+            self._resident = 0
+        self._unlink(stale)
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self._counts)
+            lookups = counts['hits'] + counts['spill_hits'] + counts['misses']
+            return {
+                **counts,
+                'hit_rate': (counts['hits'] + counts['spill_hits']) / lookups if lookups else None,
+                'entries': len(self._entries),
+                'resident_bytes': self._resident,
+                'max_bytes': self.max_bytes,
+                'spilled_entries': len(self._spilled),
+                'spilled_bytes': self._spilled_bytes,
+            }
+
+    def prometheus_text(self, prefix='streamlit_cache'):
+        """Prometheus text exposition 형식 (메모리/디스크 사용량 gauge + 조회 counter)"""
+        stats = self.stats()
+        lines = []
+        for name, kind, help_text in (
+            ('resident_bytes', 'gauge', 'Bytes held in memory by the cache.'),
+            ('max_bytes', 'gauge', 'Memory budget of the cache.'),
+            ('spilled_bytes', 'gauge', 'Compressed bytes spilled to disk.'),
+            ('entries', 'gauge', 'Entries held in memory.'),
+        ):
+            lines += [f'# HELP {prefix}_{name} {help_text}', f'# TYPE {prefix}_{name} {kind}',
+                      f'{prefix}_{name} {stats[name]}']
+        name = f'{prefix}_lookups_total'
+        lines += [f'# HELP {name} Cache lookups by result.', f'# TYPE {name} counter']
+        for result in ('hits', 'spill_hits', 'misses'):
+            lines.append(f'{name}{{result="{result}"}} {stats[result]}')
+        name = f'{prefix}_evictions_total'
+        lines += [f'# HELP {name} Entries evicted from memory.', f'# TYPE {name} counter',
+                  f"{name} {stats['evictions']}"]
+        return '\n'.join(lines) + '\n'
+
+
+def _call_key(func, args, kwargs):
+    # st.cache_data처럼 '_'로 시작하는 인자는 key에서 제외
+    names = func.__code__.co_varnames[:func.__code__.co_argcount]
+    args = tuple(arg for name, arg in zip(names, args) if not name.startswith('_')) + args[len(names):]
+    kwargs = tuple(sorted((name, value) for name, value in kwargs.items() if not name.startswith('_')))
+    return func.__module__, func.__qualname__, args, kwargs
+
+
+def cached(cache, ttl=None):
+    """함수 결과를 cache에 (함수 이름, 인자) key로 저장하는 decorator
+
+    인자는 hash 가능한 값(str, date, tuple 등)이어야 하고, 예외는 캐시하지 않는다.
+    Streamlit rerun마다 함수가 다시 정의되어도 이름이 같으면 같은 항목을 쓴다.
+    st.cache_data처럼 같은 key를 여러 세션이 동시에 놓치면 한 번만 계산하고 나머지는 그 결과를 받는다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = _call_key(func, args, kwargs)
+            value = cache.get(key, _MISSING)
+            if value is _MISSING:
+                value = cache.flight.do(key, lambda: cache.put(key, func(*args, **kwargs), ttl))
+            return value
+
+        wrapper.cache = cache
+        return wrapper
+    return decorator
+
+
+# 프로세스 전체에서 하나의 예산을 공유하는 기본 캐시
+CACHE = MemoryCache()
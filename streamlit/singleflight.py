@@ -0,0 +1,55 @@
+import threading
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """같은 key로 동시에 들어온 호출을 하나로 합친다
+
+    먼저 들어온 호출만 실제로 fn을 실행하고, 실행 중에 같은 key로 들어온 호출은 그 결과(또는 예외)를 함께 받는다.
+    실행이 끝나면 key는 지워지므로 결과 자체를 캐시하지는 않는다.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+        return future.result()
+
+    def submit(self, key, executor, fn, *args, **kwargs):
+        """fn을 executor에서 실행하고 Future를 반환 (같은 key가 실행 중이면 그 Future를 그대로 반환)"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                return future
+            future = executor.submit(fn, *args, **kwargs)
+            self._calls[key] = future
+
+        def _forget(done):
+            with self._lock:
+                if self._calls.get(key) is done:
+                    del self._calls[key]
+
+        future.add_done_callback(_forget)
+        return future
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)
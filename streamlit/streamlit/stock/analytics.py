@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from statements import format_statement
+
+# 대시보드와 batch report(report.py)가 같이 쓰는 계산 (Streamlit에 의존하지 않음)
+
+TRADING_DAYS = 252
+
+STATEMENT_TITLES = {
+    'balance_sheet': '📊 Balance Sheet (Annual)',
+    'income_statement': '💰 Income Statement (Annual)',
+    'cash_flow': '💸 Cash Flow Statement (Annual)',
+}
+
+SENTIMENT_LABELS = ['Positive', 'Neutral', 'Negative']
+
+
+def price_column_for(data):
+    """수익률 계산에 쓸 가격 컬럼 (Adj Close가 있으면 우선, 없으면 Close, 둘 다 없으면 None)"""
+    for column in ('Adj Close', 'Close'):
+        if column in data.columns:
+            return column
+    return None
+
+
+def pricing_stats(changes):
+    """PriceView.changes() 결과('% Change' 컬럼)로 가격 탭의 연간 수익률/표준편차/위험 조정 수익률"""
+    change = changes['% Change']
+    annual_return = change.mean() * TRADING_DAYS * 100
+    stdev = np.std(change) * np.sqrt(TRADING_DAYS) * 100
+    return {
+        'annual_return': annual_return,
+        'stdev': stdev,
+        'risk_adj_return': annual_return / stdev if stdev else np.nan,
+        'observations': len(change),
+        'start': changes.index[0] if len(changes) else pd.NaT,
+        'end': changes.index[-1] if len(changes) else pd.NaT,
+    }
+
+
+def format_statements(balance_sheet, income_statement, cash_flow):
+    """재무제표 3종을 화면/리포트용 숫자 테이블로 ({이름: DataFrame 또는 None})"""
+    return {
+        'balance_sheet': format_statement(balance_sheet),
+        'income_statement': format_statement(income_statement),
+        'cash_flow': format_statement(cash_flow),
+    }
+
+
+def sentiment_counts(news, label_column):
+    """감정 라벨별 기사 수 (0인 라벨 포함, Positive/Neutral/Negative 순서)"""
+    return news[label_column].value_counts(sort=False).reindex(SENTIMENT_LABELS, fill_value=0)
+
+
+def sentiment_summary(news):
+    """뉴스 프레임의 기사 수, 평균 점수, 제목/요약 라벨별 비율"""
+    summary = {
+        'articles': len(news),
+        'sentiment_title_avg': news['sentiment_title'].mean() if len(news) else np.nan,
+        'sentiment_summary_avg': news['sentiment_summary'].mean() if len(news) else np.nan,
+    }
+    for label_column, prefix in (('title_label', 'title'), ('summary_label', 'summary')):
+        counts = sentiment_counts(news, label_column)
+        for label, count in counts.items():
+            summary[f'{prefix}_{label.lower()}_pct'] = count / len(news) * 100 if len(news) else np.nan
+    return summary
@@ -0,0 +1,194 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+STRATEGIES = ['SMA Crossover', 'Momentum', 'Sentiment']
+
+# 전략별 (파라미터 이름 목록, 기본 파라미터, sweep 격자)
+PARAMS = {
+    'SMA Crossover': ['fast', 'slow'],
+    'Momentum': ['lookback', 'threshold'],
+    'Sentiment': ['threshold'],
+}
+DEFAULTS = {
+    'SMA Crossover': {'fast': 20, 'slow': 50},
+    'Momentum': {'lookback': 60, 'threshold': 0.0},
+    'Sentiment': {'threshold': 0.05},
+}
+GRIDS = {
+    'SMA Crossover': {'fast': np.arange(5, 55, 5), 'slow': np.arange(20, 260, 10)},
+    'Momentum': {'lookback': np.arange(10, 260, 10), 'threshold': np.round(np.arange(-0.10, 0.105, 0.01), 2)},
+    'Sentiment': {'threshold': np.round(np.arange(-0.5, 0.525, 0.025), 3)},
+}
+
+SENTIMENT_COLUMNS = {'Title': 'sentiment_title_avg', 'Summary': 'sentiment_summary_avg'}
+
+# 여러 ticker sweep을 프로세스 풀에 나눠 보내는 최소 ticker 수 (적으면 프로세스 간 전송 비용이 더 큼)
+PARALLEL_TICKERS = 8
+
+METRIC_COLUMNS = ['Total Return %', 'Annual Return %', 'Volatility %', 'Sharpe', 'Max Drawdown %', 'Trades',
+                  'Exposure %']
+
+
+def rolling_means(close, windows):
+    """누적 합 한 번으로 여러 window의 단순 이동평균을 (windows x T) 배열로 (window가 안 차면 NaN)"""
+    close = np.asarray(close, dtype=float)
+    windows = np.asarray(windows, dtype=int)
+    csum = np.concatenate([[0.0], np.cumsum(close)])
+    t = np.arange(1, len(close) + 1)
+    start = t[None, :] - windows[:, None]
+    means = (csum[t][None, :] - csum[np.maximum(start, 0)]) / windows[:, None]
+    means[start < 0] = np.nan
+    return means
+
+
+def sma_positions(close, fast, slow):
+    """fast 이동평균이 slow 이동평균 위에 있으면 보유 -> (len(fast) x len(slow) x T)
+
+    fast >= slow 조합은 의미가 없으므로 보유하지 않음(0)으로 두고 결과에서 NaN 처리한다.
+    """
+    fast, slow = np.atleast_1d(fast), np.atleast_1d(slow)
+    windows = np.union1d(fast, slow)
+    means = rolling_means(close, windows)
+    fast_ma = means[np.searchsorted(windows, fast)]
+    slow_ma = means[np.searchsorted(windows, slow)]
+    with np.errstate(invalid='ignore'):
+        positions = fast_ma[:, None, :] > slow_ma[None, :, :]
+    positions &= (fast[:, None] < slow[None, :])[:, :, None]
+    return positions.astype(np.float32)
+
+
+def momentum_positions(close, lookback, threshold):
+    """lookback 기간 수익률이 threshold보다 크면 보유 -> (len(lookback) x len(threshold) x T)"""
+    close = np.asarray(close, dtype=float)
+    lookback, threshold = np.atleast_1d(lookback), np.atleast_1d(threshold)
+    past = np.full((len(lookback), len(close)), np.nan)
+    for i, lb in enumerate(lookback):
+        past[i, lb:] = close[:-lb] if lb < len(close) else []
+    with np.errstate(invalid='ignore'):
+        momentum = close[None, :] / past - 1
+        positions = momentum[:, None, :] > threshold[None, :, None]
+    return positions.astype(np.float32)
+
+
+def threshold_positions(scores, threshold):
+    """점수(뉴스 감정 등)가 threshold 이상인 날 보유, 점수가 없는 날은 보유하지 않음 -> (len(threshold) x T)"""
+    scores = np.asarray(scores, dtype=float)
+    threshold = np.atleast_1d(threshold)
+    with np.errstate(invalid='ignore'):
+        positions = scores[None, :] >= threshold[:, None]
+    return positions.astype(np.float32)
+
+
+def simple_returns(close):
+    """일간 수익률 배열 (첫날은 0)"""
+    values = close.to_numpy(dtype=float)
+    return np.r_[0.0, np.diff(values) / values[:-1]]
+
+
+def strategy_returns(positions, returns, cost=0.0):
+    """(..., T) 보유 신호로 일간 전략 수익률 (..., T)
+
+    t일 종가에 나온 신호로 t+1일 수익률을 받으므로 신호를 하루 밀어서 적용하고,
+    포지션이 바뀐 만큼(진입/청산 각각) cost(수익률 단위)를 뺀다.
+    """
+    held = np.zeros_like(positions)
+    held[..., 1:] = positions[..., :-1]
+    turnover = np.abs(np.diff(held, axis=-1, prepend=0))
+    return held * np.asarray(returns, dtype=np.float32) - cost * turnover, held, turnover
+
+
+def evaluate(positions, returns, cost=0.0):
+    """격자 전체의 성과 지표를 한 번에 계산 -> {지표: (...) 배열}
+
+    연간 수익률/변동성은 가격 탭과 같은 방식(일간 평균 * 252, 모표준편차 * sqrt(252))을 사용한다.
+    """
+    daily, held, turnover = strategy_returns(positions, returns, cost)
+    equity = np.cumprod(1 + daily, axis=-1)
+    peak = np.maximum.accumulate(np.maximum(equity, 1), axis=-1)
+    annual = daily.mean(axis=-1) * TRADING_DAYS
+    volatility = daily.std(axis=-1) * np.sqrt(TRADING_DAYS)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.where(volatility > 0, annual / volatility, np.nan)
+    return {
+        'Total Return %': (equity[..., -1] - 1) * 100,
+        'Annual Return %': annual * 100,
+        'Volatility %': volatility * 100,
+        'Sharpe': sharpe,
+        'Max Drawdown %': (equity / peak - 1).min(axis=-1) * 100,
+        'Trades': turnover.sum(axis=-1),
+        'Exposure %': held.mean(axis=-1) * 100,
+    }
+
+
+def positions_for(strategy, close, grid, scores=None):
+    """전략과 파라미터 격자로 (격자 모양 x T) 보유 신호"""
+    if strategy == 'SMA Crossover':
+        return sma_positions(close, grid['fast'], grid['slow'])
+    if strategy == 'Momentum':
+        return momentum_positions(close, grid['lookback'], grid['threshold'])
+    if strategy == 'Sentiment':
+        if scores is None:
+            raise ValueError("Sentiment strategy needs sentiment scores")
+        return threshold_positions(scores, grid['threshold'])
+    raise ValueError(f"Unknown strategy: {strategy}")
+
+
+def sweep(close, strategy, grid=None, cost=0.0, scores=None):
+    """격자의 모든 파라미터 조합을 한 번에 평가 -> 조합별 한 행 DataFrame
+
+    close: 가격 Series, scores: close와 같은 index의 감정 점수 Series (Sentiment 전략만)
+    """
+    grid = {name: np.atleast_1d(values) for name, values in (grid or GRIDS[strategy]).items()}
+    close = close.dropna()
+    if len(close) < 3:
+        raise ValueError("Not enough price history to backtest")
+    if scores is not None:
+        scores = scores.reindex(close.index).to_numpy(dtype=float)
+    returns = simple_returns(close)
+
+    metrics = evaluate(positions_for(strategy, close, grid, scores), returns, cost)
+    names = PARAMS[strategy]
+    mesh = np.meshgrid(*(grid[name] for name in names), indexing='ij')
+    frame = pd.DataFrame({name: values.ravel() for name, values in zip(names, mesh)})
+    for column in METRIC_COLUMNS:
+        frame[column] = np.asarray(metrics[column], dtype=float).ravel()
+    if strategy == 'SMA Crossover':
+        frame.loc[frame['fast'] >= frame['slow'], METRIC_COLUMNS] = np.nan
+    return frame
+
+
+def run(close, strategy, params, cost=0.0, scores=None):
+    """파라미터 한 조합의 (누적 가치 DataFrame [Strategy, Buy & Hold], 지표 Series)"""
+    close = close.dropna()
+    grid = {name: [params[name]] for name in PARAMS[strategy]}
+    if scores is not None:
+        scores = scores.reindex(close.index).to_numpy(dtype=float)
+    returns = simple_returns(close)
+
+    positions = positions_for(strategy, close, grid, scores).reshape(-1, len(close))[0]
+    daily, _, _ = strategy_returns(positions, returns, cost)
+    curves = pd.DataFrame({
+        'Strategy': np.cumprod(1 + daily.astype(float)),
+        'Buy & Hold': np.cumprod(1 + returns),
+    }, index=close.index)
+    metrics = {name: float(np.ravel(values)[0]) for name, values in evaluate(positions, returns, cost).items()}
+    return curves, pd.Series(metrics, name=strategy)
+
+
+def _best(ticker, close, strategy, grid, cost, metric):
+    frame = sweep(close, strategy, grid, cost)
+    row = frame.loc[frame[metric].idxmax()] if frame[metric].notna().any() else frame.iloc[0]
+    return pd.Series(row, name=ticker)
+
+
+def sweep_many(closes, strategy, grid=None, cost=0.0, metric='Sharpe', executor=None):
+    """ticker마다 격자 sweep 후 metric이 가장 좋은 조합 한 행씩 (ticker가 많으면 executor에 나눠 보냄)"""
+    tickers = [ticker for ticker, close in closes.items() if close.notna().sum() >= 3]
+    jobs = [(ticker, closes[ticker], strategy, grid, cost, metric) for ticker in tickers]
+    if executor is not None and len(jobs) >= PARALLEL_TICKERS:
+        rows = list(executor.map(_best, *zip(*jobs)))
+    else:
+        rows = [_best(*job) for job in jobs]
+    return pd.DataFrame(rows)
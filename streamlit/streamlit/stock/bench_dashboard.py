@@ -0,0 +1,191 @@
+"""대시보드 스크립트 rerun 벤치마크 (네트워크 없이 fixture source로 실행)
+
+    python bench_dashboard.py                 # 전체 시나리오
+    python bench_dashboard.py -k portfolio    # 이름에 'portfolio'가 들어간 시나리오만
+    python bench_dashboard.py --json out.json --recorded data/recorded
+    python bench_dashboard.py --warm          # serve.py warm-up을 한 뒤 startup 측정
+
+시나리오마다 새 프로세스에서 Streamlit AppTest로 실행하고 다음 값을 보고한다.
+- startup: 프로세스 시작 후 첫 실행 (기본 위젯 값, import 포함) = 새 세션의 time-to-first-paint
+  TTFP_TARGET_S(기본 1.5초)를 넘으면 실패로 표시
+- cold: 시나리오 입력으로 바꾸고 st.cache_* / 디스크 캐시를 비운 뒤 실행
+- warm: 같은 입력으로 한 번 더 rerun
+- rss: 프로세스 최대 RSS, elements: 실행 결과 element 개수 (delta 수)
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+
+STOCK_DIR = Path(__file__).resolve().parent
+APP_DIR = STOCK_DIR.parents[1]
+
+DEFAULT_TIMEOUT = 120
+TTFP_TARGET_S = float(os.getenv('TTFP_TARGET_S', 1.5))
+HISTORY_YEARS = [1, 5, 20]
+PORTFOLIO_SIZES = [5, 25, 100]
+PORTFOLIO_UNIVERSE = [f'T{i:03d}' for i in range(max(PORTFOLIO_SIZES))]
+
+
+def count_elements(node):
+    """element tree에서 Block이 아닌 노드(화면에 보내는 element) 개수"""
+    children = getattr(node, 'children', None)
+    if children is None:
+        return 1
+    return sum(count_elements(child) for child in children.values())
+
+
+def dashboard_inputs(section='Pricing Data', years=1, tickers=None):
+    def apply(at):
+        sidebar = at.sidebar
+        if tickers is not None:
+            sidebar.radio[0].set_value('Portfolio')
+            at.run()
+            at.sidebar.text_area[0].set_value(', '.join(tickers))
+        sidebar = at.sidebar
+        sidebar.date_input[0].set_value(date.today() - timedelta(days=365 * years))
+        sidebar.date_input[1].set_value(date.today())
+        if tickers is None:
+            at.radio(key='section').set_value(section)
+    return apply
+
+
+def intraday_inputs(interval):
+    def apply(at):
+        at.sidebar.radio[0].set_value('Intraday')
+        at.run()
+        at.sidebar.radio[1].set_value(interval)
+    return apply
+
+
+def _scenarios():
+    scenarios = {}
+    for years in HISTORY_YEARS:
+        scenarios[f'dashboard/pricing/{years}y'] = (STOCK_DIR / 'dashboard.py', dashboard_inputs('Pricing Data', years))
+    scenarios['dashboard/fundamentals'] = (STOCK_DIR / 'dashboard.py', dashboard_inputs('Fundamental Data'))
+    scenarios['dashboard/news'] = (STOCK_DIR / 'dashboard.py', dashboard_inputs('Top 10 News'))
+    scenarios['dashboard/risk'] = (STOCK_DIR / 'dashboard.py', dashboard_inputs('Risk'))
+    scenarios['dashboard/backtest'] = (STOCK_DIR / 'dashboard.py', dashboard_inputs('Backtest'))
+    for size in PORTFOLIO_SIZES:
+        scenarios[f'dashboard/portfolio/{size}'] = (
+            STOCK_DIR / 'dashboard.py', dashboard_inputs(years=1, tickers=PORTFOLIO_UNIVERSE[:size]))
+    for interval in ['1m', '5m']:
+        scenarios[f'dashboard/intraday/{interval}'] = (STOCK_DIR / 'dashboard.py', intraday_inputs(interval))
+    for name in ['streamlit_test.py', '00_text.py', '01_data.py', '02_basic_ui.py']:
+        scenarios[name] = (APP_DIR / name, None)
+    return scenarios
+
+
+SCENARIOS = _scenarios()
+
+
+def _timed_run(at, timeout):
+    started = time.perf_counter()
+    at.run(timeout=timeout)
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed, count_elements(at._tree)
+
+
+def run_scenario(name, data_dir, recorded=None, timeout=DEFAULT_TIMEOUT, warm=False):
+    """새 프로세스 안에서 시나리오 하나를 실행 (import 전에 데이터 위치와 fixture를 설정)"""
+    os.environ['STOCK_DATA_DIR'] = data_dir
+    os.environ.setdefault('ALPHAVANTAGE_API_KEY', 'fixture-key')
+    for path in (STOCK_DIR, APP_DIR):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+    started = time.perf_counter()
+    import streamlit as st
+    from streamlit.testing.v1 import AppTest
+
+    import fixtures
+    from memory_cache import CACHE
+    fixtures.install(recorded)
+    if warm:
+        import serve
+        serve.warm_up(lexicon=False)
+    import_time = time.perf_counter() - started
+
+    script, apply = SCENARIOS[name]
+    result = {'scenario': name, 'import_s': import_time}
+    try:
+        at = AppTest.from_file(str(script), default_timeout=timeout)
+        result['startup_s'], result['startup_elements'] = _timed_run(at, timeout)
+        if result['startup_s'] > TTFP_TARGET_S:
+            result['slow_startup'] = True
+
+        if apply is not None:
+            apply(at)
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        CACHE.clear()
+        shutil.rmtree(data_dir, ignore_errors=True)
+        result['cold_s'], result['cold_elements'] = _timed_run(at, timeout)
+        result['warm_s'], result['warm_elements'] = _timed_run(at, timeout)
+        # 스크립트가 잡아서 st.error로 보여준 오류 (예외는 아니지만 결과가 잘못된 실행)
+        result['app_errors'] = [element.value for element in at.error]
+    except Exception as e:
+        result['error'] = f'{type(e).__name__}: {e}'
+    # Linux의 ru_maxrss 단위는 KB
+    result['rss_mb'] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result
+
+
+def format_table(results):
+    columns = ['scenario', 'startup_s', 'cold_s', 'warm_s', 'rss_mb', 'cold_elements', 'warm_elements']
+    rows = [[name.replace('_s', ' (s)').replace('_', ' ') for name in columns]]
+    for result in results:
+        row = []
+        for column in columns:
+            value = result.get(column, '-')
+            row.append(f'{value:.3f}' if isinstance(value, float) else str(value))
+        if 'error' in result:
+            row.append(result['error'])
+        elif result.get('app_errors'):
+            row.append('; '.join(result['app_errors']))
+        elif result.get('slow_startup'):
+            row.append(f'startup over {TTFP_TARGET_S}s target')
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows if i < len(row)) for i in range(len(columns))]
+    return '\n'.join('  '.join(cell.ljust(width) for cell, width in zip(row, widths + [0])) for row in rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('-k', dest='pattern', default='', help='이름에 이 문자열이 들어간 시나리오만 실행')
+    parser.add_argument('--recorded', help="'<TICKER>.parquet' 가격 기록이 있는 디렉터리")
+    parser.add_argument('--json', help='결과를 JSON으로 저장할 경로')
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument('--warm', action='store_true', help='serve.py와 같은 warm-up 후 측정')
+    args = parser.parse_args(argv)
+
+    names = [name for name in SCENARIOS if args.pattern in name]
+    results = []
+    # 시나리오마다 새 프로세스를 써야 startup 시간과 최대 RSS가 서로 섞이지 않는다
+    for name in names:
+        with tempfile.TemporaryDirectory(prefix='stock_bench_') as data_dir, \
+                ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as pool:
+            result = pool.submit(run_scenario, name, data_dir, args.recorded, args.timeout, args.warm).result()
+        results.append(result)
+        print(f"{name}: {result.get('error') or '; '.join(result.get('app_errors', [])) or 'ok'}", file=sys.stderr)
+
+    print(format_table(results))
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+    failed = [result for result in results
+              if 'error' in result or result.get('app_errors') or result.get('slow_startup')]
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
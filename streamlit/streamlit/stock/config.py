@@ -0,0 +1,45 @@
+import os
+import threading
+from pathlib import Path
+
+_settings = None
+_lock = threading.Lock()
+
+
+class Settings:
+    """.env와 환경 변수에서 읽은 대시보드 설정"""
+
+    def __init__(self, environ):
+        self.alphavantage_api_key = environ.get('ALPHAVANTAGE_API_KEY')
+        # Alpha Vantage 계정 단위 호출 한도 (무료 키 25 calls/day)
+        self.alphavantage_daily_quota = int(environ.get('ALPHAVANTAGE_DAILY_QUOTA', 25))
+        # 로컬 캐시/저장소 기본 위치
+        self.data_dir = Path(environ.get('STOCK_DATA_DIR', Path(__file__).resolve().parent / 'data'))
+        self.fetch_max_workers = int(environ.get('FETCH_MAX_WORKERS', 8))
+        self.metrics_port = int(environ['METRICS_PORT']) if environ.get('METRICS_PORT') else None
+        self.admin_panel = environ.get('STOCK_ADMIN_PANEL') == '1'
+        # 백그라운드로 갱신할 ticker 목록 ('AAPL, MSFT' 또는 파일 경로), 갱신 주기(초)
+        self.watchlist = environ.get('STOCK_WATCHLIST', '')
+        self.watchlist_price_interval = int(environ.get('WATCHLIST_PRICE_INTERVAL', 300))
+        self.watchlist_news_interval = int(environ.get('WATCHLIST_NEWS_INTERVAL', 3600))
+        self.watchlist_fundamentals_interval = int(environ.get('WATCHLIST_FUNDAMENTALS_INTERVAL', 86400))
+
+
+def load():
+    """설정을 프로세스당 한 번만 읽음 (rerun마다 .env 파일을 다시 읽지 않음)"""
+    global _settings
+    with _lock:
+        if _settings is None:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _settings = Settings(os.environ)
+        return _settings
+
+
+def reload():
+    """환경 변수를 바꾼 뒤 다시 읽을 때 (테스트/벤치마크용)"""
+    global _settings
+    with _lock:
+        _settings = None
+    return load()
@@ -1,26 +1,180 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import yfinance as yf
-import plotly.express as px
 from datetime import datetime, timedelta
-from dateutil.relativedelta import relativedelta
 import os
-from dotenv import load_dotenv
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
 
-load_dotenv()
+# streamlit/ 폴더의 공용 모듈(data_export 등)을 같이 사용
+sys.path.append(str(Path(__file__).resolve().parents[2]))
 
-ALPHAVANTAGE_API_KEY = os.getenv('ALPHAVANTAGE_API_KEY')
+import analytics
+import config
+from data_export import download_widget, frame_fingerprint
+from downsample import DEFAULT_MAX_POINTS, DOWNSAMPLE_METHODS, downsample_frame
+from fetch_service import FetchService
+from fundamentals import AlphaVantageFetcher, FundamentalsClient
+from memory_cache import CACHE, cached
+from intraday import DEFAULT_CAPACITY, IntradayFeed, YFinanceIntradayFetcher
+from indicators import IndicatorEngine, add_overlays, INDICATOR_OPTIONS
+from news_cache import NewsCache, RSSNewsSource, SENTIMENT_ICONS, VaderScorer, render_cards_html
+from sentiment_store import SentimentStore
+from portfolio import correlation_matrix, drawdowns, equal_weight_curve, parse_tickers, portfolio_stats, price_matrix
+from price_store import PriceStore, YFinanceFetcher
+from price_views import PriceView
+import risk
+import backtest
+import sources
+import symbols
+from tracing import TRACER, mark_miss, span, start_metrics_server
+from watchlist import WatchlistScheduler, load_watchlist
+
+# 파생 컬럼을 만들 때 원본 컬럼 버퍼를 복사하지 않도록 copy-on-write 사용
+pd.set_option('mode.copy_on_write', True)
+
+# .env는 프로세스당 한 번만 읽음 (rerun마다 파일을 다시 읽지 않음)
+settings = config.load()
+ALPHAVANTAGE_API_KEY = settings.alphavantage_api_key
 
 end_date = datetime.now().date()
 # start_date = end_date - timedelta(days=1)
-start_date = end_date - relativedelta(years=1)
+start_date = (pd.Timestamp(end_date) - pd.DateOffset(years=1)).date()
 
 st.title('Stock Dashboard')
-ticker = st.sidebar.text_input('Ticker', 'AAPL')
+mode = st.sidebar.radio('Mode', ['Single Ticker', 'Portfolio', 'Intraday'], horizontal=True)
+if mode == 'Portfolio':
+    tickers_text = st.sidebar.text_area('Tickers', 'AAPL, MSFT, GOOGL, AMZN, NVDA, META, TSLA')
+    ticker = None
+else:
+    ticker = st.sidebar.text_input('Ticker', 'AAPL')
 start_date = st.sidebar.date_input("Start Date", value=start_date)
 end_date = st.sidebar.date_input("End Date", value=end_date)
 
+@st.cache_resource
+def get_price_store():
+    # 프로세스 전체에서 하나의 가격 캐시를 공유 (data/cache/prices)
+    return PriceStore(fetcher=sources.create('prices', YFinanceFetcher))
+
+
+@st.cache_resource
+def get_fetch_service():
+    # 모든 세션의 upstream 호출을 같은 풀에서 실행하고, 같은 요청은 한 번만 보냄
+    return FetchService(max_workers=settings.fetch_max_workers)
+
+
+@st.cache_resource
+def get_fundamentals_client(api_key):
+    # 디스크 캐시 + 호출 한도 관리는 프로세스 전체에서 공유
+    return FundamentalsClient(api_key, fetcher=sources.create('fundamentals', lambda: AlphaVantageFetcher(api_key)))
+
+
+@st.cache_resource
+def get_sentiment_store():
+    # 뉴스 감정 점수 + 반영 거래일(check_day) 가격 변화 누적 저장소 (data/sentiment.db)
+    return SentimentStore()
+
+
+@st.cache_resource
+def get_news_cache():
+    # ticker별 15분 TTL, 이미 점수를 매긴 기사는 다시 NLTK를 돌리지 않음
+    # 새로 받은 기사는 감정 저장소에도 쌓아 둠
+    return NewsCache(source=sources.create('news', RSSNewsSource), scorer=sources.create('sentiment', VaderScorer),
+                     ttl=900, sink=get_sentiment_store().append_news)
+
+
+@st.cache_resource
+def get_watchlist_scheduler():
+    # STOCK_WATCHLIST가 있으면 프로세스당 하나의 scheduler가 watchlist의 가격/뉴스/재무제표를 미리 받아 둠
+    tickers = load_watchlist(settings.watchlist)
+    if not tickers:
+        return None
+    fundamentals = get_fundamentals_client(ALPHAVANTAGE_API_KEY) if ALPHAVANTAGE_API_KEY else None
+    return WatchlistScheduler(
+        tickers, get_price_store(), get_news_cache(), fundamentals,
+        price_interval=settings.watchlist_price_interval,
+        news_interval=settings.watchlist_news_interval,
+        fundamentals_interval=settings.watchlist_fundamentals_interval,
+    ).start()
+
+
+@st.cache_resource
+def get_metrics_server():
+    # METRICS_PORT가 있으면 프로세스당 한 번 /metrics (Prometheus text) 서버를 띄움
+    port = settings.metrics_port
+    return start_metrics_server(TRACER, port, collectors=[CACHE.prometheus_text]) if port else None
+
+
+@st.cache_resource
+def get_process_pool():
+    # Monte Carlo 청크/여러 ticker 백테스트를 나눠 돌릴 프로세스 풀 (프로세스당 하나, 코어가 하나면 현재 프로세스에서 실행)
+    # Streamlit 서버 스레드가 있는 프로세스를 fork하지 않도록 spawn 사용
+    workers = os.cpu_count() or 1
+    if workers < 2:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'))
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_symbol_index(version):
+    # 전체 상장 목록 파일이 바뀔 때(version = 수정 시각)만 다시 읽고, 나머지는 모든 세션이 공유
+    return symbols.SymbolIndex.load()
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def refresh_symbol_listing():
+    # 목록이 없거나 오래됐으면 백그라운드로 받음 (실패하면 한 시간 뒤에 다시 시도)
+    if not symbols.is_stale():
+        return None
+    return get_fetch_service().submit(('symbols',), symbols.refresh,
+                                      sources.create('symbols', symbols.NasdaqListingSource))
+
+
+get_metrics_server()
+get_watchlist_scheduler()
+refresh_symbol_listing()
+symbol_index = get_symbol_index(symbols.listing_version())
+
+# 잘못된 ticker는 가격/재무제표/뉴스를 요청하기 전에 로컬 목록에서 걸러냄 (회사명으로도 찾을 수 있음)
+if ticker is not None and not symbol_index.is_valid(ticker):
+    matches = symbol_index.search(ticker)
+    if not matches:
+        st.error(f"❌ Unknown ticker: {ticker}")
+        st.stop()
+    ticker = st.sidebar.selectbox('Did you mean', matches, format_func=lambda match: f'{match[0]} · {match[1]}')[0]
+
+# 관리자 패널: STOCK_ADMIN_PANEL=1 또는 ?admin=1 일 때만 표시
+if settings.admin_panel or st.query_params.get('admin') == '1':
+    with st.sidebar.expander('⏱️ Stage Timings'):
+        hit_rates = TRACER.hit_rates()
+        if hit_rates:
+            st.write('**Cache hit rate**')
+            st.dataframe(pd.Series(hit_rates, name='hit rate').mul(100).round(1), use_container_width=True)
+        st.dataframe(TRACER.snapshot(), hide_index=True, use_container_width=True,
+                     column_config={col: st.column_config.NumberColumn(format='%.1f')
+                                    for col in ['mean_ms', 'p50_ms', 'p95_ms', 'max_ms']})
+        st.json(get_fetch_service().stats())
+        st.write('**Data cache**')
+        st.json(CACHE.stats())
+        if get_watchlist_scheduler() is not None:
+            st.write('**Watchlist refresher**')
+            st.json(get_watchlist_scheduler().stats())
+
+
+@cached(CACHE, ttl=3600)
+def get_price_view(ticker, start_date, end_date, use_adjusted):
+    # (ticker, 구간, 조정 모드)마다 읽기 전용 프레임과 Arrow 테이블을 모든 세션/rerun이 공유
+    # (다른 캐시 항목과 같은 메모리 예산 안에서 관리)
+    mark_miss()
+    data = get_fetch_service().get(('prices', ticker, start_date, end_date, use_adjusted),
+                                   get_price_store().load, ticker, start_date, end_date, adjusted=use_adjusted)
+    if data.empty:
+        # 빈 결과는 캐시하지 않음 (일시적인 네트워크 오류일 수 있음)
+        raise LookupError(f"No data for {ticker}")
+    return PriceView(data).prepare(analytics.price_column_for(data))
+
+
 # 데이터 다운로드 및 처리 
 try:
     # auto_adjust=True를 사용하면 Close 컬럼이 이미 조정된 가격이 됩니다
@@ -29,38 +183,289 @@ try:
     
     if use_adjusted:
         # 조정된 가격 사용 (Close 컬럼이 조정된 가격)
-        data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=True, group_by='ticker')
         price_column = 'Close'
     else:
         # 원본 가격 및 조정 가격 둘 다 받기
-        data = yf.download(ticker, start=start_date, end=end_date, auto_adjust=False, group_by='ticker')
         price_column = st.sidebar.selectbox('Price Type', ['Close', 'Adj Close'], index=1)
-    
-    # MultiIndex 컬럼 문제 해결
-    if isinstance(data.columns, pd.MultiIndex):
-        data.columns = data.columns.droplevel(0)  # ticker 레벨 제거
-    
-    # 컬럼명 정리
-    data.columns = [col.strip() for col in data.columns]
+
+    # 로컬 캐시에 없는 구간만 yfinance에서 받아옴
+    price_view = None
+    data = pd.DataFrame()
+    if mode == 'Single Ticker':
+        with span('prices', ticker, cached=True):
+            price_view = get_price_view(ticker.upper(), start_date, end_date, use_adjusted)
+        data = price_view.data
     
     # st.sidebar.write(f"Available columns: {list(data.columns)}")
     
+except LookupError:
+    # 데이터가 없는 경우는 아래에서 안내
+    pass
 except Exception as e:
     st.error(f"Error downloading data: {e}")
-    data = pd.DataFrame()
 
 
+@cached(CACHE, ttl=3600)
+def load_portfolio_prices(tickers, start_date, end_date, use_adjusted, price_column):
+    # 캐시에 없는 ticker/구간만 한 번의 batched yf.download로 받아 가격 행렬로 합침
+    mark_miss()
+    frames = get_fetch_service().get(('prices', tickers, start_date, end_date, use_adjusted),
+                                     get_price_store().load_many, tickers, start_date, end_date, adjusted=use_adjusted)
+    return price_matrix(frames, price_column)
+
+
+@cached(CACHE, ttl=3600)
+def run_risk(tickers, start_date, end_date, use_adjusted, price_column, method, n_paths, horizon, seed=0):
+    # (ticker, 구간, 파라미터)별 결과 캐시 - 경로 배열 대신 화면에 쓰는 요약만 보관
+    mark_miss()
+    if len(tickers) == 1:
+        prices = get_price_view(tickers[0], start_date, end_date, use_adjusted).data[price_column]
+    else:
+        prices = equal_weight_curve(load_portfolio_prices(tickers, start_date, end_date, use_adjusted, price_column))
+    final, max_drawdown = risk.simulate(risk.log_returns(prices), method, n_paths, horizon, seed,
+                                        executor=get_process_pool())
+    return {
+        'var': risk.value_at_risk(final),
+        'drawdown': risk.drawdown_summary(max_drawdown),
+        'returns_hist': risk.histogram(final),
+        'drawdown_hist': risk.histogram(max_drawdown),
+    }
+
+
+def render_risk(tickers, key):
+    col1, col2, col3 = st.columns(3)
+    method = col1.selectbox('Method', risk.METHODS, key=f'{key}_method')
+    n_paths = col2.select_slider('Paths', [10_000, 50_000, 100_000, 250_000, 500_000], value=100_000,
+                                 key=f'{key}_paths')
+    horizon = col3.number_input('Horizon (trading days)', min_value=5, max_value=3 * risk.TRADING_DAYS,
+                                value=risk.TRADING_DAYS, step=5, key=f'{key}_horizon')
+
+    try:
+        with st.spinner(f'Simulating {n_paths:,} paths...'):
+            with span('risk.simulate', tickers[0] if len(tickers) == 1 else None, cached=True):
+                result = run_risk(tickers, start_date, end_date, use_adjusted, price_column,
+                                  method, n_paths, int(horizon))
+    except Exception as e:
+        st.error(f"❌ Error running simulation: {e}")
+        return
+
+    st.caption(f'{method}, {n_paths:,} paths, {int(horizon)} trading days (losses as % of starting value)')
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write('**Value at Risk**')
+        st.dataframe(result['var'] * 100, use_container_width=True,
+                     column_config={col: st.column_config.NumberColumn(format='%.2f%%') for col in ['VaR', 'CVaR']})
+    with col2:
+        st.write('**Max Drawdown Percentiles**')
+        st.dataframe(result['drawdown'] * 100, use_container_width=True,
+                     column_config={'Max Drawdown': st.column_config.NumberColumn(format='%.2f%%')})
+
+    st.write('**Horizon Return Distribution**')
+    st.bar_chart(result['returns_hist'].rename('share of paths'))
+    st.write('**Max Drawdown Distribution**')
+    st.bar_chart(result['drawdown_hist'].rename('share of paths'))
+
+
+@cached(CACHE, ttl=3600)
+def run_backtest_sweep(ticker, start_date, end_date, use_adjusted, price_column, strategy, cost, sentiment_column=None):
+    # (ticker, 구간, 전략, 비용)별 전체 파라미터 격자 결과
+    mark_miss()
+    close = get_price_view(ticker, start_date, end_date, use_adjusted).data[price_column]
+    scores = None
+    if strategy == 'Sentiment':
+        scores = get_sentiment_store().sentiment_vs_returns(ticker, start_date, end_date)[sentiment_column]
+    return backtest.sweep(close, strategy, cost=cost, scores=scores)
+
+
+@cached(CACHE, ttl=3600)
+def run_portfolio_sweep(tickers, start_date, end_date, use_adjusted, price_column, strategy, cost):
+    # ticker별 격자 sweep 후 Sharpe가 가장 좋은 조합 (ticker가 많으면 프로세스 풀에서 실행)
+    mark_miss()
+    prices = load_portfolio_prices(tickers, start_date, end_date, use_adjusted, price_column)
+    return backtest.sweep_many({symbol: prices[symbol] for symbol in prices.columns}, strategy, cost=cost,
+                               executor=get_process_pool())
+
+
+# 포트폴리오 모드 (여러 ticker를 한 번에 분석)
+if mode == 'Portfolio':
+    tickers = tuple(parse_tickers(tickers_text))
+    unknown = [symbol for symbol in tickers if not symbol_index.is_valid(symbol)]
+    if unknown:
+        st.warning(f"⚠️ Unknown tickers skipped: {', '.join(unknown)}")
+        tickers = tuple(symbol for symbol in tickers if symbol not in unknown)
+    if not tickers:
+        st.warning("⚠️ Enter at least one ticker")
+        st.stop()
+
+    try:
+        with st.spinner(f'Loading {len(tickers)} tickers...'):
+            with span('portfolio.prices', cached=True):
+                prices = load_portfolio_prices(tickers, start_date, end_date, use_adjusted, price_column)
+    except Exception as e:
+        st.error(f"Error downloading data: {e}")
+        st.stop()
+
+    if prices.empty:
+        st.error("No data found for the given tickers and date range.")
+        st.stop()
+
+    missing = [symbol for symbol in tickers if symbol not in prices.columns]
+    if missing:
+        st.warning(f"⚠️ No data for: {', '.join(missing)}")
+
+    st.header(f'Portfolio ({prices.shape[1]} tickers)')
+
+    # plotly는 import 비용이 커서 차트를 그릴 때 처음 불러옴
+    import plotly.express as px
+
+    with span('portfolio.stats'):
+        curve = equal_weight_curve(prices)
+        stats = portfolio_stats(prices)
+        corr = correlation_matrix(prices)
+    fig = px.line(curve.rename('Equal Weight').reset_index(), x='Date', y='Equal Weight',
+                  title='Equal-Weight Portfolio (Growth of 1)')
+    with span('plotly'):
+        st.plotly_chart(fig)
+
+    st.subheader('Statistics')
+    st.dataframe(
+        stats,
+        use_container_width=True,
+        column_config={
+            'Annual Return %': st.column_config.NumberColumn(format='%.2f'),
+            'Volatility %': st.column_config.NumberColumn(format='%.2f'),
+            'Sharpe': st.column_config.NumberColumn(format='%.2f'),
+            'Max Drawdown %': st.column_config.NumberColumn(format='%.2f'),
+        },
+    )
+
+    st.subheader('Drawdown (Equal Weight)')
+    st.area_chart(drawdowns(curve) * 100)
+
+    st.subheader('Correlation')
+    if len(corr) <= 50:
+        with span('plotly'):
+            st.plotly_chart(px.imshow(corr, zmin=-1, zmax=1, color_continuous_scale='RdBu_r'))
+    else:
+        # 종목이 많으면 히트맵 대신 종목별 평균 상관계수만 표시
+        mean_corr = (corr.sum() - 1) / (len(corr) - 1)
+        st.dataframe(mean_corr.rename('Mean Correlation').sort_values(ascending=False),
+                     use_container_width=True)
+
+    # 시뮬레이션은 무거우므로 켰을 때만 실행
+    if st.toggle('Monte Carlo Risk (Equal Weight)', key='portfolio_risk'):
+        st.subheader('Monte Carlo Risk (Equal Weight)')
+        render_risk(tuple(prices.columns), key='portfolio_risk')
+
+    if st.toggle('Strategy Sweep', key='portfolio_backtest'):
+        st.subheader('Strategy Sweep (best Sharpe per ticker)')
+        col1, col2 = st.columns(2)
+        strategy = col1.selectbox('Strategy', ['SMA Crossover', 'Momentum'], key='portfolio_bt_strategy')
+        cost_bps = col2.number_input('Cost (bps per trade)', min_value=0.0, max_value=100.0, value=5.0,
+                                     key='portfolio_bt_cost')
+        with st.spinner(f'Sweeping {prices.shape[1]} tickers...'):
+            with span('backtest.sweep', cached=True):
+                best = run_portfolio_sweep(tuple(prices.columns), start_date, end_date, use_adjusted, price_column,
+                                           strategy, cost_bps / 1e4)
+        st.dataframe(best, use_container_width=True,
+                     column_config={col: st.column_config.NumberColumn(format='%.2f')
+                                    for col in backtest.METRIC_COLUMNS})
+    st.stop()
+
+
+@st.cache_resource(max_entries=64)
+def get_intraday_feed(ticker, interval):
+    # (ticker, 분봉 간격)마다 하나의 링 버퍼를 모든 세션이 공유 (1m: 하루치, 5m: 5일치)
+    return IntradayFeed(ticker, interval, fetcher=sources.create('intraday', YFinanceIntradayFetcher),
+                        capacity=DEFAULT_CAPACITY)
+
+
+def live_intraday(feed):
+    # fragment 안에서만 실행되므로 타이머가 돌 때 페이지의 나머지는 다시 실행되지 않음
+    try:
+        with span('intraday.poll', feed.ticker):
+            feed.poll()
+    except Exception as e:
+        st.error(f"Error polling intraday data: {e}")
+
+    bars, stats = feed.snapshot()
+    if bars.empty:
+        st.info("No intraday bars yet (market closed or no data).")
+        return
+
+    # 이 세션이 마지막으로 본 봉 이후에 새로 들어온 봉 수
+    seen = st.session_state.setdefault('intraday_seen', {})
+    key = f'{feed.ticker}|{feed.interval}'
+    new_bars = int((bars.index > seen[key]).sum()) if key in seen else len(bars)
+    seen[key] = bars.index[-1]
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Last', f"{stats['last']:.2f}", f"{stats['last'] / bars['Close'].iloc[0] * 100 - 100:.2f}%")
+    # VWAP/고가/저가/σ는 현재 거래일 봉만 (5m 차트는 며칠치를 보여줄 수 있음)
+    col2.metric('VWAP (session)', f"{stats['vwap']:.2f}")
+    col3.metric('High / Low (session)', f"{stats['high']:.2f} / {stats['low']:.2f}")
+    col4.metric(f'σ ({feed.stats.window} bars)', f"{stats['return_std'] * 100:.3f}%")
+
+    # 링 버퍼 크기로 보내는 점 개수가 고정됨
+    st.line_chart(bars['Close'])
+    st.caption(f"Last bar {bars.index[-1]:%Y-%m-%d %H:%M} · +{new_bars} new · {len(bars)} bars buffered")
+
+
+# 분봉 모드 (새 봉만 받아 링 버퍼에 붙이고 차트 fragment만 주기적으로 다시 그림)
+if mode == 'Intraday':
+    interval = st.sidebar.radio('Interval', ['1m', '5m'], horizontal=True)
+    refresh_seconds = st.sidebar.slider('Refresh (seconds)', 15, 300, 60, step=15)
+    st.header(f'{ticker.upper()} Intraday ({interval})')
+    st.fragment(live_intraday, run_every=refresh_seconds)(get_intraday_feed(ticker.upper(), interval))
+    st.stop()
+
+
+def get_indicator_engine(ticker, use_adjusted, price_column):
+    # 세션마다 엔진을 보관해 두고, 가격 캐시에 새 봉이 붙으면 그 봉만 계산
+    engines = st.session_state.setdefault('indicator_engines', {})
+    key = (ticker.upper(), use_adjusted, price_column)
+    if key not in engines:
+        engines[key] = IndicatorEngine(price_col=price_column)
+    return engines[key]
+
+
+selected_indicators = st.sidebar.multiselect('Indicators', INDICATOR_OPTIONS)
+full_resolution = st.sidebar.checkbox('Full Resolution Chart', value=False)
+downsample_method = st.sidebar.selectbox('Downsampling', DOWNSAMPLE_METHODS, disabled=full_resolution,
+                                         format_func={'lttb': 'LTTB', 'minmax': 'Min/Max'}.get)
+
 # 데이터가 비어있지 않은지 확인
 if not data.empty:
-    # 인덱스를 리셋하여 Date를 컬럼으로 만들기
-    data_reset = data.reset_index()
-    
-    fig = px.line(data_reset, x='Date', y=price_column, title=f'{ticker} Stock Price ({price_column})')
-    st.plotly_chart(fig)
+    # 차트 표시 구간 (구간을 좁히면 그 구간을 더 촘촘하게 그림)
+    first_day, last_day = data.index[0].date(), data.index[-1].date()
+    if first_day < last_day:
+        chart_start, chart_end = st.slider('Chart Range', min_value=first_day, max_value=last_day,
+                                           value=(first_day, last_day), format='YYYY-MM-DD')
+    else:
+        chart_start, chart_end = first_day, last_day
+    in_range = (data.index >= pd.Timestamp(chart_start)) & (data.index < pd.Timestamp(chart_end) + pd.Timedelta(days=1))
+
+    import plotly.express as px
+
+    with span('chart.build', ticker):
+        # 화면 폭 이상의 점은 보내지 않도록 축소 (LTTB 또는 구간별 최저/최고, 둘 다 고점/저점 모양은 유지)
+        chart_data = downsample_frame(data.loc[in_range], price_column,
+                                      None if full_resolution else DEFAULT_MAX_POINTS, downsample_method)
+
+        # 인덱스를 리셋하여 Date를 컬럼으로 만들기
+        fig = px.line(chart_data.reset_index(), x='Date', y=price_column, title=f'{ticker} Stock Price ({price_column})')
+
+        # 선택한 기술적 지표를 가격 차트 위에 겹쳐 그림
+        if selected_indicators:
+            indicator_frame = get_indicator_engine(ticker, use_adjusted, price_column).sync(data)
+            add_overlays(fig, indicator_frame.loc[chart_data.index], selected_indicators)
+
+    with span('plotly', ticker):
+        st.plotly_chart(fig)
     
     # 추가 정보 표시
     st.subheader('Recent Data')
-    st.dataframe(data.tail())
+    st.dataframe(price_view.arrow('recent'))
     
     st.subheader('Statistics')
     st.write(data[price_column].describe())
@@ -68,33 +473,81 @@ else:
     st.error("No data found for the given ticker and date range.")
 
 
-pricing_data, fundamental_data, news = st.tabs(["Pricing Data", "Fundamental Data", "Top 10 News"])
+@cached(CACHE, ttl=3600)
+def get_financial_data(ticker, api_key) :
+    mark_miss()
+    try:
+        balance_sheet, income_statement, cash_flow = get_fetch_service().get(
+            ('fundamentals', ticker.upper()), get_fundamentals_client(api_key).get_statements, ticker)
+        return balance_sheet, income_statement, cash_flow, None
+    except Exception as e:
+        return None, None, None, str(e)
 
-with pricing_data :
+
+@cached(CACHE, ttl=3600)
+def get_formatted_statements(ticker, api_key):
+    # 원본 조회와 숫자 변환/단위 조정 결과를 같이 캐시
+    mark_miss()
+    balance_sheet, income_statement, cash_flow, error = get_financial_data(ticker, api_key)
+    if error:
+        return None, error
+    with span('statements.format', ticker):
+        return analytics.format_statements(balance_sheet, income_statement, cash_flow), None
+
+
+def render_statement(title, table, name):
+    # 숫자 dtype을 유지한 채 Streamlit 컬럼 포맷으로만 표시 (정렬 가능)
+    if table is None or table.empty:
+        return
+    st.subheader(title)
+    st.dataframe(
+        table,
+        use_container_width=True,
+        column_config={col: st.column_config.NumberColumn(col, format='%.2f') for col in table.columns},
+    )
+    # 재무제표는 작으므로 내용 해시를 fingerprint로 (7일 TTL/watchlist로 다시 받으면 바뀜)
+    download_widget(name.replace('_', ' '), table, file_stem=f'{ticker.upper()}_{name}',
+                    key=f'export_{name}', fingerprint=frame_fingerprint(table))
+
+
+@st.fragment
+def news_debug(top_news):
+    # 디버그 정보 (개발 중에만 표시) - 토글은 이 fragment만 다시 실행
+    if st.toggle("Show debug info", key="news_debug"):
+        st.dataframe(
+            top_news[['title', 'sentiment_title', 'sentiment_summary', 'title_label', 'summary_label', 'key']],
+            use_container_width=True,
+        )
+
+
+# st.tabs는 모든 탭을 매번 실행하므로, 선택된 섹션만 실행하도록 session_state 기반 선택기를 사용
+SECTIONS = ["Pricing Data", "Fundamental Data", "Risk", "Backtest", "Top 10 News"]
+section = st.radio('Section', SECTIONS, key='section', horizontal=True, label_visibility='collapsed')
+
+if section == 'Pricing Data':
     st.header('Pricing Movements')
-    data2 = data.copy()
 
     # 사용할 가격 컬럼 결정 
-    if 'Adj Close' in data.columns:
-        price_col = 'Adj Close'
+    price_col = analytics.price_column_for(data)
+    if price_col == 'Adj Close':
         st.info("📊 Using Adjusted Close prices for calculations")
-    elif 'Close' in data.columns:
-        price_col = 'Close'
+    elif price_col == 'Close':
         st.info("📊 Using Close prices for calculations")
     else:
         st.error("❌ No suitable price column found!")
         st.stop()
 
-    data2['% Change'] = data[price_col] / data[price_col].shift(1) - 1
-    data2.dropna(inplace=True)
-    st.write(data2)
-    annual_return = data2['% Change'].mean() * 252 * 100
-    st.write('Annual Return is ', annual_return, '%')
-    stdev = np.std(data2['% Change'])*np.sqrt(252)
-    st.write('Standard Deviation is ', stdev*100, '%')
-    st.write('Risk Adj. Return is ', annual_return/(stdev*100))
+    # '% Change' 컬럼과 Arrow 테이블은 PriceView에 한 번만 만들어 두고 재사용
+    data2 = price_view.changes(price_col)
+    st.dataframe(price_view.arrow('changes', price_col))
+    download_widget('price history', data2, file_stem=f'{ticker.upper()}_{start_date}_{end_date}',
+                    key='export_prices', fingerprint=f'prices|{ticker.upper()}|{start_date}|{end_date}|{use_adjusted}|{price_col}')
+    stats = analytics.pricing_stats(data2)
+    st.write('Annual Return is ', stats['annual_return'], '%')
+    st.write('Standard Deviation is ', stats['stdev'], '%')
+    st.write('Risk Adj. Return is ', stats['risk_adj_return'])
 
-with fundamental_data :
+elif section == 'Fundamental Data':
     api_key = ALPHAVANTAGE_API_KEY
 
     if not api_key:
@@ -118,27 +571,14 @@ with fundamental_data :
 
     if api_key:
         try:
-            from alpha_vantage.fundamentaldata import FundamentalData
-                        # API 키 상태 표시 (마스킹)
+            # API 키 상태 표시 (마스킹)
             masked_key = api_key[:8] + "*" * (len(api_key) - 12) + api_key[-4:] if len(api_key) > 12 else "*" * len(api_key)
             st.success(f"🔑 API Key loaded: {masked_key}")
 
-            fd = FundamentalData(api_key, output_format='pandas')
-
-            @st.cache_data(ttl=3600) # 1시간 캐시
-            def get_financial_data(ticker, api_key) :
-                fd = FundamentalData(api_key, output_format='pandas')
-                try:
-                    balance_sheet = fd.get_balance_sheet_annual(ticker)[0]
-                    income_statement = fd.get_income_statement_annual(ticker)[0]
-                    cash_flow = fd.get_cash_flow_annual(ticker)[0]
-                    return balance_sheet, income_statement, cash_flow, None
-                except Exception as e:
-                    return None, None, None, str(e)
-                
             # 데이터 로드
             with st.spinner('Loading financial data...'):
-                balance_sheet, income_statement, cash_flow, error = get_financial_data(ticker, api_key)  
+                with span('fundamentals', ticker, cached=True):
+                    statements, error = get_formatted_statements(ticker, api_key)
 
             if error:
                 st.error(f"❌ Error: {error}")
@@ -148,56 +588,11 @@ with fundamental_data :
                 st.write("- Network connection problem")
                 st.write("- Invalid API key")
             else:
-                # Balance Sheet
-                if balance_sheet is not None and not balance_sheet.empty:
-                    st.subheader('📊 Balance Sheet (Annual)')
-                    try:
-                        bs = balance_sheet.T[2:]
-                        bs.columns = list(balance_sheet.T.iloc[0])
-                        
-                        # 숫자 형식 개선
-                        numeric_columns = bs.select_dtypes(include=['number']).columns
-                        for col in numeric_columns:
-                            bs[col] = bs[col].apply(lambda x: f"${x/1e9:.2f}B" if abs(x) >= 1e9 else f"${x/1e6:.2f}M" if abs(x) >= 1e6 else f"${x:,.0f}")
-                        
-                        st.dataframe(bs, use_container_width=True)
-                    except Exception as e:
-                        st.error(f"Error processing balance sheet: {e}")
-
-                # Income Statement
-                if income_statement is not None and not income_statement.empty:
-                    st.subheader('💰 Income Statement (Annual)')
-                    try:
-                        is1 = income_statement.T[2:]
-                        is1.columns = list(income_statement.T.iloc[0])
-                        
-                        # 숫자 형식 개선
-                        numeric_columns = is1.select_dtypes(include=['number']).columns
-                        for col in numeric_columns:
-                            is1[col] = is1[col].apply(lambda x: f"${x/1e9:.2f}B" if abs(x) >= 1e9 else f"${x/1e6:.2f}M" if abs(x) >= 1e6 else f"${x:,.0f}")
-                        
-                        st.dataframe(is1, use_container_width=True)
-                    except Exception as e:
-                        st.error(f"Error processing income statement: {e}")
-                
-                # Cash Flow Statement
-                if cash_flow is not None and not cash_flow.empty:
-                    st.subheader('💸 Cash Flow Statement (Annual)')
-                    try:
-                        cf = cash_flow.T[2:]
-                        cf.columns = list(cash_flow.T.iloc[0])
-                        
-                        # 숫자 형식 개선
-                        numeric_columns = cf.select_dtypes(include=['number']).columns
-                        for col in numeric_columns:
-                            cf[col] = cf[col].apply(lambda x: f"${x/1e9:.2f}B" if abs(x) >= 1e9 else f"${x/1e6:.2f}M" if abs(x) >= 1e6 else f"${x:,.0f}")
-                        
-                        st.dataframe(cf, use_container_width=True)
-                    except Exception as e:
-                        st.error(f"Error processing cash flow: {e}")
+                for name, title in analytics.STATEMENT_TITLES.items():
+                    render_statement(title, statements[name], name)
                 
                 st.success("✅ Financial data loaded successfully!")
-                st.info("🔄 Data is cached for 1 hour to save API calls")
+                st.info("🔄 Statements are cached on disk for 7 days to save API calls")
                 
         except ImportError:
             st.error("❌ Required packages not installed!")
@@ -206,154 +601,116 @@ with fundamental_data :
         except Exception as e:
             st.error(f"❌ Unexpected error: {str(e)}")
 
-with news:
+elif section == 'Risk':
+    st.header(f'🎲 Monte Carlo Risk for {ticker.upper()}')
+    if price_view is None:
+        st.warning("⚠️ No price history to simulate")
+    else:
+        render_risk((ticker.upper(),), key='ticker_risk')
+
+elif section == 'Backtest':
+    st.header(f'🧪 Backtest for {ticker.upper()}')
+    if price_view is None:
+        st.warning("⚠️ No price history to backtest")
+        st.stop()
+
+    col1, col2 = st.columns(2)
+    strategy = col1.selectbox('Strategy', backtest.STRATEGIES, key='bt_strategy')
+    cost_bps = col2.number_input('Cost (bps per trade)', min_value=0.0, max_value=100.0, value=5.0, key='bt_cost')
+    cost = cost_bps / 1e4
+
+    defaults = backtest.DEFAULTS[strategy]
+    scores = None
+    sentiment_column = None
+    col1, col2 = st.columns(2)
+    if strategy == 'SMA Crossover':
+        params = {
+            'fast': col1.number_input('Fast SMA', min_value=2, max_value=200, value=defaults['fast'], key='bt_fast'),
+            'slow': col2.number_input('Slow SMA', min_value=3, max_value=400, value=defaults['slow'], key='bt_slow'),
+        }
+    elif strategy == 'Momentum':
+        params = {
+            'lookback': col1.number_input('Lookback (days)', min_value=1, max_value=500, value=defaults['lookback'],
+                                          key='bt_lookback'),
+            'threshold': col2.number_input('Threshold %', min_value=-50.0, max_value=50.0,
+                                           value=defaults['threshold'] * 100, key='bt_threshold') / 100,
+        }
+    else:
+        sentiment_column = backtest.SENTIMENT_COLUMNS[col1.radio('Score', list(backtest.SENTIMENT_COLUMNS),
+                                                                 horizontal=True, key='bt_score')]
+        params = {'threshold': col2.slider('Threshold', -1.0, 1.0, defaults['threshold'], 0.05, key='bt_sentiment')}
+        # 감정 점수는 뉴스 섹션을 열 때마다 쌓이므로 저장된 날만 사용 (없는 날은 보유하지 않음)
+        scores = get_sentiment_store().sentiment_vs_returns(ticker, start_date, end_date)[sentiment_column]
+        if scores.empty:
+            st.info("💡 No stored sentiment for this ticker yet - open Top 10 News to start collecting it")
+            st.stop()
+
+    with span('backtest.run', ticker):
+        curves, metrics = backtest.run(data[price_column], strategy, params, cost, scores)
+    st.line_chart(curves)
+    st.dataframe(metrics.to_frame().T, hide_index=True, use_container_width=True,
+                 column_config={col: st.column_config.NumberColumn(format='%.2f') for col in backtest.METRIC_COLUMNS})
+
+    if st.toggle('Parameter Sweep', key='bt_sweep'):
+        metric = st.selectbox('Metric', ['Sharpe', 'Annual Return %', 'Total Return %', 'Max Drawdown %'],
+                              key='bt_metric')
+        with st.spinner('Running parameter sweep...'):
+            with span('backtest.sweep', ticker, cached=True):
+                grid = run_backtest_sweep(ticker.upper(), start_date, end_date, use_adjusted, price_column,
+                                          strategy, cost, sentiment_column)
+        names = backtest.PARAMS[strategy]
+        if len(names) == 2:
+            import plotly.express as px
+
+            heatmap = grid.pivot(index=names[0], columns=names[1], values=metric)
+            with span('plotly', ticker):
+                st.plotly_chart(px.imshow(heatmap, aspect='auto', color_continuous_scale='RdYlGn',
+                                          labels={'color': metric}))
+        else:
+            st.line_chart(grid.set_index(names[0])[metric])
+        st.dataframe(grid.nlargest(10, metric), hide_index=True, use_container_width=True,
+                     column_config={col: st.column_config.NumberColumn(format='%.2f') for col in backtest.METRIC_COLUMNS})
+
+else:
     st.header(f'📰 Latest News for {ticker}')
     
     try:
-        from stocknews import StockNews
-        
         with st.spinner('Loading latest news...'):
-            sn = StockNews(ticker, save_news=False)
-            df_news = sn.read_rss()
+            with span('news', ticker, cached=True):
+                df_news = get_fetch_service().get(('news', ticker.upper()), get_news_cache().get, ticker)
         
         if df_news is not None and not df_news.empty:
             # 뉴스 개수 확인 (최대 10개)
             news_count = min(10, len(df_news))
+            top_news = df_news.head(news_count)
             st.success(f"✅ Found {news_count} news articles")
             
-            # 감정 분석 색상 함수
-            def get_sentiment_color(sentiment):
-                # numpy 타입을 문자열로 안전하게 변환
-                sentiment_str = str(sentiment).lower() if sentiment is not None else 'neutral'
-                
-                if 'positive' in sentiment_str or sentiment_str == '1' or sentiment_str == '1.0':
-                    return '🟢', '#28a745'
-                elif 'negative' in sentiment_str or sentiment_str == '-1' or sentiment_str == '-1.0':
-                    return '🔴', '#dc3545'
-                else:
-                    return '🟡', '#ffc107'
+            # 뉴스 카드 전체를 HTML 블록 하나로 전송
+            with span('news.render', ticker):
+                st.markdown(render_cards_html(top_news), unsafe_allow_html=True)
+            news_debug(top_news)
             
-            def safe_capitalize(value):
-                """안전하게 문자열로 변환하고 첫 글자를 대문자로"""
-                if value is None:
-                    return 'N/A'
-                
-                str_value = str(value).lower()
-                
-                # 숫자 값을 감정으로 변환
-                if str_value == '1' or str_value == '1.0':
-                    return 'Positive'
-                elif str_value == '-1' or str_value == '-1.0':
-                    return 'Negative'
-                elif str_value == '0' or str_value == '0.0':
-                    return 'Neutral'
-                else:
-                    return str_value.capitalize()
+            # 전체 감정 분석 요약
+            st.subheader("📊 Overall Sentiment Analysis")
             
-            # 뉴스 카드 스타일
-            for i in range(news_count):
-                try:
-                    # 뉴스 데이터 추출 (안전하게 처리)
-                    published = str(df_news['published'].iloc[i]) if 'published' in df_news.columns else 'N/A'
-                    title = str(df_news['title'].iloc[i]) if 'title' in df_news.columns else 'No Title'
-                    summary = str(df_news['summary'].iloc[i]) if 'summary' in df_news.columns else 'No Summary'
-                    title_sentiment = df_news['sentiment_title'].iloc[i] if 'sentiment_title' in df_news.columns else 'neutral'
-                    summary_sentiment = df_news['sentiment_summary'].iloc[i] if 'sentiment_summary' in df_news.columns else 'neutral'
-                    
-                    # 감정 분석 아이콘과 색상 (안전하게 처리)
-                    title_icon, title_color = get_sentiment_color(title_sentiment)
-                    summary_icon, summary_color = get_sentiment_color(summary_sentiment)
-                    
-                    # 감정 텍스트 안전하게 변환
-                    title_sentiment_text = safe_capitalize(title_sentiment)
-                    summary_sentiment_text = safe_capitalize(summary_sentiment)
-                    
-                    # 뉴스 카드 생성
-                    with st.container():
-                        # 카드 헤더
-                        st.markdown(f"""
-                        <div style="
-                            background-color: #f8f9fa;
-                            border-left: 4px solid #007bff;
-                            padding: 1rem;
-                            margin: 1rem 0;
-                            border-radius: 0.5rem;
-                            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-                        ">
-                        <h4 style="margin: 0 0 0.5rem 0; color: #333;">📰 News #{i+1}</h4>
-                        <p style="margin: 0; color: #666; font-size: 0.9rem;">📅 {published}</p>
-                        </div>
-                        """, unsafe_allow_html=True)
-                        
-                        # 제목과 요약을 컬럼으로 배치
-                        col1, col2 = st.columns([3, 1])
-                        
-                        with col1:
-                            st.markdown(f"**📄 Title:** {title}")
-                            st.markdown(f"**📝 Summary:** {summary}")
-                        
-                        with col2:
-                            st.markdown("**🎭 Sentiment Analysis**")
-                            st.markdown(f"{title_icon} **Title:** {title_sentiment_text}")
-                            st.markdown(f"{summary_icon} **Summary:** {summary_sentiment_text}")
-                            
-                            # 디버그 정보 (개발 중에만 표시)
-                            if st.checkbox(f"Show debug info #{i+1}", key=f"debug_{i}"):
-                                st.write(f"Raw title sentiment: {title_sentiment} (type: {type(title_sentiment)})")
-                                st.write(f"Raw summary sentiment: {summary_sentiment} (type: {type(summary_sentiment)})")
-                        
-                        # 구분선
-                        st.divider()
-                        
-                except Exception as e:
-                    st.error(f"Error displaying news #{i+1}: {str(e)}")
-                    continue
-            
-            # 전체 감정 분석 요약 (안전하게 처리)
-            if news_count > 0:
-                st.subheader("📊 Overall Sentiment Analysis")
-                
-                try:
-                    # 감정 분석 통계 (numpy 타입 안전하게 처리)
-                    if 'sentiment_title' in df_news.columns:
-                        title_sentiments = df_news['sentiment_title'].head(news_count).apply(safe_capitalize).value_counts()
-                    else:
-                        title_sentiments = {}
-                        
-                    if 'sentiment_summary' in df_news.columns:
-                        summary_sentiments = df_news['sentiment_summary'].head(news_count).apply(safe_capitalize).value_counts()
-                    else:
-                        summary_sentiments = {}
-                    
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write("**Title Sentiments:**")
-                        if title_sentiments.empty:
-                            st.write("No title sentiment data available")
-                        else:
-                            for sentiment, count in title_sentiments.items():
-                                icon, _ = get_sentiment_color(sentiment)
-                                percentage = (count / news_count) * 100
-                                st.write(f"{icon} {sentiment}: {count} ({percentage:.1f}%)")
-                    
-                    with col2:
-                        st.write("**Summary Sentiments:**")
-                        if summary_sentiments.empty:
-                            st.write("No summary sentiment data available")
-                        else:
-                            for sentiment, count in summary_sentiments.items():
-                                icon, _ = get_sentiment_color(sentiment)
-                                percentage = (count / news_count) * 100
-                                st.write(f"{icon} {sentiment}: {count} ({percentage:.1f}%)")
-                                
-                except Exception as e:
-                    st.error(f"Error in sentiment analysis summary: {str(e)}")
-                    st.write("Raw sentiment data types:")
-                    if 'sentiment_title' in df_news.columns:
-                        st.write(f"Title sentiments type: {type(df_news['sentiment_title'].iloc[0])}")
-                    if 'sentiment_summary' in df_news.columns:
-                        st.write(f"Summary sentiments type: {type(df_news['sentiment_summary'].iloc[0])}")
+            col1, col2 = st.columns(2)
+            for col, label_column, caption in ((col1, 'title_label', 'Title'), (col2, 'summary_label', 'Summary')):
+                with col:
+                    st.write(f"**{caption} Sentiments:**")
+                    counts = analytics.sentiment_counts(top_news, label_column)
+                    for sentiment, count in counts[counts > 0].items():
+                        percentage = (count / news_count) * 100
+                        st.write(f"{SENTIMENT_ICONS[sentiment]} {sentiment}: {count} ({percentage:.1f}%)")
+
+            # 쌓아 둔 감정 점수와 해당 거래일 수익률 비교
+            if price_view is not None:
+                get_sentiment_store().fill_prices(ticker, price_view.data, price_column)
+            history = get_sentiment_store().sentiment_vs_returns(ticker, start_date, end_date)
+            if not history.empty:
+                # change는 check_day의 전일 종가 대비 수익률 (장 마감 후 기사는 다음 거래일),
+                # next_change는 그다음 거래일 수익률 - 감정이 하루 늦게 반영되는지 같이 봄
+                st.subheader("📈 Sentiment vs Check-Day / Next-Day Return")
+                st.scatter_chart(history, x='sentiment_summary_avg', y=['change', 'next_change'])
         
         else:
             st.warning(f"⚠️ No news articles found for {ticker}")
@@ -363,7 +720,7 @@ with news:
             st.write("- RSS feed is temporarily unavailable")
             
     except ImportError:
-        st.error("❌ stocknews package not installed!")
+        st.error("❌ News packages (feedparser, nltk) not installed!")
         st.code("pip install stocknews", language="bash")
         st.info("💡 Alternative: You can search for news manually on financial websites")
         
@@ -372,4 +729,10 @@ with news:
         st.info("💡 Possible issues:")
         st.write("- Network connection problem")
         st.write("- RSS feed temporarily unavailable") 
-        st.write("- Invalid ticker symbol")
\ No newline at end of file
+        st.write("- Invalid ticker symbol")
+
+
+# 보이는 섹션을 다 그린 뒤, 다른 섹션에 필요한 데이터를 백그라운드로 미리 받아 둠
+# (재무제표는 하루 호출 한도가 작아서 사용자가 직접 열 때만 호출)
+if section != 'Top 10 News':
+    get_fetch_service().submit(('news', ticker.upper()), get_news_cache().get, ticker)
@@ -0,0 +1,88 @@
+import numpy as np
+
+# 차트 한 장에 보내는 기본 최대 점 개수 (일반적인 화면 폭 기준)
+DEFAULT_MAX_POINTS = 2000
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, threshold):
+    """Largest-Triangle-Three-Buckets로 남길 점의 위치(정수 인덱스)를 반환
+
+    첫 점과 마지막 점은 항상 남기고, 나머지는 threshold-2개 구간마다 앞에서 고른 점과
+    다음 구간 평균점이 이루는 삼각형 넓이가 가장 큰 점 하나를 고른다 (급등/급락 모양 유지).
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+
+    # 구간 경계 (bounds[k] ~ bounds[k+1]가 k번째 구간)
+    every = (n - 2) / (threshold - 2)
+    bounds = np.floor(np.arange(threshold - 1) * every).astype(int) + 1
+    bounds[-1] = n - 1
+
+    # 각 구간의 평균점을 한 번에 계산하고, 마지막 구간 다음은 마지막 점을 사용
+    sizes = np.diff(bounds)
+    avg_x = np.append(np.add.reduceat(x[:-1], bounds[:-1]) / sizes, x[-1])
+    avg_y = np.append(np.add.reduceat(y[:-1], bounds[:-1]) / sizes, y[-1])
+
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+
+    a = 0
+    for k in range(threshold - 2):
+        start, end = bounds[k], bounds[k + 1]
+        cx, cy = avg_x[k + 1], avg_y[k + 1]
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        selected[k + 1] = a
+
+    return selected
+
+
+def minmax_indices(y, buckets):
+    """구간마다 최솟값/최댓값 위치를 남기는 단순 축소 (최대 2 * buckets개)"""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if 2 * buckets >= n:
+        return np.arange(n)
+
+    bounds = np.linspace(0, n, buckets + 1).astype(int)
+    sizes = np.diff(bounds)
+    bucket = np.repeat(np.arange(buckets), sizes)
+    picks = []
+    for extreme in (np.minimum, np.maximum):
+        # 구간마다 극값과 같은 값이 처음 나오는 위치
+        hit = y == np.repeat(extreme.reduceat(y, bounds[:-1]), sizes)
+        positions = np.flatnonzero(hit)
+        _, first = np.unique(bucket[hit], return_index=True)
+        picks.append(positions[first])
+    return np.unique(np.concatenate(picks))
+
+
+# 차트 축소 방식: lttb는 모양 유지가 좋고, minmax는 구간 고점/저점을 빠짐없이 남기며 더 빠름
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def downsample_frame(frame, column, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """frame을 column 기준으로 max_points개 이하로 줄임 (index는 날짜, method는 DOWNSAMPLE_METHODS 중 하나)"""
+    frame = frame.dropna(subset=[column])
+    if max_points is None or len(frame) <= max_points:
+        return frame
+    if method == 'lttb':
+        indices = lttb_indices(frame.index.to_numpy(), frame[column].to_numpy(), max_points)
+    elif method == 'minmax':
+        indices = minmax_indices(frame[column].to_numpy(), max_points // 2)
+    else:
+        raise ValueError(f'unknown downsample method: {method!r}')
+    return frame.iloc[indices]
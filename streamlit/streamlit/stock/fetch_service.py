@@ -0,0 +1,52 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from singleflight import SingleFlight
+
+
+class FetchService:
+    """프로세스 전체에서 공유하는 upstream 호출 서비스
+
+    Streamlit은 세션마다 별도 스레드에서 스크립트를 실행하므로, 여러 사용자가 같은 ticker를 열면
+    같은 요청이 동시에 나간다. 모든 upstream 호출을 크기가 정해진 스레드 풀에서 실행하고,
+    같은 key의 요청이 실행 중이면 새로 호출하지 않고 같은 결과를 나눠 받는다.
+    결과 객체는 여러 세션이 공유하므로 호출하는 쪽에서 수정하지 않는다.
+    """
+
+    def __init__(self, max_workers=8):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._executed = 0
+
+    def _run(self, fn, *args, **kwargs):
+        with self._lock:
+            self._executed += 1
+        return fn(*args, **kwargs)
+
+    def submit(self, key, fn, *args, **kwargs):
+        """백그라운드로 실행하고 Future를 반환 (prefetch 용도)
+
+        호출한 쪽의 contextvars(진행 중인 tracing span 등)를 그대로 가지고 실행한다.
+        """
+        with self._lock:
+            self._requests += 1
+        context = contextvars.copy_context()
+        return self._flight.submit(key, self._executor, context.run, self._run, fn, *args, **kwargs)
+
+    def get(self, key, fn, *args, timeout=None, **kwargs):
+        """실행이 끝날 때까지 기다렸다가 결과를 반환 (예외도 그대로 전달)"""
+        return self.submit(key, fn, *args, **kwargs).result(timeout=timeout)
+
+    def stats(self):
+        with self._lock:
+            requests, executed = self._requests, self._executed
+        return {
+            'requests': requests,
+            'executed': executed,
+            'in_flight': self._flight.in_flight(),
+            'max_workers': self.max_workers,
+        }
@@ -0,0 +1,179 @@
+import hashlib
+from email.utils import format_datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import sources
+
+# 벤치마크/오프라인 실행용 upstream 대체 source
+# 같은 ticker와 구간에는 항상 같은 값을 돌려주므로 실행 간 결과를 비교할 수 있다.
+
+STATEMENT_ITEMS = {
+    'balance_sheet': ['totalAssets', 'totalCurrentAssets', 'cashAndCashEquivalentsAtCarryingValue', 'inventory',
+                      'totalLiabilities', 'totalCurrentLiabilities', 'longTermDebt', 'totalShareholderEquity'],
+    'income_statement': ['totalRevenue', 'costOfRevenue', 'grossProfit', 'operatingExpenses',
+                         'operatingIncome', 'incomeTaxExpense', 'ebitda', 'netIncome'],
+    'cash_flow': ['operatingCashflow', 'capitalExpenditures', 'changeInInventory', 'cashflowFromInvestment',
+                  'cashflowFromFinancing', 'dividendPayout', 'paymentsForRepurchaseOfCommonStock', 'netIncome'],
+}
+
+POSITIVE_WORDS = ('beats', 'surges', 'record', 'upgrade', 'growth')
+NEGATIVE_WORDS = ('misses', 'falls', 'lawsuit', 'downgrade', 'recall')
+
+
+def _seed(*parts):
+    raw = '|'.join(str(part) for part in parts).encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(raw, digest_size=8).digest(), 'little')
+
+
+class FixturePriceFetcher:
+    """YFinanceFetcher 대신 쓰는 가격 source
+
+    recorded_dir에 '<TICKER>.parquet'(normalize_ohlcv 형식)가 있으면 그 구간을 잘라 쓰고,
+    없으면 ticker별로 고정된 seed의 랜덤 워크로 영업일 OHLCV를 만든다.
+    """
+
+    def __init__(self, recorded_dir=None, origin='2000-01-03'):
+        self.recorded_dir = Path(recorded_dir) if recorded_dir is not None else None
+        self.origin = pd.Timestamp(origin)
+        self.calls = 0
+
+    def _synthetic(self, ticker, start, end):
+        # origin부터 계속 이어지는 경로를 만들고 잘라내야 구간이 달라도 값이 일치한다
+        index = pd.bdate_range(self.origin, pd.Timestamp(end) - pd.Timedelta(days=1), name='Date')
+        rng = np.random.default_rng(_seed('prices', ticker.upper()))
+        returns = rng.normal(0.0003, 0.018, len(index))
+        close = 50 * np.exp(np.cumsum(returns))
+        spread = np.abs(rng.normal(0, 0.01, len(index)))
+        frame = pd.DataFrame({
+            'Open': close * (1 + rng.normal(0, 0.004, len(index))),
+            'High': close * (1 + spread),
+            'Low': close * (1 - spread),
+            'Close': close,
+            'Volume': rng.integers(1_000_000, 50_000_000, len(index)).astype(float),
+        }, index=index)
+        return frame.loc[pd.Timestamp(start):]
+
+    def fetch(self, ticker, start, end, adjusted):
+        self.calls += 1
+        path = self.recorded_dir / f"{ticker.upper()}.parquet" if self.recorded_dir is not None else None
+        if path is not None and path.exists():
+            frame = pd.read_parquet(path)
+            return frame.loc[(frame.index >= pd.Timestamp(start)) & (frame.index < pd.Timestamp(end))]
+        return self._synthetic(ticker, start, end)
+
+    def fetch_many(self, tickers, start, end, adjusted):
+        frames = {ticker: self.fetch(ticker, start, end, adjusted) for ticker in tickers}
+        return {ticker: frame for ticker, frame in frames.items() if not frame.empty}
+
+
+class FixtureIntradayFetcher:
+    """YFinanceIntradayFetcher 대신 쓰는 분봉 source (오늘 0시부터 현재 시각까지, 시각별로 고정된 값)"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def fetch_since(self, ticker, interval, since=None):
+        self.calls += 1
+        step = pd.Timedelta(interval.replace('m', 'min'))
+        now = pd.Timestamp.now().floor(step)
+        index = pd.date_range(now.normalize(), now, freq=step, name='Date')
+        rng = np.random.default_rng(_seed('intraday', ticker.upper(), interval, now.date()))
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+        frame = pd.DataFrame({
+            'Open': np.r_[close[0], close[:-1]],
+            'High': close * 1.0005,
+            'Low': close * 0.9995,
+            'Close': close,
+            'Volume': rng.integers(1_000, 100_000, len(index)).astype(float),
+        }, index=index)
+        return frame if since is None else frame.loc[pd.Timestamp(since):]
+
+
+class FixtureNewsSource:
+    """RSSNewsSource 대신 쓰는 뉴스 source (현재 시각 기준 1시간 간격 기사 count개)"""
+
+    def __init__(self, count=20):
+        self.count = count
+        self.calls = 0
+
+    def fetch(self, ticker):
+        self.calls += 1
+        now = pd.Timestamp.now(tz='UTC').floor('h')
+        rng = np.random.default_rng(_seed('news', ticker.upper()))
+        articles = []
+        for i in range(self.count):
+            word = rng.choice(POSITIVE_WORDS + NEGATIVE_WORDS + ('reports', 'announces'))
+            articles.append({
+                'guid': f'{ticker.upper()}-{i}',
+                'title': f'{ticker.upper()} {word} in session {i}',
+                'summary': f'{ticker.upper()} {word} after quarterly update {i}. Analysts comment on the move.',
+                'link': f'https://example.com/{ticker.lower()}/{i}',
+                'published': format_datetime((now - pd.Timedelta(hours=i)).to_pydatetime()),
+            })
+        return articles
+
+
+class FixtureScorer:
+    """VaderScorer 대신 쓰는 단어 기반 점수 (NLTK lexicon 다운로드 없이 동작)"""
+
+    def score(self, texts):
+        scores = []
+        for text in texts:
+            words = (text or '').lower().split()
+            raw = sum(word in POSITIVE_WORDS for word in words) - sum(word in NEGATIVE_WORDS for word in words)
+            scores.append(float(np.tanh(raw)))
+        return scores
+
+
+class FixtureFundamentalsFetcher:
+    """AlphaVantageFetcher 대신 쓰는 재무제표 source (회계연도 years개, Alpha Vantage 원본 형식)"""
+
+    def __init__(self, years=5):
+        self.years = years
+        self.calls = 0
+
+    def fetch(self, statement, ticker):
+        if statement not in STATEMENT_ITEMS:
+            raise ValueError(f"Unknown statement: {statement}")
+        self.calls += 1
+        rng = np.random.default_rng(_seed('fundamentals', statement, ticker.upper()))
+        items = STATEMENT_ITEMS[statement]
+        values = rng.uniform(1e6, 4e11, (self.years, len(items))).round(-3)
+        frame = pd.DataFrame(values.astype('int64').astype(str), columns=items)
+        frame.insert(0, 'fiscalDateEnding', [f'{2024 - i}-12-31' for i in range(self.years)])
+        frame.insert(1, 'reportedCurrency', 'USD')
+        # 실제 응답처럼 값이 없는 항목은 'None' 문자열
+        frame.loc[self.years - 1, items[-2]] = 'None'
+        return frame
+
+
+class FixtureListingSource:
+    """NasdaqListingSource 대신 쓰는 상장 목록 (저장소의 대표 종목 + 'T000'...'T999' 가상 종목)"""
+
+    def __init__(self, count=1000):
+        self.count = count
+        self.calls = 0
+
+    def fetch(self):
+        self.calls += 1
+        listing = pd.read_csv(Path(__file__).resolve().parent / 'data' / 'symbols.csv')
+        rows = list(listing.itertuples(index=False, name=None))
+        return rows + [(f'T{i:03d}', f'Fixture Corp {i:03d}') for i in range(self.count)]
+
+
+def install(recorded_dir=None, news_count=20, years=5):
+    """sources 레지스트리에 fixture source를 등록하고 {이름: source}를 반환"""
+    installed = {
+        'prices': FixturePriceFetcher(recorded_dir),
+        'intraday': FixtureIntradayFetcher(),
+        'news': FixtureNewsSource(news_count),
+        'sentiment': FixtureScorer(),
+        'fundamentals': FixtureFundamentalsFetcher(years),
+        'symbols': FixtureListingSource(),
+    }
+    for name, source in installed.items():
+        sources.register(name, lambda source=source: source)
+    return installed
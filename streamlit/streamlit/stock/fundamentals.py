@@ -0,0 +1,201 @@
+import contextlib
+import contextvars
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+import pandas as pd
+
+import config
+from singleflight import SingleFlight
+from sources import CACHE_DIR
+from tracing import mark_miss, span
+
+DEFAULT_FUNDAMENTALS_DIR = CACHE_DIR / 'fundamentals'
+
+# 재무제표는 분기마다 바뀌므로 디스크 캐시는 7일 유지
+DEFAULT_TTL = 7 * 24 * 3600
+
+# 토큰 버킷 상태 파일 (디스크 캐시 옆 - 재시작/다른 replica/report worker가 같은 한도를 나눠 씀)
+QUOTA_FILE = 'quota.json'
+
+STATEMENTS = ('balance_sheet', 'income_statement', 'cash_flow')
+
+
+class QuotaExceededError(RuntimeError):
+    pass
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    # 같은 파일을 쓰는 다른 프로세스와 배타적으로 (fcntl이 없는 Windows에서는 프로세스 안에서만)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class TokenBucket:
+    """호출 한도를 지키기 위한 토큰 버킷 (capacity개까지 모이고 per_seconds 동안 capacity개가 다시 찬다)
+
+    path를 주면 남은 토큰을 그 파일에 두고 파일 lock 안에서 갱신하므로, 재시작해도 한도가 다시 차지 않고
+    같은 파일을 보는 프로세스(replica, report worker)가 하나의 한도를 나눠 쓴다.
+    """
+
+    def __init__(self, capacity, per_seconds=86400, path=None):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.path = Path(path) if path is not None else None
+        self._tokens = float(capacity)
+        self._updated = time.time()
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _state(self):
+        with self._lock:
+            if self.path is None:
+                yield
+                return
+            with _file_lock(self.path.with_name(self.path.name + '.lock')):
+                try:
+                    state = json.loads(self.path.read_text())
+                    self._tokens, self._updated = float(state['tokens']), float(state['updated'])
+                except (OSError, ValueError, KeyError, TypeError):
+                    # 파일이 없거나 손상되었으면 가득 찬 상태에서 시작
+                    self._tokens, self._updated = float(self.capacity), time.time()
+                yield
+                tmp = self.path.with_name(self.path.name + '.tmp')
+                tmp.write_text(json.dumps({'tokens': self._tokens, 'updated': self._updated}))
+                os.replace(tmp, self.path)
+
+    def _refill(self):
+        now = time.time()
+        # 벽시계 기준이므로 시계가 뒤로 가도 토큰이 줄지 않게 함
+        self._tokens = min(self.capacity, self._tokens + max(now - self._updated, 0) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, tokens=1):
+        with self._state():
+            self._refill()
+            if self._tokens < tokens:
+                return False
+            self._tokens -= tokens
+            return True
+
+    def available(self):
+        with self._state():
+            self._refill()
+            return int(self._tokens)
+
+
+class AlphaVantageFetcher:
+    """Alpha Vantage FundamentalData 기반 재무제표 fetcher"""
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def fetch(self, statement, ticker):
+        from alpha_vantage.fundamentaldata import FundamentalData
+
+        fd = FundamentalData(self.api_key, output_format='pandas')
+        methods = {
+            'balance_sheet': fd.get_balance_sheet_annual,
+            'income_statement': fd.get_income_statement_annual,
+            'cash_flow': fd.get_cash_flow_annual,
+        }
+        if statement not in methods:
+            raise ValueError(f"Unknown statement: {statement}")
+        with span(f'alphavantage.{statement}', ticker):
+            return methods[statement](ticker)[0]
+
+
+class FundamentalsClient:
+    """재무제표 3종을 동시에 받고 디스크에 보관하는 클라이언트
+
+    - 디스크 캐시(Parquet)가 TTL 안이면 API를 호출하지 않음 (재시작/다른 replica도 공유)
+    - 같은 (ticker, 재무제표) 요청이 동시에 들어오면 upstream 호출은 한 번만
+    - 실제 API 호출마다 토큰 버킷에서 하나씩 차감 (버킷 상태는 cache_dir의 quota.json에 공유)
+    """
+
+    def __init__(self, api_key=None, cache_dir=DEFAULT_FUNDAMENTALS_DIR, ttl=DEFAULT_TTL,
+                 quota=None, fetcher=None, max_workers=3):
+        self.fetcher = fetcher if fetcher is not None else AlphaVantageFetcher(api_key)
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        if quota is None:
+            quota = config.load().alphavantage_daily_quota
+        self.bucket = TokenBucket(quota, path=self.cache_dir / QUOTA_FILE)
+        self._flight = SingleFlight()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fundamentals')
+
+    def _path(self, statement, ticker):
+        return self.cache_dir / f"{ticker.upper()}_{statement}.parquet"
+
+    def _read(self, statement, ticker):
+        path = self._path(statement, ticker)
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                return None
+            return pd.read_parquet(path)
+        except (FileNotFoundError, OSError, ValueError):
+            return None
+
+    def _write(self, statement, ticker, frame):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self._path(statement, ticker)
+        tmp = path.with_name(path.name + '.tmp')
+        frame.to_parquet(tmp)
+        os.replace(tmp, path)
+
+    def _fetch(self, statement, ticker, force=False):
+        # 다른 세션이 먼저 받아 디스크에 써 두었을 수 있으므로 한 번 더 확인
+        cached = None if force else self._read(statement, ticker)
+        if cached is not None:
+            return cached
+
+        if not self.bucket.try_acquire():
+            raise QuotaExceededError(f'Alpha Vantage quota exhausted ({self.bucket.capacity} calls/day)')
+
+        mark_miss()
+        frame = self.fetcher.fetch(statement, ticker)
+        if frame is not None and not frame.empty:
+            self._write(statement, ticker, frame)
+        return frame
+
+    def get_statement(self, statement, ticker):
+        cached = self._read(statement, ticker)
+        if cached is not None:
+            return cached
+        return self._flight.do((statement, ticker.upper()), self._fetch, statement, ticker)
+
+    def expires_in(self, statement, ticker):
+        """디스크 캐시가 만료되기까지 남은 초 (없으면 0)"""
+        try:
+            age = time.time() - self._path(statement, ticker).stat().st_mtime
+        except OSError:
+            return 0
+        return max(self.ttl - age, 0)
+
+    def refresh(self, statement, ticker):
+        """캐시가 남아 있어도 새로 받아 디스크에 씀 (호출 한도에서 차감)"""
+        return self._flight.do((statement, ticker.upper()), self._fetch, statement, ticker, force=True)
+
+    def get_statements(self, ticker):
+        """(balance_sheet, income_statement, cash_flow)를 반환 (캐시에 없는 것만 병렬로 호출)"""
+        # 각 호출이 바깥 tracing span을 보도록 호출한 쪽 컨텍스트에서 실행
+        futures = [self._executor.submit(contextvars.copy_context().run, self.get_statement, statement, ticker)
+                   for statement in STATEMENTS]
+        return tuple(future.result() for future in futures)
@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+DEFAULT_PARAMS = {
+    'sma_windows': (20, 50),
+    'ema_span': 20,
+    'bb_window': 20,
+    'bb_k': 2.0,
+    'rsi_window': 14,
+    'macd': (12, 26, 9),
+    'atr_window': 14,
+    'vol_window': 20,
+    'sharpe_window': 63,
+}
+
+# 가격과 같은 축에 그리는 지표 / 별도 축(오른쪽)에 그리는 지표
+PRICE_OVERLAYS = {
+    'SMA 20': ['SMA 20'],
+    'SMA 50': ['SMA 50'],
+    'EMA 20': ['EMA 20'],
+    'Bollinger Bands': ['BB Upper', 'BB Middle', 'BB Lower'],
+}
+SECONDARY_OVERLAYS = {
+    'RSI': ['RSI'],
+    'MACD': ['MACD', 'MACD Signal'],
+    'ATR': ['ATR'],
+    'Volatility': ['Volatility'],
+    'Rolling Sharpe': ['Rolling Sharpe'],
+}
+
+INDICATOR_OPTIONS = [*PRICE_OVERLAYS, *SECONDARY_OVERLAYS]
+
+
+def _ema_alpha(span):
+    return 2.0 / (span + 1.0)
+
+
+def _ewm(values, alpha):
+    # adjust=False 형태의 지수 이동평균 (증분 업데이트와 같은 점화식)
+    return values.ewm(alpha=alpha, adjust=False).mean()
+
+
+def _true_range(high, low, close):
+    prev_close = close.shift(1)
+    ranges = np.stack([
+        (high - low).to_numpy(),
+        (high - prev_close).abs().to_numpy(),
+        (low - prev_close).abs().to_numpy(),
+    ])
+    return pd.Series(np.nanmax(ranges, axis=0), index=close.index)
+
+
+class IndicatorEngine:
+    """OHLCV 프레임 위에서 기술적 지표를 계산하는 엔진
+
+    처음에는 pandas rolling/ewm(O(n))으로 전체를 계산하고, 이후 새 봉이 붙으면
+    지수 평균 계열(EMA, RSI, MACD, ATR)은 마지막 상태값에서 이어서,
+    윈도우 계열(SMA, 볼린저, 변동성, Sharpe)은 마지막 윈도우 구간만 다시 계산한다.
+    """
+
+    def __init__(self, price_col='Close', params=None):
+        self.price_col = price_col
+        self.params = {**DEFAULT_PARAMS, **(params or {})}
+        self.frame = pd.DataFrame()
+        self._bars = pd.DataFrame()
+        self._state = {}
+
+    @property
+    def _lookback(self):
+        p = self.params
+        return max(max(p['sma_windows']), p['bb_window'], p['vol_window'], p['sharpe_window']) + 1
+
+    def _price_columns(self, ohlcv):
+        close = ohlcv[self.price_col].astype(float)
+        high = ohlcv['High'].astype(float) if 'High' in ohlcv.columns else close
+        low = ohlcv['Low'].astype(float) if 'Low' in ohlcv.columns else close
+        return close, high, low
+
+    def _windowed(self, close):
+        p = self.params
+        out = {}
+        for window in p['sma_windows']:
+            out[f'SMA {window}'] = close.rolling(window).mean()
+
+        bb_mid = close.rolling(p['bb_window']).mean()
+        bb_std = close.rolling(p['bb_window']).std(ddof=0)
+        out['BB Upper'] = bb_mid + p['bb_k'] * bb_std
+        out['BB Middle'] = bb_mid
+        out['BB Lower'] = bb_mid - p['bb_k'] * bb_std
+
+        returns = close.pct_change(fill_method=None)
+        out['Volatility'] = returns.rolling(p['vol_window']).std(ddof=0) * np.sqrt(TRADING_DAYS)
+        sharpe_window = returns.rolling(p['sharpe_window'])
+        out['Rolling Sharpe'] = sharpe_window.mean() / sharpe_window.std(ddof=0) * np.sqrt(TRADING_DAYS)
+        return pd.DataFrame(out, index=close.index)
+
+    def compute(self, ohlcv):
+        """전체 구간을 다시 계산"""
+        p = self.params
+        close, high, low = self._price_columns(ohlcv)
+        fast, slow, signal = p['macd']
+
+        out = self._windowed(close)
+        out[f"EMA {p['ema_span']}"] = _ewm(close, _ema_alpha(p['ema_span']))
+
+        delta = close.diff()
+        avg_gain = _ewm(delta.clip(lower=0), 1.0 / p['rsi_window'])
+        avg_loss = _ewm(-delta.clip(upper=0), 1.0 / p['rsi_window'])
+        out['RSI'] = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        ema_fast = _ewm(close, _ema_alpha(fast))
+        ema_slow = _ewm(close, _ema_alpha(slow))
+        out['MACD'] = ema_fast - ema_slow
+        out['MACD Signal'] = _ewm(out['MACD'], _ema_alpha(signal))
+        out['MACD Hist'] = out['MACD'] - out['MACD Signal']
+
+        out['ATR'] = _ewm(_true_range(high, low, close), 1.0 / p['atr_window'])
+
+        self.frame = out
+        self._bars = ohlcv.tail(self._lookback)
+        self._state = {
+            'ema': out[f"EMA {p['ema_span']}"].iloc[-1] if len(out) else np.nan,
+            'ema_fast': ema_fast.iloc[-1] if len(out) else np.nan,
+            'ema_slow': ema_slow.iloc[-1] if len(out) else np.nan,
+            'signal': out['MACD Signal'].iloc[-1] if len(out) else np.nan,
+            'avg_gain': avg_gain.iloc[-1] if len(out) else np.nan,
+            'avg_loss': avg_loss.iloc[-1] if len(out) else np.nan,
+            'atr': out['ATR'].iloc[-1] if len(out) else np.nan,
+            'close': close.iloc[-1] if len(out) else np.nan,
+        }
+        return out
+
+    def append(self, new_bars):
+        """마지막 봉 이후의 새 봉만 반영하고, 새로 계산된 지표 행을 반환"""
+        if self.frame.empty or any(np.isnan(v) for v in self._state.values()):
+            # 아직 상태값이 없으면(봉이 너무 적거나 결측) 보관 중인 구간으로 다시 계산
+            head = self.frame.iloc[:len(self.frame) - len(self._bars)]
+            self.compute(pd.concat([self._bars, new_bars]))
+            self.frame = pd.concat([head, self.frame])
+            return self.frame.loc[self.frame.index.isin(new_bars.index)]
+
+        new_bars = new_bars.loc[new_bars.index > self.frame.index[-1]]
+        if new_bars.empty:
+            return self.frame.iloc[:0]
+
+        p = self.params
+        fast, slow, signal = p['macd']
+        close, high, low = self._price_columns(new_bars)
+        state = self._state
+
+        rows = []
+        for c, h, l in zip(close.to_numpy(), high.to_numpy(), low.to_numpy()):
+            delta = c - state['close']
+            true_range = max(h - l, abs(h - state['close']), abs(l - state['close']))
+
+            state['ema'] += _ema_alpha(p['ema_span']) * (c - state['ema'])
+            state['ema_fast'] += _ema_alpha(fast) * (c - state['ema_fast'])
+            state['ema_slow'] += _ema_alpha(slow) * (c - state['ema_slow'])
+            macd = state['ema_fast'] - state['ema_slow']
+            state['signal'] += _ema_alpha(signal) * (macd - state['signal'])
+            state['avg_gain'] += (max(delta, 0.0) - state['avg_gain']) / p['rsi_window']
+            state['avg_loss'] += (max(-delta, 0.0) - state['avg_loss']) / p['rsi_window']
+            state['atr'] += (true_range - state['atr']) / p['atr_window']
+            state['close'] = c
+
+            rsi = 100 - 100 / (1 + state['avg_gain'] / state['avg_loss']) if state['avg_loss'] else 100.0
+            rows.append({
+                f"EMA {p['ema_span']}": state['ema'],
+                'RSI': rsi,
+                'MACD': macd,
+                'MACD Signal': state['signal'],
+                'MACD Hist': macd - state['signal'],
+                'ATR': state['atr'],
+            })
+
+        # 윈도우 계열은 직전 lookback 구간 + 새 봉만으로 계산
+        bars = pd.concat([self._bars, new_bars])
+        windowed = self._windowed(self._price_columns(bars)[0]).tail(len(new_bars))
+        added = pd.concat([windowed, pd.DataFrame(rows, index=new_bars.index)], axis=1)[self.frame.columns]
+
+        self.frame = pd.concat([self.frame, added])
+        self._bars = bars.tail(self._lookback)
+        return added
+
+    def sync(self, ohlcv):
+        """ohlcv가 기존 데이터에 봉이 덧붙은 형태면 append, 아니면 전체 재계산"""
+        if ohlcv.empty:
+            self.frame = pd.DataFrame()
+            return self.frame
+
+        if not self.frame.empty:
+            last = self.frame.index[-1]
+            same_start = ohlcv.index[0] == self.frame.index[0]
+            if same_start and last in ohlcv.index and ohlcv.index.get_loc(last) == len(self.frame) - 1:
+                self.append(ohlcv.loc[ohlcv.index > last])
+                return self.frame
+
+        return self.compute(ohlcv)
+
+
+def add_overlays(fig, indicator_frame, selected):
+    """선택한 지표를 기존 Plotly 가격 차트에 겹쳐 그림 (오실레이터 계열은 오른쪽 보조 축)"""
+    use_secondary = False
+    for name in selected:
+        for column in PRICE_OVERLAYS.get(name, []):
+            fig.add_scatter(x=indicator_frame.index, y=indicator_frame[column], mode='lines',
+                            name=column, line={'width': 1})
+        for column in SECONDARY_OVERLAYS.get(name, []):
+            fig.add_scatter(x=indicator_frame.index, y=indicator_frame[column], mode='lines',
+                            name=column, line={'width': 1, 'dash': 'dot'}, yaxis='y2')
+            use_secondary = True
+
+    if use_secondary:
+        fig.update_layout(yaxis2={'overlaying': 'y', 'side': 'right', 'showgrid': False})
+    return fig
@@ -0,0 +1,234 @@
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from price_store import normalize_ohlcv
+from tracing import span
+
+MARKET_TZ = 'America/New_York'
+BAR_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# 처음 받을 때의 기간 (yfinance 1m 봉은 최근 7일까지만 제공)
+INITIAL_PERIOD = {'1m': '1d', '5m': '5d'}
+
+# 정규장 하루 1분봉 개수 (6.5시간)
+DEFAULT_CAPACITY = 390
+
+# 여러 세션이 같은 feed를 열어도 upstream은 이 간격보다 자주 부르지 않음
+MIN_POLL_SECONDS = 15
+
+
+class YFinanceIntradayFetcher:
+    """yfinance 분봉 fetcher (since 이후 봉만 요청)"""
+
+    def fetch_since(self, ticker, interval, since=None):
+        import yfinance as yf
+
+        with span('yfinance.intraday', ticker):
+            if since is None:
+                data = yf.download(ticker, period=INITIAL_PERIOD.get(interval, '1d'), interval=interval,
+                                   auto_adjust=True, group_by='ticker', progress=False)
+            else:
+                # 저장된 시각은 거래소 현지 시각(tz 없음)이므로 다시 붙여서 요청
+                start = pd.Timestamp(since).tz_localize(MARKET_TZ)
+                data = yf.download(ticker, start=start, interval=interval,
+                                   auto_adjust=True, group_by='ticker', progress=False)
+        return normalize_ohlcv(data)
+
+
+class BarRing:
+    """고정 크기 OHLCV 링 버퍼 (가득 차면 가장 오래된 봉부터 덮어씀)
+
+    시각은 int64(ns), 값은 (capacity x 5) float 배열에 그대로 두므로 봉이 계속 들어와도 메모리는 늘지 않는다.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._times = np.zeros(capacity, dtype=np.int64)
+        self._values = np.full((capacity, len(BAR_COLUMNS)), np.nan)
+        self._head = 0
+        self.size = 0
+
+    @property
+    def last_time(self):
+        if self.size == 0:
+            return None
+        return pd.Timestamp(self._times[(self._head - 1) % self.capacity])
+
+    def _order(self):
+        return (self._head - self.size + np.arange(self.size)) % self.capacity
+
+    def upsert(self, times, values):
+        """마지막 봉보다 새로운 봉은 뒤에 붙이고, 마지막 봉과 같은 시각이면 값만 갱신
+
+        반환값: (갱신된 마지막 봉 값 또는 None, 새로 붙인 봉 개수)
+        """
+        times = np.asarray(times, dtype='datetime64[ns]').astype(np.int64)
+        values = np.asarray(values, dtype=float)
+        updated = None
+        if self.size:
+            last = self._times[(self._head - 1) % self.capacity]
+            same = np.flatnonzero(times == last)
+            if same.size:
+                updated = values[same[-1]]
+                self._values[(self._head - 1) % self.capacity] = updated
+            keep = times > last
+            times, values = times[keep], values[keep]
+
+        # capacity보다 많으면 마지막 capacity개만 의미가 있음
+        times, values = times[-self.capacity:], values[-self.capacity:]
+        slots = (self._head + np.arange(len(times))) % self.capacity
+        self._times[slots] = times
+        self._values[slots] = values
+        self._head = (self._head + len(times)) % self.capacity
+        self.size = min(self.size + len(times), self.capacity)
+        return updated, len(times)
+
+    def tail(self, n):
+        """마지막 n개 봉을 시간순 DataFrame으로"""
+        order = self._order()[-n:] if n else self._order()[:0]
+        return pd.DataFrame(self._values[order], columns=BAR_COLUMNS,
+                            index=pd.DatetimeIndex(self._times[order], name='Date'))
+
+    def frame(self):
+        return self.tail(self.size)
+
+
+class RollingStats:
+    """봉 단위로 O(1)에 갱신하는 통계 (VWAP, 고가/저가, 최근 window개 수익률 평균/표준편차)
+
+    진행 중인 마지막 봉은 값이 계속 바뀌므로 replace_last로 그 봉의 기여만 바꿔 넣는다.
+    append에 거래일(거래소 현지 날짜)을 넘기면 날짜가 바뀔 때 모두 초기화하므로 값은 현재 세션 기준이고,
+    전날 종가 -> 오늘 첫 봉의 overnight gap은 수익률 window에 들어가지 않는다.
+    """
+
+    def __init__(self, window=30):
+        self.window = window
+        self._reset()
+        self.day = None
+
+    def _reset(self):
+        self._returns = deque()
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._pv = 0.0
+        self._volume = 0.0
+        self._prev_close = None
+        self._last = None
+        self.high = -np.inf
+        self.low = np.inf
+        self.bars = 0
+
+    def _add_return(self, ret):
+        self._returns.append(ret)
+        self._sum += ret
+        self._sum_sq += ret * ret
+        if len(self._returns) > self.window:
+            old = self._returns.popleft()
+            self._sum -= old
+            self._sum_sq -= old * old
+
+    def _bar_terms(self, bar):
+        _, high, low, close, volume = bar
+        volume = 0.0 if np.isnan(volume) else volume
+        return close * volume, volume, high, low
+
+    def append(self, bar, day=None):
+        if day is not None and day != self.day:
+            self._reset()
+            self.day = day
+        if self._last is not None:
+            self._prev_close = self._last[3]
+            self._add_return(bar[3] / self._prev_close - 1)
+        pv, volume, high, low = self._bar_terms(bar)
+        self._pv += pv
+        self._volume += volume
+        self.high = max(self.high, high)
+        self.low = min(self.low, low)
+        self._last = bar
+        self.bars += 1
+
+    def replace_last(self, bar):
+        if self._last is None:
+            self.append(bar)
+            return
+        old_pv, old_volume, _, _ = self._bar_terms(self._last)
+        pv, volume, high, low = self._bar_terms(bar)
+        self._pv += pv - old_pv
+        self._volume += volume - old_volume
+        self.high = max(self.high, high)
+        self.low = min(self.low, low)
+        if self._prev_close is not None and self._returns:
+            old = self._returns.pop()
+            self._sum -= old
+            self._sum_sq -= old * old
+            ret = bar[3] / self._prev_close - 1
+            self._returns.append(ret)
+            self._sum += ret
+            self._sum_sq += ret * ret
+        self._last = bar
+
+    def snapshot(self):
+        n = len(self._returns)
+        mean = self._sum / n if n else np.nan
+        # 누적 합으로 계산하므로 부동소수 오차로 음수가 되지 않게 0으로 자름
+        std = np.sqrt(max(self._sum_sq / n - mean * mean, 0.0)) if n else np.nan
+        return {
+            'last': self._last[3] if self._last is not None else np.nan,
+            'vwap': self._pv / self._volume if self._volume else np.nan,
+            'high': self.high if self.bars else np.nan,
+            'low': self.low if self.bars else np.nan,
+            'return_mean': mean,
+            'return_std': std,
+            'bars': self.bars,
+        }
+
+
+class IntradayFeed:
+    """(ticker, interval)별 분봉 feed - 여러 세션이 공유
+
+    poll()은 마지막으로 저장한 봉 이후만 요청해서 링 버퍼와 통계에 붙이고,
+    MIN_POLL_SECONDS 안에 다시 불리면 upstream 호출 없이 현재 상태만 돌려준다.
+    """
+
+    def __init__(self, ticker, interval='1m', fetcher=None, capacity=DEFAULT_CAPACITY, window=30,
+                 min_poll_seconds=MIN_POLL_SECONDS):
+        self.ticker = ticker.upper()
+        self.interval = interval
+        self.fetcher = fetcher if fetcher is not None else YFinanceIntradayFetcher()
+        self.ring = BarRing(capacity)
+        self.stats = RollingStats(window)
+        self.min_poll_seconds = min_poll_seconds
+        self._polled = None
+        self._lock = threading.Lock()
+
+    def poll(self):
+        """새 봉을 받아 반영하고 새로 붙은 봉 개수를 반환"""
+        with self._lock:
+            now = time.monotonic()
+            if self._polled is not None and now - self._polled < self.min_poll_seconds:
+                return 0
+            self._polled = now
+
+            bars = self.fetcher.fetch_since(self.ticker, self.interval, self.ring.last_time)
+            if bars is None or bars.empty:
+                return 0
+            bars = bars.reindex(columns=BAR_COLUMNS).dropna(subset=['Close'])
+            values = bars.to_numpy(dtype=float)
+            updated, appended = self.ring.upsert(bars.index.to_numpy(), values)
+
+            # 통계는 버퍼와 같은 봉만 반영 (upsert가 버린 과거 봉은 제외)
+            new_values = values[len(values) - appended:] if appended else values[:0]
+            new_days = bars.index[len(values) - appended:].normalize() if appended else bars.index[:0]
+            if updated is not None:
+                self.stats.replace_last(tuple(updated))
+            for bar, day in zip(new_values, new_days):
+                self.stats.append(tuple(bar), day)
+            return appended
+
+    def snapshot(self):
+        with self._lock:
+            return self.ring.frame(), self.stats.snapshot()
@@ -0,0 +1,222 @@
+import hashlib
+import html
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from tracing import mark_miss, span
+
+# stocknews 패키지와 같은 Yahoo Finance RSS 주소
+YAHOO_RSS_URL = 'https://feeds.finance.yahoo.com/rss/2.0/headline?s=%s&region=US&lang=en-US'
+
+# VADER compound 점수 기준 (공식 권장값)
+POSITIVE_THRESHOLD = 0.05
+NEGATIVE_THRESHOLD = -0.05
+
+SENTIMENT_ICONS = {'Positive': '🟢', 'Negative': '🔴', 'Neutral': '🟡'}
+SENTIMENT_COLORS = {'Positive': '#28a745', 'Negative': '#dc3545', 'Neutral': '#ffc107'}
+
+ARTICLE_FIELDS = ['guid', 'title', 'summary', 'link', 'published']
+
+NEWS_COLUMNS = [
+    'key', 'stock', 'title', 'summary', 'link', 'published', 'published_text',
+    'sentiment_title', 'sentiment_summary', 'title_label', 'summary_label',
+    'title_html', 'summary_html',
+]
+
+CARD_TEMPLATE = '''<div style="background-color: #f8f9fa; border-left: 4px solid #007bff; padding: 1rem; margin: 1rem 0; border-radius: 0.5rem; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+<h4 style="margin: 0 0 0.5rem 0; color: #333;">📰 News #{number}</h4>
+<p style="margin: 0 0 0.75rem 0; color: #666; font-size: 0.9rem;">📅 {published}</p>
+<p style="margin: 0 0 0.5rem 0;"><b>📄 Title:</b> {title}</p>
+<p style="margin: 0 0 0.5rem 0;"><b>📝 Summary:</b> {summary}</p>
+<p style="margin: 0; font-size: 0.9rem;"><b>🎭 Sentiment</b> &nbsp; {title_icon} Title: {title_label} &nbsp; {summary_icon} Summary: {summary_label}</p>
+</div>'''
+
+
+class RSSNewsSource:
+    """Yahoo Finance RSS에서 기사 목록을 가져오는 기본 source"""
+
+    def fetch(self, ticker):
+        import feedparser
+
+        with span('rss', ticker):
+            feed = feedparser.parse(YAHOO_RSS_URL % ticker)
+        return [
+            {
+                'guid': entry.get('guid', ''),
+                'title': entry.get('title', ''),
+                'summary': entry.get('summary', ''),
+                'link': entry.get('link', ''),
+                'published': entry.get('published', ''),
+            }
+            for entry in feed.entries
+        ]
+
+
+_vader = None
+_vader_lock = threading.Lock()
+
+
+def load_vader():
+    """NLTK VADER 분석기를 프로세스당 한 번만 로드 (서버 시작 시 warm-up에서 미리 호출 가능)"""
+    global _vader
+    with _vader_lock:
+        if _vader is None:
+            import nltk
+            from nltk.sentiment.vader import SentimentIntensityAnalyzer
+
+            with span('vader.load'):
+                try:
+                    nltk.data.find('sentiment/vader_lexicon.zip')
+                except LookupError:
+                    nltk.download('vader_lexicon', quiet=True)
+                _vader = SentimentIntensityAnalyzer()
+        return _vader
+
+
+class VaderScorer:
+    """NLTK VADER 감정 분석기 (lexicon은 처음 사용할 때 한 번만 로드하고 모든 인스턴스가 공유)"""
+
+    def score(self, texts):
+        analyzer = load_vader()
+        with span('vader.score'):
+            return [analyzer.polarity_scores(text or '')['compound'] for text in texts]
+
+
+def article_key(article):
+    """link(없으면 guid)와 제목으로 만든 기사 식별 해시"""
+    raw = f"{article.get('link') or article.get('guid', '')}|{article.get('title', '')}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def sentiment_labels(scores):
+    """compound 점수 배열을 Positive/Negative/Neutral 범주형으로 변환"""
+    scores = np.asarray(scores, dtype=float)
+    labels = np.select(
+        [scores >= POSITIVE_THRESHOLD, scores <= NEGATIVE_THRESHOLD],
+        ['Positive', 'Negative'],
+        default='Neutral',
+    )
+    return pd.Categorical(labels, categories=['Positive', 'Neutral', 'Negative'])
+
+
+class NewsCache:
+    """ticker별 TTL을 가진 뉴스 + 감정 점수 캐시
+
+    한 번 점수를 매긴 기사는 해시로 기억해 두고, 새로 들어온 기사만 VADER로 점수를 매긴다.
+    반환하는 DataFrame은 렌더링에 필요한 라벨/날짜 문자열까지 미리 계산되어 있다.
+    """
+
+    def __init__(self, source=None, scorer=None, ttl=900, max_scores=20000, sink=None):
+        self.source = source if source is not None else RSSNewsSource()
+        self.scorer = scorer if scorer is not None else VaderScorer()
+        # 새로 받은 프레임을 넘겨받을 콜백 (예: SentimentStore.append_news)
+        self.sink = sink
+        self.ttl = ttl
+        self.max_scores = max_scores
+        self._frames = {}
+        self._scores = {}
+        # ticker별 TTL (백그라운드에서 주기적으로 갱신하는 watchlist ticker는 더 길게)
+        self._pinned = {}
+        self._lock = threading.Lock()
+
+    def _scores_for(self, articles, keys):
+        """기사별 (제목, 요약) 점수 배열 (처음 보는 기사만 새로 점수를 매김)"""
+        with self._lock:
+            known = {key: self._scores[key] for key in keys if key in self._scores}
+        unseen = [(key, article) for key, article in zip(keys, articles) if key not in known]
+
+        if unseen:
+            titles = self.scorer.score([article.get('title', '') for _, article in unseen])
+            summaries = self.scorer.score([article.get('summary', '') for _, article in unseen])
+            for (key, _), title_score, summary_score in zip(unseen, titles, summaries):
+                known[key] = (title_score, summary_score)
+
+            with self._lock:
+                # 점수 캐시가 너무 커지면 오래된 것부터 버린다 (dict는 삽입 순서 유지)
+                overflow = len(self._scores) + len(unseen) - self.max_scores
+                for old_key in list(self._scores)[:max(overflow, 0)]:
+                    del self._scores[old_key]
+                for key, _ in unseen:
+                    self._scores[key] = known[key]
+
+        return np.array([known[key] for key in keys], dtype=float).reshape(-1, 2)
+
+    def _build_frame(self, ticker, articles):
+        if not articles:
+            return pd.DataFrame(columns=NEWS_COLUMNS)
+
+        keys = [article_key(article) for article in articles]
+        scores = self._scores_for(articles, keys)
+        frame = pd.DataFrame(articles, columns=ARTICLE_FIELDS)
+        frame[ARTICLE_FIELDS] = frame[ARTICLE_FIELDS].fillna('').astype(str)
+        frame.insert(0, 'key', keys)
+        frame.insert(1, 'stock', ticker)
+        frame = frame.drop_duplicates('key')
+        scores = scores[frame.index.to_numpy()]
+
+        frame['published'] = pd.to_datetime(frame['published'], format='%a, %d %b %Y %H:%M:%S %z',
+                                            utc=True, errors='coerce')
+        frame['published_text'] = frame['published'].dt.strftime('%Y-%m-%d %H:%M UTC').fillna('N/A')
+        frame['sentiment_title'] = scores[:, 0]
+        frame['sentiment_summary'] = scores[:, 1]
+        frame['title_label'] = sentiment_labels(scores[:, 0])
+        frame['summary_label'] = sentiment_labels(scores[:, 1])
+
+        # RSS 본문에 HTML이 섞여 있을 수 있으므로 카드에 넣을 문자열은 미리 escape
+        frame['title_html'] = [html.escape(text) for text in frame['title']]
+        frame['summary_html'] = [html.escape(text) for text in frame['summary']]
+
+        frame = frame.sort_values('published', ascending=False, na_position='last')
+        return frame[NEWS_COLUMNS].reset_index(drop=True)
+
+    def pin(self, tickers, ttl):
+        """tickers의 TTL을 ttl로 바꿈 (scheduler가 ttl보다 자주 refresh하는 ticker용)"""
+        with self._lock:
+            for ticker in tickers:
+                self._pinned[ticker.upper()] = ttl
+
+    def get(self, ticker, limit=None, refresh=False):
+        """ticker의 뉴스 DataFrame (TTL 안이면 네트워크/NLTK 호출 없이 반환, refresh=True면 항상 새로 받음)"""
+        ticker = ticker.upper()
+        now = time.monotonic()
+
+        cached = self._frames.get(ticker)
+        if refresh or cached is None or now - cached[0] > self._pinned.get(ticker, self.ttl):
+            mark_miss()
+            frame = self._build_frame(ticker, self.source.fetch(ticker))
+            with self._lock:
+                self._frames[ticker] = (now, frame)
+            if self.sink is not None:
+                self.sink(frame)
+        else:
+            frame = cached[1]
+
+        return frame.head(limit) if limit is not None else frame
+
+    def invalidate(self, ticker=None):
+        with self._lock:
+            if ticker is None:
+                self._frames.clear()
+            else:
+                self._frames.pop(ticker.upper(), None)
+
+
+def render_cards_html(frame):
+    """상위 기사들을 하나의 HTML 블록으로 만든다 (st.markdown 한 번으로 전송)"""
+    if frame.empty:
+        return ''
+    fields = {
+        'number': range(1, len(frame) + 1),
+        'published': frame['published_text'],
+        'title': frame['title_html'].replace('', 'No Title'),
+        'summary': frame['summary_html'].replace('', 'No Summary'),
+        'title_icon': frame['title_label'].map(SENTIMENT_ICONS),
+        'title_label': frame['title_label'],
+        'summary_icon': frame['summary_label'].map(SENTIMENT_ICONS),
+        'summary_label': frame['summary_label'],
+    }
+    columns = [list(values) for values in fields.values()]
+    return '\n'.join(CARD_TEMPLATE.format(**dict(zip(fields, row))) for row in zip(*columns))
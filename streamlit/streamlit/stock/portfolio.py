@@ -0,0 +1,62 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+
+
+def parse_tickers(text):
+    """쉼표/공백/줄바꿈으로 구분된 ticker 목록을 중복 없이 대문자로 반환"""
+    symbols = [token.strip().upper() for token in re.split(r'[\s,;]+', text or '')]
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+def price_matrix(frames, price_col='Close'):
+    """{ticker: OHLCV DataFrame}을 날짜 x ticker 가격 행렬로 변환"""
+    columns = {symbol: frame[price_col] for symbol, frame in frames.items() if price_col in frame.columns}
+    if not columns:
+        return pd.DataFrame()
+    return pd.concat(columns, axis=1).sort_index()
+
+
+def daily_returns(prices):
+    """전일 대비 수익률 (모든 컬럼 한 번에 계산)"""
+    return prices.pct_change(fill_method=None)
+
+
+def drawdowns(prices):
+    """고점 대비 하락률 (0 이하 값)"""
+    return prices / prices.cummax() - 1
+
+
+def portfolio_stats(prices, risk_free_rate=0.0):
+    """ticker별 연간 수익률, 변동성, Sharpe, 최대 낙폭을 계산
+
+    단일 종목 탭과 같은 방식(일간 수익률 평균 * 252, 모표준편차 * sqrt(252))을 사용한다.
+    """
+    returns = daily_returns(prices)
+
+    annual_return = returns.mean() * TRADING_DAYS
+    volatility = returns.std(ddof=0) * np.sqrt(TRADING_DAYS)
+    sharpe = (annual_return - risk_free_rate) / volatility.replace(0, np.nan)
+    max_drawdown = drawdowns(prices).min()
+
+    return pd.DataFrame({
+        'Annual Return %': annual_return * 100,
+        'Volatility %': volatility * 100,
+        'Sharpe': sharpe,
+        'Max Drawdown %': max_drawdown * 100,
+        'Observations': returns.count(),
+    })
+
+
+def correlation_matrix(prices):
+    """일간 수익률 상관계수 행렬"""
+    return daily_returns(prices).corr()
+
+
+def equal_weight_curve(prices):
+    """매일 리밸런싱하는 동일 가중 포트폴리오의 누적 가치 (시작 = 1.0)"""
+    portfolio_returns = daily_returns(prices).mean(axis=1).fillna(0.0)
+    return (1 + portfolio_returns).cumprod()
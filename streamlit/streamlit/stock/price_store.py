@@ -0,0 +1,266 @@
+import json
+import os
+import threading
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from sources import CACHE_DIR
+from tracing import mark_miss, span
+
+# 가격 캐시 기본 위치 (data/cache/prices)
+DEFAULT_PRICE_DIR = CACHE_DIR / 'prices'
+
+
+def normalize_ohlcv(data):
+    """yfinance 결과를 단일 레벨 컬럼 + 'Date' 인덱스 형태로 정리"""
+    if data is None or data.empty:
+        return pd.DataFrame()
+
+    data = data.copy()
+
+    # MultiIndex 컬럼 문제 해결 (ticker 레벨 제거)
+    if isinstance(data.columns, pd.MultiIndex):
+        data.columns = data.columns.droplevel(0)
+
+    # 컬럼명 정리
+    data.columns = [str(col).strip() for col in data.columns]
+    data.columns.name = None
+
+    index = pd.DatetimeIndex(data.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    data.index = index
+    data.index.name = 'Date'
+
+    return data.sort_index()
+
+
+class YFinanceFetcher:
+    """yfinance 기반 가격 fetcher
+
+    테스트/오프라인 환경에서는 같은 `fetch` 시그니처를 가진 객체로 교체하면 된다.
+    """
+
+    def fetch(self, ticker, start, end, adjusted):
+        import yfinance as yf
+
+        # auto_adjust=True를 사용하면 Close 컬럼이 이미 조정된 가격이 됩니다
+        # auto_adjust=False를 사용하면 Adj Close 컬럼을 별도로 받을 수 있습니다
+        with span('yfinance.download', ticker):
+            data = yf.download(ticker, start=start, end=end, auto_adjust=adjusted,
+                               group_by='ticker', progress=False)
+        return normalize_ohlcv(data)
+
+    def fetch_many(self, tickers, start, end, adjusted):
+        """여러 ticker를 한 번의 yf.download 호출로 받아 {ticker: DataFrame}으로 반환"""
+        import yfinance as yf
+
+        with span('yfinance.download_many'):
+            data = yf.download(list(tickers), start=start, end=end, auto_adjust=adjusted,
+                               group_by='ticker', progress=False)
+        if data is None or data.empty:
+            return {}
+
+        # group_by='ticker' 이므로 첫 번째 컬럼 레벨이 ticker
+        frames = {}
+        for symbol in data.columns.get_level_values(0).unique():
+            frame = normalize_ohlcv(data[symbol]).dropna(how='all')
+            if not frame.empty:
+                frames[symbol] = frame
+        return frames
+
+
+class PriceStore:
+    """ticker/조정 모드별 Parquet 가격 캐시
+
+    이미 받아둔 구간은 디스크에서 읽고, 요청 구간의 앞/뒤로 비어 있는 부분만 fetcher로 받아 병합한다.
+    커버리지 구간은 같은 이름의 .json 파일에 [start, end) 형태로 기록한다 (yfinance와 같이 end는 미포함).
+    """
+
+    def __init__(self, root=DEFAULT_PRICE_DIR, fetcher=None):
+        self.root = Path(root)
+        self.fetcher = fetcher if fetcher is not None else YFinanceFetcher()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _stem(self, ticker, adjusted):
+        mode = 'adj' if adjusted else 'raw'
+        return f"{ticker.upper()}_{mode}"
+
+    def _path(self, stem, suffix):
+        # BRK.B 처럼 '.'이 들어간 ticker가 있으므로 with_suffix 대신 문자열로 붙인다
+        return self.root / f"{stem}{suffix}"
+
+    def _lock(self, stem):
+        with self._locks_guard:
+            return self._locks.setdefault(stem, threading.Lock())
+
+    def _read(self, stem):
+        parquet_path = self._path(stem, '.parquet')
+        meta_path = self._path(stem, '.json')
+        if not parquet_path.exists() or not meta_path.exists():
+            return pd.DataFrame(), None
+
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+            cached = pd.read_parquet(parquet_path)
+        except Exception:
+            # 손상된 캐시는 무시하고 새로 받는다
+            return pd.DataFrame(), None
+
+        coverage = (pd.Timestamp(meta['start']), pd.Timestamp(meta['end']))
+        return cached, coverage
+
+    def _write(self, stem, data, coverage):
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # 임시 파일에 쓴 뒤 교체 (읽는 쪽에서 반쯤 쓰인 파일을 보지 않도록)
+        parquet_tmp = self._path(stem, '.parquet.tmp')
+        meta_tmp = self._path(stem, '.json.tmp')
+        data.to_parquet(parquet_tmp)
+        with open(meta_tmp, 'w') as f:
+            json.dump({'start': coverage[0].isoformat(), 'end': coverage[1].isoformat()}, f)
+        os.replace(parquet_tmp, self._path(stem, '.parquet'))
+        os.replace(meta_tmp, self._path(stem, '.json'))
+
+    @staticmethod
+    def _missing_ranges(start, end, coverage):
+        if coverage is None:
+            return [(start, end)]
+
+        # 커버리지는 구간 하나로만 기록하므로 요청 구간과 떨어져 있어도 기존 경계부터 이어서 받는다
+        # (그렇지 않으면 병합 후 커버리지가 받은 적 없는 사이 구간까지 덮게 됨)
+        covered_start, covered_end = coverage
+        gaps = []
+        if start < covered_start:
+            gaps.append((start, covered_start))
+        if end > covered_end:
+            gaps.append((covered_end, end))
+        return gaps
+
+    @staticmethod
+    def _bounds(start, end):
+        return pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+
+    @staticmethod
+    def _extend(coverage, gaps, fetched):
+        """실제로 받은 구간만큼 커버리지를 넓힘
+
+        yfinance는 네트워크 오류/호출 제한에도 빈 결과를 돌려주므로, 빈 결과는 영업일이 없는 구간
+        (주말 등)일 때만 받은 것으로 본다. 그렇지 않으면 다음 요청 때 다시 받는다.
+        """
+        # 오늘 봉은 장중에 계속 바뀌므로 커버리지에 포함하지 않는다
+        today = pd.Timestamp(date.today())
+        for (gap_start, gap_end), frame in zip(gaps, fetched):
+            if (frame is None or frame.empty) and len(pd.bdate_range(gap_start, gap_end, inclusive='left')):
+                continue
+            gap_end = max(min(gap_end, today), gap_start)
+            if coverage is None:
+                coverage = (gap_start, gap_end)
+            elif gap_start <= coverage[1] and gap_end >= coverage[0]:
+                coverage = (min(coverage[0], gap_start), max(coverage[1], gap_end))
+        return coverage
+
+    def _merge(self, stem, cached, coverage, gaps, fetched):
+        frames = [frame for frame in [cached, *fetched] if frame is not None and not frame.empty]
+        if not frames:
+            # 데이터가 전혀 없는 ticker는 캐시하지 않음 (오타 등)
+            return pd.DataFrame()
+
+        new_coverage = self._extend(coverage, gaps, fetched)
+        if len(frames) == 1 and frames[0] is cached and new_coverage == coverage:
+            # 받은 것이 없으면 메타데이터를 다시 쓰지 않음
+            return cached
+
+        merged = pd.concat(frames)
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+        if new_coverage is None:
+            # 받은 행은 있지만 받은 구간으로 인정할 수 없으면 (빈 결과 구간만 남은 경우) 데이터만 돌려줌
+            return merged
+        self._write(stem, merged, new_coverage)
+        return merged
+
+    @staticmethod
+    def _slice(data, start, end):
+        if data.empty:
+            return data
+        return data.loc[(data.index >= start) & (data.index < end)]
+
+    def load(self, ticker, start, end, adjusted=True):
+        """[start, end) 구간의 OHLCV 데이터를 반환 (필요한 구간만 네트워크에서 받음)"""
+        start, end = self._bounds(start, end)
+        if start >= end:
+            return pd.DataFrame()
+
+        stem = self._stem(ticker, adjusted)
+        with self._lock(stem):
+            cached, coverage = self._read(stem)
+            gaps = self._missing_ranges(start, end, coverage)
+
+            if gaps:
+                mark_miss()
+                fetched = [self.fetcher.fetch(ticker, gap_start.date(), gap_end.date(), adjusted)
+                           for gap_start, gap_end in gaps]
+                cached = self._merge(stem, cached, coverage, gaps, fetched)
+
+        return self._slice(cached, start, end)
+
+    def load_many(self, tickers, start, end, adjusted=True):
+        """여러 ticker를 {ticker: DataFrame}으로 반환
+
+        비어 있는 구간이 같은 ticker끼리 묶어 fetcher.fetch_many 한 번으로 받는다.
+        데이터가 없는 ticker는 결과에서 빠진다.
+        """
+        start, end = self._bounds(start, end)
+        if start >= end:
+            return {}
+
+        tickers = list(dict.fromkeys(t.upper() for t in tickers))
+        cached = {}
+        pending = {}
+        for symbol in tickers:
+            frame, coverage = self._read(self._stem(symbol, adjusted))
+            cached[symbol] = (frame, coverage)
+            for gap in self._missing_ranges(start, end, coverage):
+                pending.setdefault(gap, []).append(symbol)
+
+        fetched = {}
+        if pending:
+            mark_miss()
+        for gap, symbols in pending.items():
+            gap_start, gap_end = gap
+            if hasattr(self.fetcher, 'fetch_many'):
+                frames = self.fetcher.fetch_many(symbols, gap_start.date(), gap_end.date(), adjusted)
+            else:
+                frames = {symbol: self.fetcher.fetch(symbol, gap_start.date(), gap_end.date(), adjusted)
+                          for symbol in symbols}
+            for symbol in symbols:
+                fetched.setdefault(symbol, []).append((gap, frames.get(symbol)))
+
+        result = {}
+        for symbol in tickers:
+            frame, coverage = cached[symbol]
+            if symbol in fetched:
+                stem = self._stem(symbol, adjusted)
+                with self._lock(stem):
+                    # 받는 동안 load()나 watchlist가 같은 파일을 갱신했을 수 있으므로 다시 읽고 병합
+                    frame, coverage = self._read(stem)
+                    gaps, frames = zip(*fetched[symbol])
+                    frame = self._merge(stem, frame, coverage, gaps, frames)
+            frame = self._slice(frame, start, end)
+            if not frame.empty:
+                result[symbol] = frame
+        return result
+
+    def clear(self, ticker=None):
+        """캐시 파일 삭제 (ticker를 지정하지 않으면 전체)"""
+        if not self.root.exists():
+            return
+        pattern = f"{ticker.upper()}_*" if ticker else '*'
+        for path in self.root.glob(pattern):
+            if path.suffix in ('.parquet', '.json', '.tmp'):
+                path.unlink()
+
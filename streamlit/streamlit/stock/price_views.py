@@ -0,0 +1,63 @@
+import threading
+
+import pyarrow as pa
+
+
+class PriceView:
+    """(ticker, 구간, 조정 모드)마다 한 번만 만드는 읽기 전용 가격 데이터
+
+    여러 rerun/세션이 같은 객체를 공유하므로 data를 직접 수정하지 않는다.
+    파생 컬럼은 pandas copy-on-write 상태에서 assign으로 만들어 원본 컬럼 버퍼를 그대로 공유하고,
+    화면에 보낼 테이블은 Arrow로 한 번만 변환해 보관한다.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._derived = {}
+        self._tables = {}
+        self._lock = threading.RLock()
+
+    def __getstate__(self):
+        # 캐시가 디스크로 내릴 때(pickle) lock은 빼고 저장
+        state = dict(self.__dict__)
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def prepare(self, price_col):
+        """화면에서 쓰는 파생 프레임/Arrow 테이블을 미리 만들어 둠 (캐시가 잰 크기가 나중에 늘지 않도록)"""
+        self.arrow('recent')
+        if price_col is not None:
+            self.arrow('changes', price_col)
+        return self
+
+    def _memo(self, store, key, build):
+        with self._lock:
+            if key not in store:
+                store[key] = build()
+            return store[key]
+
+    def changes(self, price_col):
+        """'% Change' 컬럼이 붙은 프레임 (첫 행처럼 계산할 수 없는 행은 제외)"""
+        def build():
+            price = self.data[price_col]
+            derived = self.data.assign(**{'% Change': price / price.shift(1) - 1})
+            return derived.dropna()
+
+        return self._memo(self._derived, ('changes', price_col), build)
+
+    def arrow(self, name, price_col=None):
+        """표 위젯에 바로 넘길 수 있는 Arrow 테이블 ('recent' 또는 'changes')"""
+        def build():
+            if name == 'recent':
+                frame = self.data.tail()
+            elif name == 'changes':
+                frame = self.changes(price_col)
+            else:
+                raise ValueError(f"Unknown table: {name}")
+            return pa.Table.from_pandas(frame, preserve_index=True)
+
+        return self._memo(self._tables, (name, price_col), build)
@@ -0,0 +1,334 @@
+"""여러 ticker의 가격 통계 / 재무제표 / 뉴스 감정을 브라우저 없이 계산하는 batch report
+
+    python report.py AAPL MSFT GOOGL --out reports/today
+    python report.py --file sp500.csv --workers 4 --out reports/nightly
+    python report.py --file sp500.csv --fixtures --out /tmp/report     # 네트워크 없이 fixture source로
+
+대시보드와 같은 계산(analytics.py)을 쓰고, ticker를 CHUNK_SIZE개씩 묶어 프로세스 풀에서 처리한다.
+ticker마다 결과를 checkpoints/<TICKER>.pkl에 바로 저장하므로, 중단된 뒤 같은 명령을 다시 실행하면
+남은 ticker만 계산한다 (--retry-errors를 주면 오류가 있던 ticker도 다시 계산).
+checkpoint에는 실행 조건(start, end, sections)을 같이 저장하고 조건이 같을 때만 완료로 보므로,
+같은 --out으로 다음 날 다시 실행하거나 기간/--skip을 바꾸면 다시 계산한다.
+
+결과 (out 폴더):
+- pricing.parquet, sentiment.parquet: ticker당 한 행
+- statements.parquet: (ticker, statement, item, period, value) 긴 형식
+- errors.parquet: (ticker, section, error)
+- html/index.html, html/<TICKER>.html
+"""
+import argparse
+import html
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from functools import partial
+from multiprocessing import get_context
+from pathlib import Path
+
+import pandas as pd
+
+# streamlit/ 폴더의 공용 모듈(singleflight 등)을 같이 사용
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+import analytics
+import config
+import sources
+from fundamentals import AlphaVantageFetcher, FundamentalsClient
+from news_cache import NewsCache, RSSNewsSource, VaderScorer, render_cards_html
+from portfolio import parse_tickers
+from price_store import PriceStore, YFinanceFetcher
+from price_views import PriceView
+from symbols import SymbolIndex
+from watchlist import HISTORY_DAYS, load_watchlist
+
+SECTIONS = ('pricing', 'fundamentals', 'news')
+
+# 한 작업에서 처리하는 ticker 수 (가격은 한 번의 batched download로 받음)
+CHUNK_SIZE = 25
+
+TOP_NEWS = 10
+
+PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title>
+<style>
+body {{ font-family: sans-serif; margin: 2rem; color: #333; }}
+table {{ border-collapse: collapse; margin: 1rem 0; font-size: 0.9rem; }}
+th, td {{ border: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: right; }}
+th {{ background: #f8f9fa; }}
+.error {{ color: #dc3545; }}
+</style></head>
+<body><h1>{title}</h1>
+<p>Generated {generated}</p>
+{body}
+</body></html>'''
+
+# worker 프로세스마다 한 번 만드는 저장소/클라이언트
+_clients = {}
+
+
+def init_worker(setup=None):
+    """worker 프로세스 초기화: setup(예: fixtures.install)으로 source를 바꾼 뒤 클라이언트를 만든다"""
+    if setup is not None:
+        setup()
+    api_key = config.load().alphavantage_api_key
+    _clients['prices'] = PriceStore(fetcher=sources.create('prices', YFinanceFetcher))
+    _clients['news'] = NewsCache(source=sources.create('news', RSSNewsSource),
+                                 scorer=sources.create('sentiment', VaderScorer))
+    _clients['fundamentals'] = FundamentalsClient(
+        api_key, fetcher=sources.create('fundamentals', lambda: AlphaVantageFetcher(api_key)))
+
+
+def _error(e):
+    return f'{type(e).__name__}: {e}'
+
+
+def process_chunk(tickers, start, end, sections=SECTIONS):
+    """ticker 묶음의 결과 목록 ({'ticker', 'pricing', 'statements', 'sentiment', 'news', 'errors'})"""
+    results = {ticker: {'ticker': ticker, 'errors': {}} for ticker in tickers}
+
+    if 'pricing' in sections:
+        try:
+            frames = _clients['prices'].load_many(tickers, start, end, adjusted=True)
+        except Exception as e:
+            frames = {}
+            for result in results.values():
+                result['errors']['pricing'] = _error(e)
+        for ticker, result in results.items():
+            data = frames.get(ticker)
+            if data is None or data.empty:
+                result['errors'].setdefault('pricing', 'No price data')
+                continue
+            price_col = analytics.price_column_for(data)
+            stats = analytics.pricing_stats(PriceView(data).changes(price_col))
+            stats.update(price_column=price_col, last_close=float(data[price_col].iloc[-1]))
+            result['pricing'] = stats
+
+    for ticker, result in results.items():
+        if 'fundamentals' in sections:
+            try:
+                result['statements'] = analytics.format_statements(*_clients['fundamentals'].get_statements(ticker))
+            except Exception as e:
+                result['errors']['fundamentals'] = _error(e)
+        if 'news' in sections:
+            try:
+                news = _clients['news'].get(ticker)
+                result['sentiment'] = analytics.sentiment_summary(news)
+                result['news'] = news.head(TOP_NEWS)
+            except Exception as e:
+                result['errors']['news'] = _error(e)
+    return list(results.values())
+
+
+def _checkpoint_path(checkpoint_dir, ticker):
+    return checkpoint_dir / f'{ticker}.pkl'
+
+
+def save_checkpoint(checkpoint_dir, result):
+    path = _checkpoint_path(checkpoint_dir, result['ticker'])
+    tmp = path.with_name(path.name + '.tmp')
+    with open(tmp, 'wb') as f:
+        pickle.dump(result, f)
+    # 중간에 죽어도 반쯤 쓴 checkpoint가 남지 않도록 교체
+    os.replace(tmp, path)
+
+
+def load_checkpoint(checkpoint_dir, ticker, params=None):
+    """저장된 결과 (params를 주면 같은 조건으로 계산한 것만, 아니면 None)"""
+    try:
+        with open(_checkpoint_path(checkpoint_dir, ticker), 'rb') as f:
+            result = pickle.load(f)
+    except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+        return None
+    if params is not None and result.get('params') != params:
+        return None
+    return result
+
+
+def run_params(start, end, sections):
+    """checkpoint가 유효한 실행 조건"""
+    return {'start': str(start), 'end': str(end), 'sections': sorted(sections)}
+
+
+def _pending(tickers, checkpoint_dir, retry_errors, params):
+    pending = []
+    for ticker in tickers:
+        result = load_checkpoint(checkpoint_dir, ticker, params)
+        if result is None or (retry_errors and result['errors']):
+            pending.append(ticker)
+    return pending
+
+
+def run(tickers, out_dir, start=None, end=None, sections=SECTIONS, workers=1, chunk_size=CHUNK_SIZE,
+        setup=None, retry_errors=False, log=None):
+    """tickers를 처리해 out_dir에 Parquet/HTML을 쓰고 요약을 반환
+
+    setup: 각 worker에서 source를 바꾸는 인자 없는 callable (프로세스 풀로 보내므로 pickle 가능해야 함)
+    """
+    log = log or (lambda message: print(message, file=sys.stderr))
+    out_dir = Path(out_dir)
+    checkpoint_dir = out_dir / 'checkpoints'
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    end = end or date.today() + timedelta(days=1)
+    start = start or end - timedelta(days=HISTORY_DAYS)
+
+    # 로컬 상장 목록으로 확인할 수 있는 잘못된 ticker는 upstream에 보내지 않음
+    index = SymbolIndex.load()
+    unknown = [ticker for ticker in tickers if not index.is_valid(ticker)]
+    if unknown:
+        log(f"skipping {len(unknown)} unknown tickers: {', '.join(unknown[:20])}")
+    tickers = [ticker for ticker in tickers if ticker not in unknown]
+
+    params = run_params(start, end, sections)
+    pending = _pending(tickers, checkpoint_dir, retry_errors, params)
+    chunks = [pending[i:i + chunk_size] for i in range(0, len(pending), chunk_size)]
+    log(f'{len(tickers)} tickers, {len(tickers) - len(pending)} already done, {len(chunks)} chunks to run')
+
+    # Alpha Vantage 일일 한도는 worker들이 같은 quota 파일(토큰 버킷)로 나눠 씀
+    workers = min(workers, len(chunks))
+    started = time.perf_counter()
+    done = 0
+
+    def record(results):
+        nonlocal done
+        for result in results:
+            result['params'] = params
+            save_checkpoint(checkpoint_dir, result)
+        done += len(results)
+        log(f'{done}/{len(pending)} tickers ({time.perf_counter() - started:.1f}s)')
+
+    if workers <= 1:
+        init_worker(setup)
+        for chunk in chunks:
+            record(process_chunk(chunk, start, end, sections))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=get_context('spawn'),
+                                 initializer=init_worker, initargs=(setup,)) as pool:
+            futures = {pool.submit(process_chunk, chunk, start, end, sections): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                try:
+                    results = future.result()
+                except Exception as e:
+                    # worker가 죽은 묶음은 오류로 기록해 두고 --retry-errors로 다시 실행
+                    results = [{'ticker': ticker, 'errors': {'worker': _error(e)}} for ticker in futures[future]]
+                record(results)
+
+    return write_outputs(out_dir, tickers, params)
+
+
+def _statement_rows(ticker, statements):
+    frames = []
+    for name, table in (statements or {}).items():
+        if table is None or table.empty:
+            continue
+        long = table.rename_axis('item').reset_index().melt(id_vars='item', var_name='period', value_name='value')
+        long.insert(0, 'statement', name)
+        long.insert(0, 'ticker', ticker)
+        frames.append(long)
+    return frames
+
+
+def write_outputs(out_dir, tickers, params=None):
+    """checkpoint를 모아 Parquet와 HTML을 쓰고 {파일 종류: 행 수}를 반환 (params가 다른 이전 실행 결과는 제외)"""
+    out_dir = Path(out_dir)
+    results = [result for result in (load_checkpoint(out_dir / 'checkpoints', ticker, params) for ticker in tickers)
+               if result is not None]
+
+    pricing = pd.DataFrame([{'ticker': r['ticker'], **r['pricing']} for r in results if r.get('pricing')])
+    sentiment = pd.DataFrame([{'ticker': r['ticker'], **r['sentiment']} for r in results if r.get('sentiment')])
+    statement_frames = [frame for r in results for frame in _statement_rows(r['ticker'], r.get('statements'))]
+    statements = pd.concat(statement_frames, ignore_index=True) if statement_frames else pd.DataFrame(
+        columns=['ticker', 'statement', 'item', 'period', 'value'])
+    errors = pd.DataFrame([(r['ticker'], section, error) for r in results for section, error in r['errors'].items()],
+                          columns=['ticker', 'section', 'error'])
+
+    for name, frame in (('pricing', pricing), ('sentiment', sentiment), ('statements', statements),
+                        ('errors', errors)):
+        frame.to_parquet(out_dir / f'{name}.parquet', index=False)
+
+    html_dir = out_dir / 'html'
+    html_dir.mkdir(exist_ok=True)
+    generated = pd.Timestamp.now().strftime('%Y-%m-%d %H:%M')
+    for result in results:
+        (html_dir / f"{result['ticker']}.html").write_text(ticker_page(result, generated), encoding='utf-8')
+    (html_dir / 'index.html').write_text(index_page(pricing, sentiment, errors, generated), encoding='utf-8')
+
+    return {'tickers': len(results), 'pricing': len(pricing), 'sentiment': len(sentiment),
+            'statements': len(statements), 'errors': len(errors)}
+
+
+def _table(frame, **kwargs):
+    return frame.to_html(float_format=lambda value: f'{value:,.2f}', na_rep='', border=0, **kwargs)
+
+
+def ticker_page(result, generated):
+    """ticker 한 개의 정적 HTML 리포트 (가격 통계, 재무제표, 뉴스 카드)"""
+    parts = []
+    if result.get('pricing'):
+        parts.append('<h2>Pricing</h2>' + _table(pd.Series(result['pricing'], name='value').to_frame()))
+    for name, title in analytics.STATEMENT_TITLES.items():
+        table = (result.get('statements') or {}).get(name)
+        if table is not None and not table.empty:
+            parts.append(f'<h2>{html.escape(title)}</h2>' + _table(table))
+    if result.get('sentiment'):
+        parts.append('<h2>Sentiment</h2>' + _table(pd.Series(result['sentiment'], name='value').to_frame()))
+    news = result.get('news')
+    if news is not None and not news.empty:
+        parts.append('<h2>Latest News</h2>' + render_cards_html(news))
+    for section, error in result['errors'].items():
+        parts.append(f'<p class="error">{html.escape(section)}: {html.escape(error)}</p>')
+    return PAGE_TEMPLATE.format(title=html.escape(result['ticker']), generated=generated, body='\n'.join(parts))
+
+
+def index_page(pricing, sentiment, errors, generated):
+    """전체 ticker 요약 표 (ticker마다 상세 페이지 링크)"""
+    summary = pricing.set_index('ticker') if not pricing.empty else pd.DataFrame()
+    if not sentiment.empty:
+        summary = summary.join(sentiment.set_index('ticker')[['articles', 'sentiment_title_avg',
+                                                               'sentiment_summary_avg']], how='outer')
+    summary.index = [f'<a href="{html.escape(ticker)}.html">{html.escape(ticker)}</a>' for ticker in summary.index]
+    body = _table(summary, escape=False)
+    if not errors.empty:
+        body += f'<h2>Errors ({len(errors)})</h2>' + _table(errors, index=False)
+    return PAGE_TEMPLATE.format(title='Stock Report', generated=generated, body=body)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Batch stock report (pricing, fundamentals, news sentiment)')
+    parser.add_argument('tickers', nargs='*', help="tickers, e.g. 'AAPL MSFT'")
+    parser.add_argument('--file', help='ticker list file (.txt one per line, .csv with a Symbol/Ticker column)')
+    parser.add_argument('--out', default='reports', help='output directory (checkpoints are kept here)')
+    parser.add_argument('--start', type=date.fromisoformat, help='YYYY-MM-DD (default: one year before --end)')
+    parser.add_argument('--end', type=date.fromisoformat, help='YYYY-MM-DD, exclusive (default: tomorrow)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--skip', action='append', choices=SECTIONS, default=[], help='section to skip (repeatable)')
+    parser.add_argument('--retry-errors', action='store_true', help='recompute tickers whose checkpoint has errors')
+    parser.add_argument('--fixtures', action='store_true', help='use offline fixture sources instead of upstream APIs')
+    parser.add_argument('--recorded', help='with --fixtures: directory of recorded <TICKER>.parquet prices')
+    args = parser.parse_args(argv)
+
+    tickers = parse_tickers(' '.join(args.tickers)) + (load_watchlist(args.file) if args.file else [])
+    tickers = list(dict.fromkeys(tickers))
+    if not tickers:
+        parser.error('no tickers given')
+
+    sections = tuple(section for section in SECTIONS if section not in args.skip)
+    setup = None
+    if args.fixtures:
+        import fixtures
+        setup = partial(fixtures.install, args.recorded)
+    elif 'fundamentals' in sections and not config.load().alphavantage_api_key:
+        print('no Alpha Vantage API key: skipping fundamentals', file=sys.stderr)
+        sections = tuple(section for section in sections if section != 'fundamentals')
+
+    summary = run(tickers, args.out, args.start, args.end, sections, args.workers, args.chunk_size,
+                  setup=setup, retry_errors=args.retry_errors)
+    print(', '.join(f'{name}: {count}' for name, count in summary.items()))
+    return 0 if summary['tickers'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+import sqlite3
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from sources import DATA_DIR
+
+DEFAULT_DB_PATH = DATA_DIR / 'sentiment.db'
+
+# 뉴스는 뉴욕 장 마감(16:00) 이후면 다음 거래일 가격에 반영되는 것으로 본다
+MARKET_TZ = 'America/New_York'
+MARKET_CLOSE_HOUR = 16
+
+# data/data.csv와 같은 컬럼 구성 (change는 check_day 종가의 전일 대비 수익률 - 장중 기사라면 기사 이전 시간도 포함)
+# summary 테이블에는 이 밖에 next_change(check_day 다음 거래일의 수익률)가 더 있다
+SUMMARY_COLUMNS = [
+    'id', 'stock', 'news_dt', 'check_day', 'open', 'close', 'high', 'low', 'volume', 'change',
+    'sentiment_summary_avg', 'sentiment_summary_med', 'sentiment_title_avg', 'sentiment_title_med',
+]
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS news (
+    key TEXT PRIMARY KEY,
+    stock TEXT NOT NULL,
+    news_dt TEXT NOT NULL,
+    check_day TEXT NOT NULL,
+    title TEXT,
+    sentiment_title REAL,
+    sentiment_summary REAL
+);
+CREATE INDEX IF NOT EXISTS idx_news_stock_dt ON news (stock, news_dt);
+CREATE INDEX IF NOT EXISTS idx_news_stock_day ON news (stock, check_day);
+
+CREATE TABLE IF NOT EXISTS summary (
+    id TEXT PRIMARY KEY,
+    stock TEXT NOT NULL,
+    news_dt TEXT NOT NULL,
+    check_day TEXT NOT NULL,
+    open REAL,
+    close REAL,
+    high REAL,
+    low REAL,
+    volume REAL,
+    change REAL,
+    next_change REAL,
+    sentiment_summary_avg REAL,
+    sentiment_summary_med REAL,
+    sentiment_title_avg REAL,
+    sentiment_title_med REAL
+);
+CREATE INDEX IF NOT EXISTS idx_summary_stock_dt ON summary (stock, news_dt);
+CREATE INDEX IF NOT EXISTS idx_summary_stock_day ON summary (stock, check_day);
+'''
+
+
+def check_days(published):
+    """기사 시각(UTC)을 가격을 확인할 거래일(YYYY-MM-DD)로 변환 (장 마감 후/주말이면 다음 평일)
+
+    휴장일은 여기서 알 수 없으므로 fill_prices가 가격 index를 보고 다음 거래일로 옮긴다.
+    """
+    local = pd.DatetimeIndex(published).tz_convert(MARKET_TZ)
+    day = local.normalize().tz_localize(None)
+    day = day.where(local.hour < MARKET_CLOSE_HOUR, day + pd.Timedelta(days=1))
+    # 토요일 -> +2일, 일요일 -> +1일
+    weekday = day.weekday
+    day = day + pd.to_timedelta(((7 - weekday) % 7).where(weekday >= 5, 0), unit='D')
+    return day.strftime('%Y-%m-%d')
+
+
+class SentimentStore:
+    """뉴스 감정 점수와 기사가 반영되는 거래일(check_day)의 가격 변화를 같이 쌓는 SQLite 저장소
+
+    - news: 기사 단위로 append-only (같은 key는 무시)
+    - summary: (ticker, 거래일) 단위 집계, data/data.csv와 같은 컬럼
+    (stock, news_dt) / (stock, check_day) 인덱스로 ticker + 기간 조회를 바로 처리한다.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(SCHEMA)
+        # next_change 컬럼이 생기기 전에 만든 DB
+        columns = [row[1] for row in self._conn.execute('PRAGMA table_info(summary)')]
+        if 'next_change' not in columns:
+            with self._conn:
+                self._conn.execute('ALTER TABLE summary ADD COLUMN next_change REAL')
+        self._lock = threading.Lock()
+
+    def append_news(self, frame):
+        """NewsCache 프레임을 저장하고, 새 기사가 들어온 거래일의 집계를 갱신"""
+        frame = frame.dropna(subset=['published'])
+        if frame.empty:
+            return 0
+
+        rows = pd.DataFrame({
+            'key': frame['key'],
+            'stock': frame['stock'],
+            'news_dt': frame['published'].dt.strftime('%Y-%m-%d %H:%M:%S'),
+            'check_day': check_days(frame['published']),
+            'title': frame['title'],
+            'sentiment_title': frame['sentiment_title'],
+            'sentiment_summary': frame['sentiment_summary'],
+        })
+
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                'INSERT OR IGNORE INTO news VALUES (?, ?, ?, ?, ?, ?, ?)',
+                rows.itertuples(index=False, name=None),
+            )
+            inserted = self._conn.total_changes - before
+            if inserted:
+                self._refresh_summary(rows[['stock', 'check_day']].drop_duplicates())
+        return inserted
+
+    def _refresh_summary(self, days):
+        for stock, group in days.groupby('stock'):
+            placeholders = ','.join('?' * len(group))
+            news = pd.read_sql_query(
+                f'SELECT stock, news_dt, check_day, sentiment_title, sentiment_summary FROM news '
+                f'WHERE stock = ? AND check_day IN ({placeholders})',
+                self._conn, params=[stock, *group['check_day']],
+            )
+            summary = news.groupby('check_day').agg(
+                news_dt=('news_dt', 'max'),
+                sentiment_summary_avg=('sentiment_summary', 'mean'),
+                sentiment_summary_med=('sentiment_summary', 'median'),
+                sentiment_title_avg=('sentiment_title', 'mean'),
+                sentiment_title_med=('sentiment_title', 'median'),
+            ).reset_index()
+            summary.insert(0, 'id', stock + '_' + summary['check_day'])
+            summary.insert(1, 'stock', stock)
+
+            # 가격 컬럼은 그대로 두고 감정 집계만 upsert
+            self._conn.executemany(
+                'INSERT INTO summary (id, stock, check_day, news_dt, sentiment_summary_avg, sentiment_summary_med, '
+                'sentiment_title_avg, sentiment_title_med) VALUES (?, ?, ?, ?, ?, ?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET news_dt = excluded.news_dt, '
+                'sentiment_summary_avg = excluded.sentiment_summary_avg, '
+                'sentiment_summary_med = excluded.sentiment_summary_med, '
+                'sentiment_title_avg = excluded.sentiment_title_avg, '
+                'sentiment_title_med = excluded.sentiment_title_med',
+                summary[['id', 'stock', 'check_day', 'news_dt', 'sentiment_summary_avg', 'sentiment_summary_med',
+                         'sentiment_title_avg', 'sentiment_title_med']].itertuples(index=False, name=None),
+            )
+
+    def _roll_holidays(self, stock, pending, trading_days):
+        # 가격 index 구간 안에 있는데 봉이 없는 날(휴장일)의 기사를 다음 거래일로 옮기고 집계를 다시 만듦
+        moves = {}
+        for day in pending:
+            pos = trading_days.searchsorted(day)
+            if day not in trading_days and 0 < pos < len(trading_days):
+                moves[day] = trading_days[pos]
+        if not moves:
+            return pending
+
+        with self._conn:
+            for day, rolled in moves.items():
+                self._conn.execute('UPDATE news SET check_day = ? WHERE stock = ? AND check_day = ?',
+                                   (rolled, stock, day))
+                self._conn.execute('DELETE FROM summary WHERE id = ?', (f'{stock}_{day}',))
+            self._refresh_summary(pd.DataFrame({'stock': stock, 'check_day': sorted(set(moves.values()))}))
+        return [day for (day,) in self._conn.execute(
+            'SELECT check_day FROM summary WHERE stock = ? AND close IS NULL', (stock,))]
+
+    def fill_prices(self, stock, prices, price_col='Close'):
+        """가격이 아직 비어 있는 거래일에 OHLCV와 전일 대비 수익률을 채움 (휴장일 기사는 다음 거래일로 옮김)
+
+        next_change는 다음 거래일 봉이 prices에 있어야 알 수 있으므로, 비어 있는 날은 이후 호출에서 다시 채운다.
+        """
+        if prices is None or prices.empty:
+            return 0
+
+        stock = stock.upper()
+        trading_days = pd.Index(prices.index.strftime('%Y-%m-%d')).sort_values()
+        with self._lock:
+            pending = [day for (day,) in self._conn.execute(
+                'SELECT check_day FROM summary WHERE stock = ? AND close IS NULL', (stock,))]
+            if pending:
+                pending = self._roll_holidays(stock, pending, trading_days)
+            waiting = [day for (day,) in self._conn.execute(
+                'SELECT check_day FROM summary WHERE stock = ? AND close IS NOT NULL AND next_change IS NULL',
+                (stock,))]
+        if not pending and not waiting:
+            return 0
+
+        daily = pd.DataFrame({
+            'open': prices.get('Open'),
+            'close': prices[price_col],
+            'high': prices.get('High'),
+            'low': prices.get('Low'),
+            'volume': prices.get('Volume'),
+            'change': prices[price_col].pct_change(fill_method=None),
+        }, index=prices.index.strftime('%Y-%m-%d'))
+        daily['next_change'] = daily['change'].shift(-1)
+        filled = daily.loc[daily.index.isin(pending)].dropna(subset=['close', 'change'])
+        later = daily.loc[daily.index.isin(waiting), ['next_change']].dropna()
+        if filled.empty and later.empty:
+            return 0
+
+        filled = filled.astype(float).where(filled.notna(), None)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                'UPDATE summary SET open = ?, close = ?, high = ?, low = ?, volume = ?, change = ?, next_change = ? '
+                'WHERE id = ?',
+                [(*row, f'{stock}_{day}') for day, row in zip(filled.index, filled.itertuples(index=False, name=None))],
+            )
+            self._conn.executemany(
+                'UPDATE summary SET next_change = ? WHERE id = ?',
+                [(float(value), f'{stock}_{day}') for day, value in later['next_change'].items()],
+            )
+        return len(filled) + len(later)
+
+    def sentiment_vs_returns(self, stock, start=None, end=None):
+        """거래일별 감정 집계와 그날(check_day)의 전일 종가 대비 수익률 ('change') - 가격이 채워진 날만
+
+        'next_change'는 check_day 다음 거래일의 수익률 (다음 봉을 아직 못 받았으면 NaN)
+        """
+        query = ('SELECT check_day, sentiment_title_avg, sentiment_summary_avg, change, next_change FROM summary '
+                 'WHERE stock = ? AND change IS NOT NULL')
+        params = [stock.upper()]
+        if start is not None:
+            query += ' AND check_day >= ?'
+            params.append(str(pd.Timestamp(start).date()))
+        if end is not None:
+            query += ' AND check_day < ?'
+            params.append(str(pd.Timestamp(end).date()))
+        query += ' ORDER BY check_day'
+
+        with self._lock:
+            frame = pd.read_sql_query(query, self._conn, params=params)
+        frame['check_day'] = pd.to_datetime(frame['check_day'])
+        return frame.set_index('check_day')
+
+    def summary(self, stock=None):
+        """data/data.csv 형식의 집계 테이블"""
+        query = f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM summary"
+        params = []
+        if stock is not None:
+            query += ' WHERE stock = ?'
+            params.append(stock.upper())
+        with self._lock:
+            return pd.read_sql_query(query + ' ORDER BY stock, check_day', self._conn, params=params)
@@ -0,0 +1,69 @@
+"""대시보드를 warm-up 후 실행하는 launcher
+
+    python serve.py --server.port=8501 --server.address=0.0.0.0
+
+`streamlit run dashboard.py`와 같은 옵션을 받는다. 서버를 띄우기 전에 같은 프로세스에서
+무거운 모듈 import, .env 설정, VADER lexicon 로드를 끝내 두므로 첫 세션이 이 비용을 기다리지 않는다.
+"""
+import importlib
+import sys
+import time
+from pathlib import Path
+
+STOCK_DIR = Path(__file__).resolve().parent
+DASHBOARD = STOCK_DIR / 'dashboard.py'
+
+# 첫 세션에서 import하게 되는 모듈 (없는 선택 의존성은 건너뜀)
+WARM_MODULES = [
+    'pandas', 'numpy', 'pyarrow', 'pyarrow.parquet', 'plotly.express',
+    'yfinance', 'alpha_vantage.fundamentaldata', 'feedparser', 'nltk',
+    'analytics', 'backtest', 'config', 'data_export', 'downsample', 'fetch_service', 'fundamentals', 'indicators',
+    'memory_cache', 'news_cache', 'portfolio', 'price_store', 'price_views', 'risk', 'sentiment_store', 'singleflight',
+    'sources', 'statements', 'symbols', 'tracing',
+]
+
+
+def warm_up(modules=WARM_MODULES, lexicon=True):
+    """모듈을 미리 import하고 lexicon을 로드, 단계별 소요 시간(초)을 반환"""
+    for path in (STOCK_DIR, STOCK_DIR.parents[1]):
+        if str(path) not in sys.path:
+            sys.path.append(str(path))
+
+    timings = {}
+    for name in modules:
+        started = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        timings[name] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    importlib.import_module('config').load()
+    timings['config'] = time.perf_counter() - started
+
+    if lexicon:
+        started = time.perf_counter()
+        try:
+            importlib.import_module('news_cache').load_vader()
+            timings['vader_lexicon'] = time.perf_counter() - started
+        except Exception as e:
+            # 오프라인 등으로 lexicon을 못 받으면 첫 뉴스 요청에서 다시 시도
+            print(f'warm-up: VADER lexicon not loaded ({e})', file=sys.stderr)
+    return timings
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    started = time.perf_counter()
+    timings = warm_up()
+    slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)[:5]
+    print(f'warm-up done in {time.perf_counter() - started:.2f}s '
+          f"({', '.join(f'{name} {seconds:.2f}s' for name, seconds in slowest)})", file=sys.stderr)
+
+    from streamlit.web import cli
+    cli.main(['run', str(DASHBOARD), *argv], prog_name='streamlit')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,25 @@
+import config
+
+# 로컬 캐시/저장소 기본 위치 (STOCK_DATA_DIR 환경 변수나 .env로 변경 가능)
+DATA_DIR = config.load().data_dir
+CACHE_DIR = DATA_DIR / 'cache'
+
+_factories = {}
+
+
+def register(name, factory):
+    """upstream source를 교체 (벤치마크/오프라인 실행에서 fixture를 끼워 넣을 때 사용)
+
+    name: 'prices' | 'intraday' | 'news' | 'sentiment' | 'fundamentals' | 'symbols'
+    factory: 인자 없이 호출하면 source 객체를 돌려주는 callable
+    """
+    _factories[name] = factory
+
+
+def reset():
+    _factories.clear()
+
+
+def create(name, default_factory):
+    """등록된 factory가 있으면 그것으로, 없으면 default_factory로 source를 만든다"""
+    return _factories.get(name, default_factory)()
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+# 항목(행)별 최대 절댓값에 따라 단위를 고른다
+UNITS = [(1e9, 'B'), (1e6, 'M')]
+
+
+def statement_table(raw):
+    """Alpha Vantage 재무제표를 항목 x 회계연도 숫자 테이블로 변환
+
+    원본은 회계연도가 행이고 fiscalDateEnding, reportedCurrency 다음부터 금액 항목이다.
+    'None' 같은 문자열은 NaN으로 바꾼다.
+    """
+    transposed = raw.T
+    periods = list(transposed.iloc[0])
+    items = transposed.iloc[2:]
+
+    values = pd.to_numeric(pd.Series(items.to_numpy().ravel()), errors='coerce')
+    values = values.to_numpy(dtype=float).reshape(items.shape)
+    return pd.DataFrame(values, index=items.index, columns=periods)
+
+
+def scale_statement(table):
+    """항목별로 B/M/달러 단위 중 하나를 골라 한 번에 나누고, 단위는 항목 이름에 붙인다"""
+    values = table.to_numpy(dtype=float)
+    with np.errstate(invalid='ignore'):
+        magnitude = np.nanmax(np.abs(values), axis=1, initial=0.0)
+
+    scale = np.ones(len(table))
+    suffix = np.full(len(table), '', dtype=object)
+    # 작은 단위부터 적용해서 더 큰 단위 조건이 덮어쓰도록 한다
+    for threshold, unit in reversed(UNITS):
+        mask = magnitude >= threshold
+        scale[mask] = threshold
+        suffix[mask] = f" (${unit})"
+    suffix[suffix == ''] = ' ($)'
+
+    scaled = values / scale[:, None]
+    return pd.DataFrame(scaled, index=table.index.astype(str) + suffix, columns=table.columns)
+
+
+def format_statement(raw):
+    """재무제표 원본을 화면 표시용 숫자 테이블로 변환 (비어 있으면 None)"""
+    if raw is None or raw.empty:
+        return None
+    return scale_statement(statement_table(raw))
@@ -0,0 +1,204 @@
+import bisect
+import csv
+import io
+import os
+import re
+import time
+from pathlib import Path
+
+from sources import CACHE_DIR
+from tracing import span
+
+# 저장소에 같이 들어 있는 대표 종목 목록 (전체 목록을 아직 받지 못했을 때 검색용)
+BUNDLED_PATH = Path(__file__).resolve().parent / 'data' / 'symbols.csv'
+
+# NASDAQ Trader에서 받아 로컬에 저장한 전체 상장 목록
+DEFAULT_LISTING_PATH = CACHE_DIR / 'symbols.csv'
+
+# 전체 목록을 다시 받는 주기
+MAX_AGE_SECONDS = 7 * 86400
+
+LISTING_URLS = {
+    'nasdaqlisted': 'https://www.nasdaqtrader.com/dynamic/SymDir/nasdaqlisted.txt',
+    'otherlisted': 'https://www.nasdaqtrader.com/dynamic/SymDir/otherlisted.txt',
+}
+
+# 철자 하나 차이 후보를 만들 때 쓰는 문자
+SYMBOL_CHARS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789-'
+
+# 미국 상장 종목 ticker 형식 (BRK-B처럼 yfinance 표기)
+SYMBOL_PATTERN = re.compile(r'[A-Z0-9][A-Z0-9-]{0,9}')
+
+# 지수(^GSPC), 환율/선물(EURUSD=X, CL=F), 해외 거래소(SAP.DE)는 미국 상장 목록에 없으므로 형식만 확인
+UNLISTED_PATTERN = re.compile(r'[\^A-Z0-9][A-Z0-9.=\-]*[.=][A-Z0-9]+|\^[A-Z0-9]+')
+
+
+class NasdaqListingSource:
+    """NASDAQ Trader symbol directory (NASDAQ + NYSE/기타 거래소 상장 종목)"""
+
+    def fetch(self):
+        import requests
+
+        rows = []
+        for name, url in LISTING_URLS.items():
+            with span(f'symbols.{name}'):
+                response = requests.get(url, timeout=30)
+                response.raise_for_status()
+            reader = csv.DictReader(io.StringIO(response.text), delimiter='|')
+            symbol_column = 'Symbol' if name == 'nasdaqlisted' else 'ACT Symbol'
+            for row in reader:
+                symbol = (row.get(symbol_column) or '').strip()
+                # 마지막 줄은 'File Creation Time: ...', 테스트 종목과 우선주($)는 제외
+                if not symbol or symbol.startswith('File Creation Time') or '$' in symbol:
+                    continue
+                if row.get('Test Issue') == 'Y':
+                    continue
+                rows.append((symbol.replace('.', '-'), (row.get('Security Name') or '').strip()))
+        return rows
+
+
+def refresh(source=None, path=DEFAULT_LISTING_PATH):
+    """전체 상장 목록을 받아 path에 CSV(Symbol, Name)로 저장하고 종목 수를 반환"""
+    rows = (source if source is not None else NasdaqListingSource()).fetch()
+    if not rows:
+        raise ValueError("Empty symbol listing")
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(['Symbol', 'Name'])
+        writer.writerows(sorted(dict(rows).items()))
+    # 읽는 쪽이 반쯤 쓴 파일을 보지 않도록 교체
+    os.replace(tmp, path)
+    return len(rows)
+
+
+def listing_version(path=DEFAULT_LISTING_PATH):
+    """로컬 전체 목록의 수정 시각 (없으면 None) - 캐시 key로 사용"""
+    try:
+        return Path(path).stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+
+def is_stale(path=DEFAULT_LISTING_PATH, max_age=MAX_AGE_SECONDS):
+    version = listing_version(path)
+    return version is None or time.time() - version > max_age
+
+
+class SymbolIndex:
+    """정렬된 ticker 배열 + 회사명 단어 배열에서 bisect로 접두어를 찾는 종목 색인
+
+    - contains: ticker 정확히 일치
+    - search: ticker 접두어 -> 회사명 단어 접두어 -> 철자 하나 차이 ticker 순서로 후보를 반환
+    complete가 False(대표 종목 목록만 있는 상태)이면 목록에 없다고 해서 잘못된 ticker로 보지 않는다.
+    """
+
+    def __init__(self, rows, complete=False):
+        listing = dict((symbol.upper(), name) for symbol, name in rows if symbol)
+        self.symbols = sorted(listing)
+        self.names = [listing[symbol] for symbol in self.symbols]
+        self.complete = complete
+        # 정확히 일치하는지는 (오타 후보 수백 개를 볼 때도) dict로 바로 찾음
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+        # (소문자 단어, 종목 위치) - 'apple', 'micro' 같은 회사명 일부로 찾기
+        words = []
+        for i, name in enumerate(self.names):
+            for word in set(re.findall(r'[a-z0-9]+', name.lower())):
+                words.append((word, i))
+        words.sort()
+        self._words = [word for word, _ in words]
+        self._word_rows = [i for _, i in words]
+
+    @classmethod
+    def load(cls, path=DEFAULT_LISTING_PATH, bundled=BUNDLED_PATH):
+        """로컬 전체 목록이 있으면 그것을, 없으면 저장소의 대표 종목 목록을 읽음"""
+        complete = Path(path).exists()
+        with open(path if complete else bundled, newline='', encoding='utf-8') as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            return cls(((row[0], row[1] if len(row) > 1 else '') for row in reader), complete=complete)
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def _find(self, symbol):
+        return self._positions.get(symbol)
+
+    def contains(self, symbol):
+        return self._find(symbol.strip().upper()) is not None
+
+    def name(self, symbol):
+        i = self._find(symbol.strip().upper())
+        return self.names[i] if i is not None else None
+
+    def is_valid(self, symbol):
+        """network 호출 전에 걸러낼지 판단
+
+        ticker 형식이 아니면(회사명, 오타로 들어간 공백 등) 항상 거부하고, 목록에 없는 ticker는
+        전체 목록을 가지고 있을 때만 거부한다. 지수/해외 ticker는 형식만 본다.
+        """
+        symbol = symbol.strip().upper()
+        if UNLISTED_PATTERN.fullmatch(symbol):
+            return True
+        if not SYMBOL_PATTERN.fullmatch(symbol):
+            return False
+        return not self.complete or self._find(symbol) is not None
+
+    def _prefix(self, keys, prefix, limit):
+        start = bisect.bisect_left(keys, prefix)
+        end = bisect.bisect_left(keys, prefix + '\uffff', start)
+        return range(start, min(end, start + limit))
+
+    def _edits(self, symbol):
+        # 한 글자 삭제/교환/치환/삽입 후보 중 목록에 있는 것
+        splits = [(symbol[:i], symbol[i:]) for i in range(len(symbol) + 1)]
+        candidates = {a + b[1:] for a, b in splits if b}
+        candidates |= {a + b[1] + b[0] + b[2:] for a, b in splits if len(b) > 1}
+        candidates |= {a + c + b[1:] for a, b in splits if b for c in SYMBOL_CHARS}
+        candidates |= {a + c + b for a, b in splits for c in SYMBOL_CHARS}
+        candidates.discard(symbol)
+        return sorted(i for i in map(self._find, candidates) if i is not None)
+
+    def search(self, query, limit=10):
+        """typeahead 후보 [(ticker, 회사명)]"""
+        query = query.strip()
+        if not query:
+            return []
+        found = []
+
+        def add(rows):
+            for i in rows:
+                if i not in found:
+                    found.append(i)
+                if len(found) >= limit:
+                    return True
+            return False
+
+        symbol = query.upper()
+        exact = self._find(symbol)
+        if add([exact] if exact is not None else []) or add(self._prefix(self.symbols, symbol, limit)):
+            return self._rows(found)
+
+        # 여러 단어면 첫 단어 접두어로 찾고 나머지 단어가 모두 회사명에 들어 있는 것만
+        terms = re.findall(r'[a-z0-9]+', query.lower())
+        if terms:
+            rows = (self._word_rows[i] for i in self._prefix(self._words, terms[0], len(self._words)))
+            if terms[1:]:
+                rows = (i for i in rows if all(term in self.names[i].lower() for term in terms[1:]))
+            if add(rows):
+                return self._rows(found)
+
+        if ' ' not in query and len(symbol) <= 6:
+            add(self._edits(symbol))
+        return self._rows(found)
+
+    def _rows(self, found):
+        return [(self.symbols[i], self.names[i]) for i in found]
+
+
+if __name__ == '__main__':
+    # cron 등에서 직접 갱신: python symbols.py
+    print(f'{refresh()} symbols saved to {DEFAULT_LISTING_PATH}')
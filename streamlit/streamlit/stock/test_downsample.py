@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from downsample import downsample_frame, minmax_indices
+
+
+def _frame(n=10_000):
+    index = pd.bdate_range('2000-01-03', periods=n, name='Date')
+    close = np.cumsum(np.random.default_rng(0).normal(size=n)) + 100
+    return pd.DataFrame({'Close': close}, index=index)
+
+
+def test_minmax_keeps_every_bucket_extreme():
+    y = _frame()['Close'].to_numpy()
+    picks = minmax_indices(y, 100)
+    assert len(picks) <= 200
+    assert np.all(np.diff(picks) > 0)
+    # 전체 최저/최고점은 반드시 남음
+    assert y.argmin() in picks and y.argmax() in picks
+    for bucket in np.array_split(np.arange(len(y)), 100):
+        kept = y[np.intersect1d(picks, bucket)]
+        assert kept.min() == y[bucket].min() and kept.max() == y[bucket].max()
+
+
+@pytest.mark.parametrize('method', ['lttb', 'minmax'])
+def test_downsample_frame_methods(method):
+    frame = _frame()
+    chart = downsample_frame(frame, 'Close', 500, method)
+    assert len(chart) <= 500
+    assert chart.index.is_monotonic_increasing
+
+
+def test_downsample_frame_keeps_small_frames():
+    frame = _frame(300)
+    assert downsample_frame(frame, 'Close', 500, 'minmax').equals(frame)
+
+
+def test_downsample_frame_rejects_unknown_method():
+    with pytest.raises(ValueError):
+        downsample_frame(_frame(), 'Close', 500, 'every_nth')
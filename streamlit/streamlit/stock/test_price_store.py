@@ -0,0 +1,101 @@
+import pandas as pd
+
+from price_store import PriceStore
+
+
+class RecordingFetcher:
+    """영업일마다 한 봉을 돌려주고 요청 구간을 기록하는 오프라인 fetcher"""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch(self, ticker, start, end, adjusted):
+        self.calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        index = pd.bdate_range(start, end, inclusive='left', name='Date')
+        return pd.DataFrame({'Close': range(len(index))}, index=index, dtype=float)
+
+
+def test_disjoint_range_fetches_from_coverage_edge(tmp_path):
+    fetcher = RecordingFetcher()
+    store = PriceStore(tmp_path, fetcher)
+    store.load('X', '2024-01-01', '2024-02-01')
+    store.load('X', '2024-06-01', '2024-07-01')
+    # 1월 다음부터 받았어야 2~5월이 비지 않는다
+    assert fetcher.calls[-1] == (pd.Timestamp('2024-02-01'), pd.Timestamp('2024-07-01'))
+
+    fetcher.calls.clear()
+    data = store.load('X', '2024-01-01', '2024-07-01')
+    assert fetcher.calls == []
+    assert len(data) == len(pd.bdate_range('2024-01-01', '2024-07-01', inclusive='left'))
+
+
+def test_disjoint_range_before_coverage(tmp_path):
+    fetcher = RecordingFetcher()
+    store = PriceStore(tmp_path, fetcher)
+    store.load('X', '2024-06-01', '2024-07-01')
+    store.load('X', '2024-01-01', '2024-02-01')
+    assert fetcher.calls[-1] == (pd.Timestamp('2024-01-01'), pd.Timestamp('2024-06-01'))
+
+    frames = store.load_many(['X'], '2024-01-01', '2024-07-01')
+    assert len(fetcher.calls) == 2
+    assert len(frames['X']) == len(pd.bdate_range('2024-01-01', '2024-07-01', inclusive='left'))
+
+
+class FlakyFetcher(RecordingFetcher):
+    """처음 failures번은 네트워크 오류처럼 빈 프레임을 돌려주는 fetcher"""
+
+    def __init__(self, failures):
+        super().__init__()
+        self.failures = failures
+
+    def fetch(self, ticker, start, end, adjusted):
+        frame = super().fetch(ticker, start, end, adjusted)
+        if self.failures:
+            self.failures -= 1
+            return frame.iloc[:0]
+        return frame
+
+
+def test_empty_fetch_does_not_extend_coverage(tmp_path):
+    fetcher = FlakyFetcher(failures=0)
+    store = PriceStore(tmp_path, fetcher)
+    store.load('X', '2024-01-01', '2024-02-01')
+
+    fetcher.failures = 1
+    assert len(store.load('X', '2024-01-01', '2024-03-01')) == len(pd.bdate_range('2024-01-01', '2024-02-01',
+                                                                                    inclusive='left'))
+    # 실패한 2월 구간은 다음 요청 때 다시 받는다
+    data = store.load('X', '2024-01-01', '2024-03-01')
+    assert fetcher.calls[-1] == (pd.Timestamp('2024-02-01'), pd.Timestamp('2024-03-01'))
+    assert len(data) == len(pd.bdate_range('2024-01-01', '2024-03-01', inclusive='left'))
+
+
+def test_empty_weekend_gap_counts_as_covered(tmp_path):
+    fetcher = RecordingFetcher()
+    store = PriceStore(tmp_path, fetcher)
+    store.load('X', '2024-01-01', '2024-01-06')
+    store.load('X', '2024-01-01', '2024-01-08')
+    fetcher.calls.clear()
+    store.load('X', '2024-01-01', '2024-01-08')
+    assert fetcher.calls == []
+
+
+def test_load_many_merges_into_concurrent_update(tmp_path):
+    class Interleaved(RecordingFetcher):
+        # load_many가 받는 도중 다른 호출이 같은 ticker의 앞 구간을 받아 둠
+        interleaved = False
+
+        def fetch(self, ticker, start, end, adjusted):
+            if not self.interleaved:
+                self.interleaved = True
+                store.load('X', '2024-01-01', '2024-02-01')
+            return super().fetch(ticker, start, end, adjusted)
+
+    fetcher = Interleaved()
+    store = PriceStore(tmp_path, fetcher)
+    store.load_many(['X'], '2024-03-01', '2024-04-01')
+    # 다른 호출이 받아 둔 1월 행과 커버리지가 그대로 남아 있어야 함
+    fetcher.calls.clear()
+    data = store.load('X', '2024-01-01', '2024-02-01')
+    assert fetcher.calls == []
+    assert len(data) == len(pd.bdate_range('2024-01-01', '2024-02-01', inclusive='left'))
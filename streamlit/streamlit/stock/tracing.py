@@ -0,0 +1,220 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+# 지연 시간 히스토그램 구간 상한 (초, Prometheus 기본값과 비슷하게)
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# ticker 라벨 개수 상한 (넘으면 '_other'로 묶어서 시계열 수가 끝없이 늘지 않게 함)
+MAX_TICKERS = 200
+OTHER_TICKER = '_other'
+
+METRIC_PREFIX = 'stock_dashboard'
+
+# 실행 중인 span 스택 (스레드/컨텍스트별)
+_stack = contextvars.ContextVar('tracing_stack', default=())
+
+
+class Span:
+    """진행 중인 구간 하나 (cache는 'hit' | 'miss' | None)"""
+
+    __slots__ = ('stage', 'ticker', 'cache')
+
+    def __init__(self, stage, ticker, cache):
+        self.stage = stage
+        self.ticker = ticker
+        self.cache = cache
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """q 분위수가 들어 있는 구간의 상한 (마지막 구간이면 관측된 최댓값)"""
+        if self.count == 0:
+            return float('nan')
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+
+
+class Tracer:
+    """대시보드 단계별 지연 시간을 (stage, ticker, cache) 라벨 히스토그램으로 모음
+
+    with tracer.span('prices', ticker, cached=True):
+        ...  # 캐시된 함수 본문(실제로 계산할 때만 실행)에서 tracer.mark_miss() 호출
+
+    cached=True인 span은 'hit'으로 시작하고, 안쪽에서 mark_miss()가 불리면 'miss'로 기록된다.
+    FetchService는 호출한 쪽 컨텍스트에서 작업을 실행하므로 백그라운드 스레드의 miss도 바깥 span에 반영된다.
+    """
+
+    def __init__(self, buckets=BUCKETS, max_tickers=MAX_TICKERS):
+        self.buckets = tuple(buckets)
+        self.max_tickers = max_tickers
+        self._histograms = {}
+        self._errors = {}
+        self._tickers = set()
+        self._lock = threading.Lock()
+
+    def _ticker_label(self, ticker):
+        if ticker is None:
+            return ''
+        ticker = str(ticker).upper()
+        if ticker in self._tickers:
+            return ticker
+        if len(self._tickers) >= self.max_tickers:
+            return OTHER_TICKER
+        self._tickers.add(ticker)
+        return ticker
+
+    def observe(self, stage, seconds, ticker=None, cache=None):
+        with self._lock:
+            key = (stage, self._ticker_label(ticker), cache or '')
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    @contextmanager
+    def span(self, stage, ticker=None, cached=False):
+        span = Span(stage, ticker, 'hit' if cached else None)
+        token = _stack.set(_stack.get() + (span,))
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            # st.stop()/rerun은 Streamlit 제어 흐름이므로 오류로 세지 않음
+            if isinstance(e, Exception):
+                with self._lock:
+                    key = (stage, self._ticker_label(ticker))
+                    self._errors[key] = self._errors.get(key, 0) + 1
+            raise
+        finally:
+            _stack.reset(token)
+            self.observe(stage, time.perf_counter() - started, ticker, span.cache)
+
+    def traced(self, stage, cached=False):
+        """함수 전체를 span으로 감싸는 decorator (ticker 라벨 없음)"""
+        def decorator(fn):
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(stage, cached=cached):
+                    return fn(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def snapshot(self):
+        """관리자 패널용 요약 (stage, ticker, cache별 호출 수와 지연 시간 ms)"""
+        with self._lock:
+            rows = [
+                (stage, ticker, cache, h.count, 1000 * h.sum / h.count,
+                 1000 * h.quantile(0.5), 1000 * h.quantile(0.95), 1000 * h.max)
+                for (stage, ticker, cache), h in self._histograms.items()
+            ]
+        frame = pd.DataFrame(rows, columns=['stage', 'ticker', 'cache', 'count', 'mean_ms',
+                                            'p50_ms', 'p95_ms', 'max_ms'])
+        return frame.sort_values(['stage', 'ticker', 'cache'], ignore_index=True)
+
+    def hit_rates(self):
+        """cached span이 있는 stage별 캐시 적중률"""
+        counts = {}
+        with self._lock:
+            for (stage, _, cache), h in self._histograms.items():
+                if cache:
+                    hits, total = counts.get(stage, (0, 0))
+                    counts[stage] = (hits + (h.count if cache == 'hit' else 0), total + h.count)
+        return {stage: hits / total for stage, (hits, total) in counts.items() if total}
+
+    def prometheus_text(self):
+        """Prometheus text exposition 형식 (histogram + 오류 counter)"""
+        name = f'{METRIC_PREFIX}_stage_seconds'
+        lines = [f'# HELP {name} Latency of dashboard stages.', f'# TYPE {name} histogram']
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            errors = sorted(self._errors.items())
+            for (stage, ticker, cache), h in histograms:
+                labels = f'stage="{_escape(stage)}",ticker="{_escape(ticker)}",cache="{cache}"'
+                cumulative = 0
+                for bound, count in zip(self.buckets, h.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {h.count}')
+                lines.append(f'{name}_sum{{{labels}}} {h.sum}')
+                lines.append(f'{name}_count{{{labels}}} {h.count}')
+
+        name = f'{METRIC_PREFIX}_stage_errors_total'
+        lines += [f'# HELP {name} Exceptions raised inside dashboard stages.', f'# TYPE {name} counter']
+        for (stage, ticker), count in errors:
+            lines.append(f'{name}{{stage="{_escape(stage)}",ticker="{_escape(ticker)}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._errors.clear()
+            self._tickers.clear()
+
+    def mark_miss(self):
+        """가장 안쪽의 cached span을 'miss'로 표시 (cached span 밖이면 아무 일도 안 함)"""
+        for span in reversed(_stack.get()):
+            if span.cache is not None:
+                span.cache = 'miss'
+                return
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def start_metrics_server(tracer, port, host='0.0.0.0', collectors=()):
+    """/metrics에서 tracer.prometheus_text()를 돌려주는 HTTP 서버를 daemon 스레드로 실행
+
+    collectors: 같은 형식의 text를 돌려주는 callable 목록 (캐시 사용량 등, 뒤에 이어 붙임)
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = ''.join([tracer.prometheus_text(), *(collect() for collect in collectors)]).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    return server
+
+
+# 프로세스 전체에서 공유하는 기본 tracer (모듈들이 직접 span을 남길 때 사용)
+TRACER = Tracer()
+span = TRACER.span
+traced = TRACER.traced
+mark_miss = TRACER.mark_miss
@@ -0,0 +1,184 @@
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from functools import partial
+from pathlib import Path
+
+import pandas as pd
+
+from fundamentals import STATEMENTS
+from portfolio import parse_tickers
+from tracing import span
+
+MARKET_TZ = 'America/New_York'
+MARKET_OPEN = (9, 30)
+MARKET_CLOSE = (16, 0)
+
+# 한 번의 yf.download로 받는 ticker 수
+PRICE_BATCH = 50
+
+# 미리 받아 두는 가격 구간 (대시보드 기본 구간과 같게 1년)
+HISTORY_DAYS = 366
+
+# 재무제표 호출 한도 중 사용자 요청용으로 남겨 두는 호출 수 (ticker 2개 분량)
+FUNDAMENTALS_RESERVE = 2 * len(STATEMENTS)
+
+
+def load_watchlist(spec):
+    """'AAPL, MSFT' 같은 목록 또는 파일 경로(.txt 한 줄에 하나, .csv는 Symbol/Ticker 컬럼)를 ticker 목록으로"""
+    if not spec:
+        return []
+    path = Path(spec)
+    try:
+        is_file = path.is_file()
+    except OSError:
+        # 긴 ticker 목록은 파일 이름 길이 제한에 걸릴 수 있음
+        is_file = False
+    if not is_file:
+        return parse_tickers(spec)
+    if path.suffix.lower() == '.csv':
+        frame = pd.read_csv(path)
+        column = next((col for col in frame.columns if col.lower() in ('symbol', 'ticker')), frame.columns[0])
+        # S&P 500 목록은 BRK.B처럼 '.'을 쓰지만 yfinance는 '-'를 씀
+        return parse_tickers(' '.join(frame[column].astype(str).str.replace('.', '-', regex=False)))
+    return parse_tickers(path.read_text())
+
+
+def market_open(now=None):
+    """뉴욕 정규장 시간인지 (주말만 제외하고 휴장일은 따로 보지 않음)"""
+    now = pd.Timestamp.now(tz=MARKET_TZ) if now is None else pd.Timestamp(now).tz_convert(MARKET_TZ)
+    if now.weekday() >= 5:
+        return False
+    return MARKET_OPEN <= (now.hour, now.minute) < MARKET_CLOSE
+
+
+class WatchlistScheduler:
+    """watchlist ticker를 주기적으로 미리 받아 대시보드 캐시에 넣어 두는 백그라운드 scheduler
+
+    - 가격: price_interval마다 PRICE_BATCH개씩 묶어 PriceStore.load_many (장 마감 후에는 하루 한 번)
+    - 뉴스: news_interval마다 ticker별 NewsCache 갱신 (해당 ticker는 다음 갱신까지 만료되지 않게 pin)
+    - 재무제표: fundamentals_interval마다 만료가 가까운 것부터 호출 한도 안에서 갱신
+    작업 시작 시각은 주기 안에서 고르게 흩어 놓아 upstream에 한꺼번에 몰리지 않게 하고,
+    실행은 크기가 정해진 스레드 풀에서 한다 (같은 작업이 아직 실행 중이면 이번 차례는 건너뜀).
+    """
+
+    def __init__(self, tickers, price_store=None, news_cache=None, fundamentals=None,
+                 price_interval=300, news_interval=3600, fundamentals_interval=86400,
+                 batch_size=PRICE_BATCH, history_days=HISTORY_DAYS, max_workers=2):
+        self.tickers = list(dict.fromkeys(ticker.upper() for ticker in tickers))
+        self.price_store = price_store
+        self.news_cache = news_cache
+        self.fundamentals = fundamentals
+        self.history_days = history_days
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='watchlist')
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._jobs = []
+        self._seq = itertools.count()
+        self._running = set()
+        self._stats = {}
+        self._price_days = {}
+        self._thread = None
+
+        if price_store is not None:
+            batches = [self.tickers[i:i + batch_size] for i in range(0, len(self.tickers), batch_size)]
+            for i, batch in enumerate(batches):
+                self._add(f'prices[{i}]', partial(self._refresh_prices, i, batch), price_interval,
+                          i * price_interval / len(batches))
+        if news_cache is not None:
+            # 갱신이 조금 늦어져도 사용자 요청이 만료된 캐시를 만나지 않도록 여유를 둠
+            news_cache.pin(self.tickers, news_interval * 1.5)
+            for i, ticker in enumerate(self.tickers):
+                self._add(f'news[{ticker}]', partial(self._refresh_news, ticker), news_interval,
+                          i * news_interval / len(self.tickers))
+        if fundamentals is not None and self.tickers:
+            self._add('fundamentals', partial(self._refresh_fundamentals, fundamentals_interval),
+                      fundamentals_interval, 0)
+
+    def _add(self, name, fn, interval, offset):
+        heapq.heappush(self._jobs, (time.monotonic() + offset, next(self._seq), name, fn, interval))
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name='watchlist-scheduler', daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _loop(self):
+        while not self._stop.is_set() and self._jobs:
+            due, _, name, fn, interval = self._jobs[0]
+            wait = due - time.monotonic()
+            if wait > 0:
+                self._stop.wait(wait)
+                continue
+
+            heapq.heapreplace(self._jobs, (due + interval, next(self._seq), name, fn, interval))
+            with self._lock:
+                if name in self._running:
+                    continue
+                self._running.add(name)
+            self._executor.submit(self._run, name, fn)
+
+    def _run(self, name, fn):
+        started = time.time()
+        try:
+            with span(f"watchlist.{name.split('[')[0]}"):
+                fn()
+            error = None
+        except Exception as e:
+            error = f'{type(e).__name__}: {e}'
+        with self._lock:
+            self._running.discard(name)
+            stats = self._stats.setdefault(name, {'runs': 0, 'failures': 0})
+            stats['runs'] += 1
+            stats['failures'] += error is not None
+            stats['last_run'] = started
+            stats['last_seconds'] = time.time() - started
+            stats['last_error'] = error
+
+    def _refresh_prices(self, index, batch):
+        today = date.today()
+        # 장이 닫혀 있으면 그날 한 번만 받음 (마감 후 확정된 봉)
+        if not market_open() and self._price_days.get(index) == today:
+            return
+        start = today - timedelta(days=self.history_days)
+        self.price_store.load_many(batch, start, today + timedelta(days=1), adjusted=True)
+        self._price_days[index] = today
+
+    def _refresh_news(self, ticker):
+        self.news_cache.get(ticker, refresh=True)
+
+    def _refresh_fundamentals(self, interval):
+        # 다음 실행 전에 만료되는 재무제표만, 만료가 가까운 순서로, 사용자 몫을 남기고 갱신
+        due = sorted(
+            (self.fundamentals.expires_in(statement, ticker), ticker, statement)
+            for ticker in self.tickers for statement in STATEMENTS
+        )
+        for expires_in, ticker, statement in due:
+            if expires_in > interval or self._stop.is_set():
+                break
+            if self.fundamentals.bucket.available() <= FUNDAMENTALS_RESERVE:
+                break
+            self.fundamentals.refresh(statement, ticker)
+
+    def stats(self):
+        """작업 종류별 실행 횟수/실패/마지막 실행 (관리자 패널용)"""
+        with self._lock:
+            rows = [(name.split('[')[0], stats) for name, stats in self._stats.items()]
+        summary = {}
+        for kind, stats in rows:
+            entry = summary.setdefault(kind, {'jobs': 0, 'runs': 0, 'failures': 0, 'last_run': None, 'last_error': None})
+            entry['jobs'] += 1
+            entry['runs'] += stats['runs']
+            entry['failures'] += stats['failures']
+            if entry['last_run'] is None or stats['last_run'] > entry['last_run']:
+                entry['last_run'] = stats['last_run']
+            entry['last_error'] = stats['last_error'] or entry['last_error']
+        return {'tickers': len(self.tickers), 'pending': len(self._running), 'jobs': summary}
@@ -3,6 +3,10 @@ import pandas as pd
 import numpy as np
 from streamlit_extras.chart_container import chart_container
 
+from csv_ingest import content_digest, ingest_csv, page, summarize
+from data_export import download_widget
+from memory_cache import CACHE, cached
+
 st.set_page_config(
     page_title="Auto Landing Page",
     page_icon="📊",
@@ -32,29 +36,45 @@ with col2:
     st.write(test2)
 
 
-    @st.cache_data
+    @cached(CACHE)
     def get_data():
         df = pd.DataFrame(
             np.random.randn(50, 20), columns=("col %d" % i for i in range(20))
         )
         return df
 
-    @st.cache_data
-    def convert_for_download(df):
-        return df.to_csv().encode("utf-8")
-
     df = get_data()
-    csv = convert_for_download(df)
 
-    st.download_button(
-        label="Download CSV",
-        data=csv,
-        file_name="data.csv",
-        mime="text/csv",
-        icon=":material/download:",
-    )
+    # 파일은 Prepare를 눌렀을 때만 청크 단위로 생성 (CSV / Parquet / Feather)
+    download_widget("data", df, file_stem="data", key="sample_data")
+
+    @cached(CACHE)
+    def load_uploaded_csv(digest, _buffer):
+        # 같은 내용의 파일은 다시 파싱하지 않음 (digest가 캐시 키, 버퍼 자체는 해시하지 않음)
+        # 큰 업로드도 CACHE의 메모리 예산에 포함되어 오래 안 쓴 것부터 디스크로 내려감
+        df = ingest_csv(_buffer)
+        return df, summarize(df)
 
     uploaded_file = st.file_uploader("Upload a CSV file", type=["csv"])
     if uploaded_file is not None:
-        df = pd.read_csv(uploaded_file)
-        st.write(df)
\ No newline at end of file
+        # rerun마다 파일 전체를 다시 해시하지 않도록 업로드 단위로 digest 보관
+        digests = st.session_state.setdefault('upload_digests', {})
+        if uploaded_file.file_id not in digests:
+            digests[uploaded_file.file_id] = content_digest(uploaded_file.getbuffer())
+
+        try:
+            with st.spinner("Parsing CSV..."):
+                df, summary = load_uploaded_csv(digests[uploaded_file.file_id], uploaded_file.getbuffer())
+        except ValueError as exc:
+            # 열 개수가 맞지 않는 행, 인코딩 오류 등 (pyarrow.ArrowInvalid도 ValueError)
+            st.error(f"Could not parse the CSV file: {exc}")
+            st.stop()
+
+        st.write(f"{len(df):,} rows × {df.shape[1]} columns ({df.memory_usage(deep=True).sum() / 1e6:.1f} MB in memory)")
+        st.dataframe(summary, use_container_width=True)
+
+        # 전체 대신 한 페이지씩만 브라우저로 전송
+        page_size = 100
+        page_count = max(1, -(-len(df) // page_size))
+        page_number = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+        st.dataframe(page(df, page_number, page_size), use_container_width=True)
\ No newline at end of file